@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import click
+
+from . import dataframe, variants, vcf_engines
+
+
+@click.group()
+def cli():
+    """ Main entry point for mitoviz benchmarks. """
+    pass
+
+
+@cli.command(name="vcf-engines")
+@click.option("--samples", "-s", "n_samples", default=500, show_default=True,
+              help="Number of samples in the synthetic VCF file.")
+@click.option("--records", "-r", "n_records", default=1000,
+              show_default=True,
+              help="Number of records in the synthetic VCF file.")
+@click.option("--repeat", "-n", default=3, show_default=True,
+              help="Number of runs for each engine.")
+def bench_vcf_engines(n_samples, n_records, repeat):
+    """ Compare the pysam and vcfpy VCF parsing engines. """
+    click.echo("Parsing {} records x {} samples...".format(n_records,
+                                                           n_samples))
+    timings = vcf_engines.run(n_samples, n_records, repeat)
+    for engine, seconds in timings.items():
+        click.echo("{:>8}: {:8.3f} s".format(engine, seconds))
+    click.echo("Speedup: {:.1f}x".format(timings["vcfpy"] / timings["pysam"]))
+
+
+@cli.command(name="dataframe")
+@click.option("--rows", "-r", "n_rows", default=1000000, show_default=True,
+              help="Number of variants in the synthetic DataFrame.")
+@click.option("--samples", "-s", "n_samples", default=1000,
+              show_default=True,
+              help="Number of samples in the synthetic DataFrame.")
+@click.option("--shuffled", default=False, is_flag=True, show_default=True,
+              help="Shuffle the rows of different samples.")
+@click.option("--repeat", "-n", default=3, show_default=True,
+              help="Number of runs of the vectorized parser.")
+def bench_dataframe(n_rows, n_samples, shuffled, repeat):
+    """ Compare row-by-row and vectorized DataFrame parsing. """
+    click.echo("Parsing {} rows x {} samples...".format(n_rows, n_samples))
+    timings = dataframe.run(n_rows, n_samples, shuffled, repeat)
+    for method, seconds in timings.items():
+        click.echo("{:>10}: {:8.3f} s".format(method, seconds))
+    click.echo("Speedup: {:.1f}x".format(timings["rows"]
+                                         / timings["vectorized"]))
+
+
+@cli.command(name="variants")
+@click.option("--variants", "-v", "n_variants", default=[1000000, 10000000],
+              multiple=True, show_default=True,
+              help="Number of variants (can be repeated).")
+def bench_variants(n_variants):
+    """ Measure the memory and construction throughput of variant records.
+    """
+    for n in n_variants:
+        click.echo("Creating {} variants...".format(n))
+        for record, (size, rate) in variants.run(n).items():
+            line = "{:>10}: {:8.1f} bytes/variant".format(record, size)
+            if rate is not None:
+                line += ", {:,.0f} variants/s".format(rate)
+            click.echo(line)
+
+
+@cli.command(name="cohort")
+@click.option("--samples", "-s", "n_samples", default=10000,
+              show_default=True,
+              help="Number of samples in the synthetic cohort.")
+@click.option("--sites", "-v", "n_sites", default=500, show_default=True,
+              help="Number of distinct variants in the synthetic cohort.")
+def bench_cohort(n_samples, n_sites):
+    """ Measure the memory saved by interning the variants of a cohort. """
+    click.echo("Creating {} samples x {} variants...".format(
+        n_samples, n_sites
+    ))
+    results = variants.run_cohort(n_samples, n_sites)
+    click.echo("{:,} variants, {:,} distinct".format(results["variants"],
+                                                     results["distinct"]))
+    for layout in ("flat", "interned"):
+        click.echo("{:>10}: {:8.1f} bytes/variant".format(layout,
+                                                          results[layout]))
+
+
+if __name__ == '__main__':
+    cli()
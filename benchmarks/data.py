@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import random
+
+import numpy as np
+import pandas as pd
+import pysam
+
+from mitoviz.constants import MT_LENGTH
+
+BASES = "ACGT"
+
+
+def write_vcf(path: str,
+              n_samples: int,
+              n_records: int,
+              seed: int = 42) -> str:
+    """ Write a synthetic multi-sample mitochondrial VCF file.
+
+    Each record is a SNV carrying a GT:DP:HF call for every sample, with
+    roughly half of the calls being hom-ref or no-call; if the path ends
+    with .gz, the file is bgzipped and indexed with tabix.
+
+    Args:
+        path: path of the output VCF file
+        n_samples: number of sample columns
+        n_records: number of records
+        seed: seed used for the random generator [default: 42]
+
+    Returns:
+        path of the output VCF file
+    """
+    rnd = random.Random(seed)
+    samples = ["S{:06d}".format(i) for i in range(n_samples)]
+    positions = sorted(rnd.sample(range(1, MT_LENGTH + 1), n_records))
+    plain = path[:-3] if path.endswith(".gz") else path
+    with open(plain, "w") as out:
+        out.write("##fileformat=VCFv4.2\n")
+        out.write("##contig=<ID=chrM,length={}>\n".format(MT_LENGTH))
+        out.write('##FORMAT=<ID=GT,Number=1,Type=String,'
+                  'Description="Genotype">\n')
+        out.write('##FORMAT=<ID=DP,Number=1,Type=Integer,'
+                  'Description="Read depth">\n')
+        out.write('##FORMAT=<ID=HF,Number=A,Type=Float,'
+                  'Description="Heteroplasmic fraction">\n')
+        out.write("\t".join(["#CHROM", "POS", "ID", "REF", "ALT", "QUAL",
+                             "FILTER", "INFO", "FORMAT", *samples]) + "\n")
+        for pos in positions:
+            ref = rnd.choice(BASES)
+            alt = rnd.choice(BASES.replace(ref, ""))
+            calls = []
+            for _ in samples:
+                draw = rnd.random()
+                if draw < 0.1:
+                    calls.append(".:.:.")
+                elif draw < 0.5:
+                    calls.append("0:{}:0.0".format(rnd.randint(10, 2000)))
+                else:
+                    calls.append("1:{}:{:.3f}".format(rnd.randint(10, 2000),
+                                                      rnd.random()))
+            out.write("\t".join(["chrM", str(pos), ".", ref, alt, ".",
+                                 "PASS", ".", "GT:DP:HF", *calls]) + "\n")
+    if plain != path:
+        pysam.tabix_compress(plain, path, force=True)
+        pysam.tabix_index(path, preset="vcf", force=True)
+    return path
+
+
+def make_df(n_rows: int,
+            n_samples: int,
+            shuffled: bool = False,
+            seed: int = 42) -> pd.DataFrame:
+    """ Create a synthetic DataFrame of mitochondrial variants, with the
+    POS, REF, ALT, SAMPLE and HF columns used by plot_df().
+
+    About 90% of the variants are SNVs, the others are evenly split
+    between insertions and deletions. Rows are grouped by sample, as in
+    tables aggregated from per-sample files, unless shuffled is true.
+
+    Args:
+        n_rows: number of variants
+        n_samples: number of distinct samples
+        shuffled: shuffle the rows of different samples [default: False]
+        seed: seed used for the random generator [default: 42]
+
+    Returns:
+        DataFrame with the synthetic variants
+    """
+    rng = np.random.default_rng(seed)
+    bases = np.array(list(BASES))
+    ref = bases[rng.integers(0, 4, n_rows)].astype(object)
+    alt = bases[rng.integers(0, 4, n_rows)].astype(object)
+    kind = rng.random(n_rows)
+    ins, dels = kind > 0.95, (kind > 0.9) & (kind <= 0.95)
+    alt[ins] = ref[ins] + "A"
+    ref[dels] = ref[dels] + "T"
+    samples = np.array(["S{:06d}".format(i) for i in range(n_samples)],
+                       dtype=object)
+    return pd.DataFrame({
+        "POS": rng.integers(1, MT_LENGTH + 1, n_rows),
+        "REF": ref,
+        "ALT": alt,
+        "SAMPLE": samples[np.sort(rng.integers(0, n_samples, n_rows))
+                          if not shuffled
+                          else rng.integers(0, n_samples, n_rows)],
+        "HF": rng.random(n_rows).round(3),
+    })
+
+
+def make_cohort(n_samples: int,
+                n_sites: int,
+                carriers: float = 0.5,
+                seed: int = 42) -> pd.DataFrame:
+    """ Create a synthetic DataFrame of the variants of a cohort, with the
+    POS, REF, ALT, SAMPLE and HF columns used by plot_df().
+
+    Variants are SNVs at n_sites distinct positions, each carried by a
+    random subset of the samples, so that the same variants recur in many
+    samples as in population cohorts.
+
+    Args:
+        n_samples: number of samples
+        n_sites: number of distinct variants
+        carriers: fraction of the samples carrying each variant
+            [default: 0.5]
+        seed: seed used for the random generator [default: 42]
+
+    Returns:
+        DataFrame with the synthetic variants, grouped by sample
+    """
+    rng = np.random.default_rng(seed)
+    bases = np.array(list(BASES), dtype=object)
+    positions = np.sort(rng.choice(np.arange(1, MT_LENGTH + 1), n_sites,
+                                   replace=False))
+    ref = rng.integers(0, 4, n_sites)
+    alt = (ref + rng.integers(1, 4, n_sites)) % 4
+    sample, site = np.nonzero(rng.random((n_samples, n_sites)) < carriers)
+    samples = np.array(["S{:06d}".format(i) for i in range(n_samples)],
+                       dtype=object)
+    return pd.DataFrame({
+        "POS": positions[site],
+        "REF": bases[ref[site]],
+        "ALT": bases[alt[site]],
+        "SAMPLE": samples[sample],
+        "HF": rng.random(len(site)).round(3),
+    })
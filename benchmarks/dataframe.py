@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import time
+from collections import defaultdict
+from typing import Dict
+
+import pandas as pd
+
+from mitoviz.parsers import _DataFrameParser
+
+from .data import make_df
+
+
+class RowVariant:
+    """ Variant record as _Variant was defined before DataFrame parsing was
+    vectorized, storing its attributes in a __dict__ and hashing them on
+    every lookup; used as the baseline. """
+
+    def __init__(self,
+                 reference: str,
+                 position: int,
+                 alternate: str,
+                 hf: float):
+        self.reference = reference
+        self.position = position
+        self.alternate = alternate
+        self.hf = hf
+
+    def __key(self):
+        return self.reference, self.position, self.alternate, self.hf
+
+    def __hash__(self):
+        return hash(self.__key())
+
+    def __eq__(self, other):
+        if isinstance(other, RowVariant):
+            return self.__key() == other.__key()
+        return NotImplemented
+
+
+def parse_rows(df: pd.DataFrame) -> dict:
+    """ Parse the given DataFrame one row at a time, as _DataFrameParser
+    used to do before being vectorized; used as the baseline.
+
+    Args:
+        df: DataFrame with POS, REF, ALT, SAMPLE and HF columns
+
+    Returns:
+        per-sample lists of RowVariant instances
+    """
+    variants = defaultdict(list)
+    if "HF" in df.columns:
+        df["HF"] = df["HF"].astype(float)
+    for record in df.itertuples():
+        rec = record._asdict()
+        sample = rec["SAMPLE"] if "SAMPLE" in df.columns else "MITOVIZ001"
+        hf = rec["HF"] if "HF" in df.columns else 0.5
+        variant = RowVariant(rec["REF"], rec["POS"], rec["ALT"], hf)
+        variants[sample].append(variant)
+    return variants
+
+
+def _fields(variants: dict) -> dict:
+    """ Return the reference, position, alternate and HF of the given
+    per-sample variants, so that variants of both parsers can be compared.
+    """
+    return {sample: [(variant.reference, variant.position, variant.alternate,
+                      variant.hf) for variant in sample_variants]
+            for sample, sample_variants in variants.items()}
+
+
+def run(n_rows: int,
+        n_samples: int,
+        shuffled: bool = False,
+        repeat: int = 3) -> Dict[str, float]:
+    """ Create a synthetic DataFrame and time its parsing with the
+    row-by-row baseline and with _DataFrameParser, checking that they
+    produce identical variants.
+
+    Args:
+        n_rows: number of variants
+        n_samples: number of distinct samples
+        shuffled: shuffle the rows of different samples [default: False]
+        repeat: number of runs of _DataFrameParser, the best one is kept
+            (the baseline is run once) [default: 3]
+
+    Returns:
+        dictionary with the parsing time (in seconds) of each method
+    """
+    df = make_df(n_rows, n_samples, shuffled)
+    start = time.perf_counter()
+    expected = parse_rows(df)
+    timings = {"rows": time.perf_counter() - start}
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser = _DataFrameParser(df)
+        runs.append(time.perf_counter() - start)
+    timings["vectorized"] = min(runs)
+    if _fields(parser.variants) != _fields(expected):
+        raise AssertionError("Vectorized parser produced different variants")
+    return timings
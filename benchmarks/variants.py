@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import gc
+import time
+import tracemalloc
+from typing import Dict, Optional, Tuple
+
+from mitoviz.table import VariantTable
+from mitoviz.variant import _Variant
+
+from .data import make_cohort, make_df
+
+
+class DictVariant:
+    """ Variant record storing its attributes in a __dict__, as _Variant
+    used to do before using __slots__; used as the baseline. """
+
+    def __init__(self, reference, position, alternate, hf, vtype):
+        self.reference = reference
+        self.position = position
+        self.alternate = alternate
+        self.hf = hf
+        self.vtype = vtype
+
+
+def build(record: type,
+          table: VariantTable,
+          n_variants: Optional[int] = None) -> list:
+    """ Create a record of the given class for each variant of the table,
+    as VariantTable.variants() does.
+
+    Args:
+        record: class of the records
+        table: table with the variants
+        n_variants: only create records for the first n_variants variants
+            (defaults to all the variants)
+
+    Returns:
+        list of records
+    """
+    records = table.pool.records
+    rows = slice(n_variants)
+    return [record(reference, position, alternate, hf, vtype)
+            for (reference, position, alternate, vtype), hf in zip(
+                map(records.__getitem__, table.variant[rows].tolist()),
+                table.hf[rows].tolist()
+            )]
+
+
+def measure(record: type,
+            table: VariantTable,
+            sample_size: int = 1000000) -> Tuple[float, float]:
+    """ Measure the memory used by the records of the variants of the
+    given table, and how fast they are created.
+
+    Memory is traced with tracemalloc, which needs several times the memory
+    of the records themselves, so it is measured on the records of the
+    first sample_size variants only.
+
+    Args:
+        record: class of the records
+        table: table with the variants
+        sample_size: number of records whose memory is traced
+            [default: 1000000]
+
+    Returns:
+        tuple with the bytes used by each record (including its position
+        and HF objects and its slot in the list holding the records) and
+        the number of records created per second
+    """
+    gc.collect()
+    start = time.perf_counter()
+    records = build(record, table)
+    seconds = time.perf_counter() - start
+    del records
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = build(record, table, sample_size)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size / len(records), len(table) / seconds
+
+
+def run(n_variants: int) -> Dict[str, Tuple[float, Optional[float]]]:
+    """ Create a synthetic table of variants and measure the memory and
+    construction throughput of _Variant records and of DictVariant
+    records, as well as the memory used by the table itself (including its
+    pool of distinct variants).
+
+    Args:
+        n_variants: number of variants
+
+    Returns:
+        dictionary with bytes per variant and variants created per second
+        of each record type (None for the table, whose throughput is not
+        measured)
+    """
+    df = make_df(n_variants, max(n_variants // 1000, 1))
+    table = VariantTable.from_columns(df["POS"], df["REF"], df["ALT"],
+                                      hf=df["HF"], sample=df["SAMPLE"])
+    del df
+    pool = table.pool
+    columns = (table.variant, table.hf, table.sample, pool.position,
+               pool.vtype, pool.ref, pool.alt)
+    results = {
+        "table": (sum(column.nbytes for column in columns) / len(table),
+                  None),
+        "__slots__": measure(_Variant, table),
+        "__dict__": measure(DictVariant, table),
+    }
+    return results
+
+
+def run_cohort(n_samples: int, n_sites: int) -> Dict[str, float]:
+    """ Create a synthetic cohort and measure the memory used by its table,
+    where recurrent variants are interned, and by the same columns stored
+    once per variant, as VariantTable used to do.
+
+    Args:
+        n_samples: number of samples
+        n_sites: number of distinct variants
+
+    Returns:
+        dictionary with bytes per variant of each layout, number of
+        variants and number of distinct variants
+    """
+    df = make_cohort(n_samples, n_sites)
+    table = VariantTable.from_columns(df["POS"], df["REF"], df["ALT"],
+                                      hf=df["HF"], sample=df["SAMPLE"])
+    del df
+    pool = table.pool
+    interned = (table.variant, table.hf, table.sample, pool.position,
+                pool.vtype, pool.ref, pool.alt)
+    flat = (table.position, table.hf, table.sample, table.vtype, table.ref,
+            table.alt)
+    return {
+        "interned": sum(column.nbytes for column in interned) / len(table),
+        "flat": sum(column.nbytes for column in flat) / len(table),
+        "variants": len(table),
+        "distinct": len(pool),
+    }
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import os
+import tempfile
+import time
+from typing import Dict
+
+from mitoviz.constants import VCF_ENGINES
+from mitoviz.parsers import _VcfParser
+
+from .data import write_vcf
+
+
+def time_engines(vcf_in: str, repeat: int = 3) -> Dict[str, float]:
+    """ Time the parsing of the given VCF file using each available engine.
+
+    Args:
+        vcf_in: path of the input VCF file
+        repeat: number of runs for each engine, the best one is kept
+            [default: 3]
+
+    Returns:
+        dictionary with the best parsing time (in seconds) of each engine
+    """
+    timings = dict()
+    for engine in VCF_ENGINES:
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _VcfParser(vcf_in, engine=engine)
+            runs.append(time.perf_counter() - start)
+        timings[engine] = min(runs)
+    return timings
+
+
+def run(n_samples: int, n_records: int, repeat: int = 3) -> Dict[str, float]:
+    """ Create a synthetic multi-sample VCF file and time both engines on
+    it, checking that they produce identical variants.
+
+    Args:
+        n_samples: number of sample columns
+        n_records: number of records
+        repeat: number of runs for each engine [default: 3]
+
+    Returns:
+        dictionary with the best parsing time (in seconds) of each engine
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        vcf_in = write_vcf(os.path.join(tmp, "cohort.vcf"),
+                           n_samples, n_records)
+        variants = {engine: _VcfParser(vcf_in, engine=engine).variants
+                    for engine in VCF_ENGINES}
+        if variants["pysam"] != variants["vcfpy"]:
+            raise AssertionError("Engines produced different variants")
+        return time_engines(vcf_in, repeat)
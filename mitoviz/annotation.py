@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+from bisect import bisect_right
+from typing import Any, List, Optional, Sequence, Union
+
+import numpy as np
+
+from mitoviz.constants import (
+    COLORS, MT_LENGTH, NAMES, NT_LENGTHS, STARTS, STRANDS, TYPES
+)
+
+
+class _AnnotationIndex:
+    """ Precompiled index of the loci of the mt genome, used to look up the
+    locus on which one or more positions are located, and its name, type,
+    color and strand.
+
+    Loci are stored as sorted arrays of intervals, with the D-loop split in
+    its two parts (0-575 and 16023-16568) as in linear plots, so that locus
+    i of the index is locus i of NAMES (and the last locus is the second
+    part of the D-loop). Overlapping intervals are resolved once, when the
+    index is built, into disjoint segments pointing to the first locus
+    covering them. Single positions are looked up with a binary search on
+    the segment bounds, while arrays of positions are looked up in a table
+    of the locus of each position, expanded from the segments, since the mt
+    genome is small enough that this is much faster than a binary search of
+    each position.
+
+    Names, types and colors follow COLOR_MAPS, whose intervals include
+    their stop position, while strands keep the half-open intervals used
+    since the first releases, so that a separate set of segments is kept
+    for them. Positions not covered by any locus have no name, type or
+    color, and are on the H strand.
+
+    Attributes:
+        names: names of the loci
+        types: types of the loci (regulatory, coding, rRNA, tRNA,
+            non-coding)
+        colors: colors of the loci, from their types
+        strands: strands of the loci ("H", "L", or "" for non-coding loci)
+        starts: start positions of the loci (int32)
+        lengths: lengths of the loci in nucleotides (int32)
+    """
+
+    def __init__(self):
+        self.names = NAMES + ["DLOOP"]
+        self.types = TYPES + ["reg"]
+        self.colors = [COLORS[loc_type] for loc_type in self.types]
+        self.strands = list(STRANDS)
+        self.starts = np.array(STARTS, dtype=np.int32)
+        self.lengths = np.array(
+            [STARTS[1]] + NT_LENGTHS[1:] + [NT_LENGTHS[0] - STARTS[1]],
+            dtype=np.int32
+        )
+        for array in (self.starts, self.lengths):
+            array.flags.writeable = False
+        stops = self.starts + self.lengths
+        self._segments = {False: self._split(self.starts, stops + 1),
+                          True: self._split(self.starts, stops)}
+        self._tables = {strand: self._expand(*segments)
+                        for strand, segments in self._segments.items()}
+        # the last value of each attribute is used for positions outside
+        self._values = {
+            "name": np.array(self.names + [None], dtype=object),
+            "type": np.array(self.types + [None], dtype=object),
+            "color": np.array(self.colors + [None], dtype=object),
+            "strand": np.array(self.strands + ["H"], dtype=object),
+        }
+
+    @staticmethod
+    def _split(starts: np.ndarray, stops: np.ndarray) -> tuple:
+        """ Split the given half-open intervals into disjoint segments.
+
+        Returns:
+            tuple with the sorted bounds of the segments (both as array and
+            as list, used for single positions), and the index of the first
+            interval covering each segment, with an additional -1 before the
+            first segment and after the last one, so that the result of a
+            right-sided binary search on the bounds can be used directly
+        """
+        bounds = np.unique(np.concatenate([starts, stops]))
+        covers = ((starts[:, None] <= bounds[None, :-1])
+                  & (bounds[None, :-1] < stops[:, None]))
+        loci = np.where(covers.any(axis=0), covers.argmax(axis=0), -1)
+        loci = np.concatenate([[-1], loci, [-1]]).astype(np.intp)
+        return bounds, bounds.tolist(), loci
+
+    @staticmethod
+    def _expand(bounds: np.ndarray,
+                bound_list: List[int],
+                loci: np.ndarray) -> tuple:
+        """ Expand the given segments into a table of the locus of each
+        position, returning the first position of the table and the table.
+        """
+        table = np.repeat(loci[1:-1], np.diff(bounds)).astype(np.int8)
+        table.flags.writeable = False
+        return bound_list[0], table
+
+    def locus(self,
+              position: Union[int, Sequence[int]],
+              strand: bool = False) -> Union[int, np.ndarray]:
+        """ Return the index of the locus on which the given position (or
+        positions) is located, or -1 if it is not covered by any locus.
+
+        Args:
+            position: either a single position or an array of positions
+            strand: use the intervals of the strands rather than those of
+                COLOR_MAPS [default: False]
+
+        Returns:
+            index of the locus, or array of indices for an array of
+            positions
+        """
+        if np.ndim(position) == 0:  # any int or float scalar
+            _, bound_list, loci = self._segments[strand]
+            return int(loci[bisect_right(bound_list, int(position))])
+        first, table = self._tables[strand]
+        positions = np.asarray(position, dtype=np.int64) - first
+        inside = (positions >= 0) & (positions < len(table))
+        return np.where(inside, table[np.where(inside, positions, 0)], -1)
+
+    def _lookup(self,
+                attribute: str,
+                position: Union[int, Sequence[int]]) -> Any:
+        values = self._values[attribute]
+        locus = self.locus(position, strand=attribute == "strand")
+        if isinstance(locus, int):
+            return values[locus]
+        return values[locus].tolist()
+
+    def name(self, position: Union[int, Sequence[int]]
+             ) -> Union[Optional[str], List[Optional[str]]]:
+        """ Return the name of the locus on which the given position (or
+        positions) is located (None outside of the loci). """
+        return self._lookup("name", position)
+
+    def type(self, position: Union[int, Sequence[int]]
+             ) -> Union[Optional[str], List[Optional[str]]]:
+        """ Return the type of the locus on which the given position (or
+        positions) is located (None outside of the loci). """
+        return self._lookup("type", position)
+
+    def color(self, position: Union[int, Sequence[int]]
+              ) -> Union[Optional[str], List[Optional[str]]]:
+        """ Return the color of the locus on which the given position (or
+        positions) is located (None outside of the loci). """
+        return self._lookup("color", position)
+
+    def strand(self, position: Union[int, Sequence[int]]
+               ) -> Union[str, List[str]]:
+        """ Return the strand of the locus on which the given position (or
+        positions) is located ("H" outside of the loci). """
+        return self._lookup("strand", position)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self):
+        return "{}(loci={}, length={})".format(
+            self.__class__.__name__, len(self), MT_LENGTH
+        )
+
+
+INDEX = _AnnotationIndex()
+
+
+def color(position: int) -> Optional[str]:
+    """ Return the color of the locus on which the given position is
+    located, or None if it is outside of the mt genome. """
+    return INDEX.color(position)
+
+
+def colors(positions: Sequence[int]) -> List[Optional[str]]:
+    """ Return the colors of the loci on which the given positions are
+    located (None for positions outside of the mt genome). """
+    return INDEX.color(np.asarray(positions))
+
+
+def strand(position: int) -> str:
+    """ Return the strand of the locus on which the given position is
+    located ("H", "L", or "" for non-coding loci); positions outside of the
+    mt genome are on the H strand. """
+    return INDEX.strand(position)
+
+
+def strands(positions: Sequence[int]) -> List[str]:
+    """ Return the strands of the loci on which the given positions are
+    located, as in strand(). """
+    return INDEX.strand(np.asarray(positions))
@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import hashlib
+import json
+import os
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from mitoviz.constants import CACHE_SIZE
+from mitoviz.table import VariantTable, _VariantPool
+
+
+class _ParseCache:
+    """ Class storing parsed VariantTables on disk, so that the same input
+    file does not need to be parsed again.
+
+    Each entry is a .npz file keyed by the content hash of the input file
+    and by the parsing options used; the content hash of each file is
+    memoised in an index keyed by file path, size and modification time, so
+    that unchanged files are not hashed again, together with the names of
+    the entries of the file. Entries are evicted in least recently used
+    order once the cache grows larger than max_size, and files left without
+    entries are dropped from the index.
+
+    Attributes:
+        cache_dir: path of the cache directory (created if needed)
+        max_size: maximum size of the cache in bytes [default: CACHE_SIZE]
+    """
+    _index_name = "index.json"
+    _suffix = ".npz"
+
+    def __init__(self, cache_dir: str, max_size: int = CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, self._index_name)
+
+    @property
+    def entries(self) -> List[str]:
+        """ Paths of the entries stored in the cache. """
+        return [os.path.join(self.cache_dir, name)
+                for name in os.listdir(self.cache_dir)
+                if name.endswith(self._suffix)]
+
+    @property
+    def size(self) -> int:
+        """ Total size of the entries stored in the cache, in bytes. """
+        return sum(os.path.getsize(entry) for entry in self.entries)
+
+    @staticmethod
+    def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+        """ Return the blake2b hash of the content of the given file. """
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self._index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return dict()
+
+    def _dump_index(self, index: dict):
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._index_path)
+
+    @staticmethod
+    def _stat_key(path: str) -> Tuple[str, str]:
+        """ Return the real path of the given file and its key in the index,
+        made of its real path, size and modification time. """
+        real_path = os.path.realpath(path)
+        stat = os.stat(real_path)
+        return real_path, "{}:{}:{}".format(real_path, stat.st_size,
+                                            stat.st_mtime_ns)
+
+    def content_hash(self, path: str) -> str:
+        """ Return the content hash of the given file, hashing it only if
+        its path, size or modification time are not already known. """
+        real_path, stat_key = self._stat_key(path)
+        index = self._load_index()
+        if stat_key not in index:
+            # drop the hashes of previous versions of the same file
+            index = {key: value for key, value in index.items()
+                     if key.rsplit(":", 2)[0] != real_path}
+            index[stat_key] = dict(digest=self.file_digest(real_path),
+                                   entries=[])
+            self._dump_index(index)
+        return index[stat_key]["digest"]
+
+    def _add_entry(self, path: str, entry: str):
+        """ Record the given entry as one of the entries of the given file
+        in the index. """
+        _, stat_key = self._stat_key(path)
+        index = self._load_index()
+        name = os.path.basename(entry)
+        if stat_key in index and name not in index[stat_key]["entries"]:
+            index[stat_key]["entries"].append(name)
+            self._dump_index(index)
+
+    def _prune_index(self):
+        """ Remove the entries missing from the cache directory from the
+        index, dropping the files left without entries. """
+        names = {os.path.basename(entry) for entry in self.entries}
+        index = self._load_index()
+        pruned = dict()
+        for key, value in index.items():
+            entries = [name for name in value["entries"] if name in names]
+            if entries:
+                pruned[key] = dict(value, entries=entries)
+        if pruned != index:
+            self._dump_index(pruned)
+
+    def entry_path(self, path: str, **options) -> str:
+        """ Return the path of the cache entry of the given file, parsed
+        with the given options. """
+        key = json.dumps([self.content_hash(path), options], sort_keys=True)
+        name = hashlib.blake2b(key.encode(), digest_size=20).hexdigest()
+        return os.path.join(self.cache_dir, name + self._suffix)
+
+    def load(self, path: str, **options
+             ) -> Optional[Tuple[VariantTable, Counter]]:
+        """ Load the VariantTable of the given file from the cache.
+
+        Args:
+            path: path of the input file
+            **options: parsing options used to create the table
+
+        Returns:
+            tuple with the cached VariantTable and counter of skipped calls,
+            or None if the file is not cached
+        """
+        entry = self.entry_path(path, **options)
+        cached = load_table(entry)
+        if cached is not None:
+            os.utime(entry)  # mark the entry as recently used
+            self._add_entry(path, entry)
+        return cached
+
+    def store(self,
+              path: str,
+              table: VariantTable,
+              skipped: Optional[Counter] = None,
+              **options):
+        """ Store the VariantTable of the given file in the cache, evicting
+        the least recently used entries if needed.
+
+        Args:
+            path: path of the input file
+            table: VariantTable to store
+            skipped: counter of the calls skipped while parsing
+            **options: parsing options used to create the table
+        """
+        entry = self.entry_path(path, **options)
+        dump_table(entry, table, skipped)
+        self._add_entry(path, entry)
+        self.evict()
+
+    def evict(self):
+        """ Remove the least recently used entries until the cache is not
+        larger than max_size, and drop them from the index. """
+        entries = sorted(self.entries, key=os.path.getmtime)
+        size = sum(os.path.getsize(entry) for entry in entries)
+        for entry in entries:
+            if size <= self.max_size:
+                break
+            size -= os.path.getsize(entry)
+            os.remove(entry)
+        self._prune_index()
+
+    def clear(self) -> int:
+        """ Remove all the entries from the cache.
+
+        Returns:
+            number of removed entries
+        """
+        entries = self.entries
+        for entry in entries:
+            os.remove(entry)
+        if os.path.exists(self._index_path):
+            os.remove(self._index_path)
+        return len(entries)
+
+    def __repr__(self):
+        return "{}(cache_dir={}, max_size={})".format(
+            self.__class__.__name__, self.cache_dir, self.max_size
+        )
+
+
+class _FollowState:
+    """ Class storing the state of the last run on a growing VCF file, so
+    that the following run only parses the records appended since then.
+
+    The state includes the VariantTable parsed so far, the byte offset of
+    the end of the last parsed record, the inode of the file, the hash of
+    the header and the hash of the last FOLLOW_TAIL bytes preceding the
+    offset. These detect files replaced by a new file, files truncated
+    before the offset, and changes to the header or to the last records
+    parsed, without reading the whole file again; records rewritten in
+    place before those are not detected, so that the state directory
+    should be cleared after editing the file.
+
+    Attributes:
+        state_dir: path of the directory where the state is stored (created
+            if needed)
+        path: path of the followed VCF file
+        **options: parsing options used to create the table
+    """
+
+    def __init__(self, state_dir: str, path: str, **options):
+        self.state_dir = state_dir
+        self.path = path
+        self.options = options
+        os.makedirs(state_dir, exist_ok=True)
+        key = json.dumps([os.path.realpath(path), options], sort_keys=True)
+        name = hashlib.blake2b(key.encode(), digest_size=20).hexdigest()
+        self._base_path = os.path.join(state_dir, name)
+
+    def load(self) -> Optional[Tuple[VariantTable, Counter, dict]]:
+        """ Load the state of the last run.
+
+        Returns:
+            tuple with the VariantTable and counter of skipped calls parsed
+            so far, and dictionary with the offset, inode, header_hash,
+            tail_start and tail_hash of the file, or None if no state is
+            available
+        """
+        try:
+            with open(self._base_path + ".json") as f:
+                position = json.load(f)
+        except (OSError, ValueError):
+            return None
+        loaded = load_table(self._base_path + ".npz")
+        if loaded is None:
+            return None
+        return loaded[0], loaded[1], position
+
+    def save(self,
+             table: VariantTable,
+             skipped: Counter,
+             **position):
+        """ Save the state of the current run.
+
+        Args:
+            table: VariantTable with the variants parsed so far
+            skipped: counter of the calls skipped so far
+            **position: offset, inode, header_hash, tail_start and tail_hash
+                of the file
+        """
+        dump_table(self._base_path + ".npz", table, skipped)
+        tmp_path = self._base_path + ".json.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(position, f)
+        os.replace(tmp_path, self._base_path + ".json")
+
+    def __repr__(self):
+        return "{}(state_dir={}, path={})".format(
+            self.__class__.__name__, self.state_dir, self.path
+        )
+
+
+def dump_table(path: str,
+               table: VariantTable,
+               skipped: Optional[Counter] = None):
+    """ Save a VariantTable to the given .npz file; tables whose pool is
+    larger than their rows are compacted first.
+
+    Args:
+        path: path of the output file (replaced atomically)
+        table: VariantTable to save
+        skipped: counter of the calls skipped while parsing
+    """
+    skipped = skipped or Counter()
+    if len(table.pool) > len(table):  # e.g. a selection
+        table = table.compact()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, variant=table.variant, hf=table.hf,
+                 sample=table.sample, position=table.pool.position,
+                 vtype=table.pool.vtype, ref=table.pool.ref,
+                 alt=table.pool.alt,
+                 samples=np.array(table.samples, dtype=str),
+                 alleles=np.array(table.alleles, dtype=str),
+                 skipped_keys=np.array(list(skipped.keys()), dtype=str),
+                 skipped_values=np.array(list(skipped.values()),
+                                         dtype=np.int64))
+    os.replace(tmp_path, path)
+
+
+def load_table(path: str) -> Optional[Tuple[VariantTable, Counter]]:
+    """ Load a VariantTable from the given .npz file.
+
+    Args:
+        path: path of the input file
+
+    Returns:
+        tuple with the VariantTable and counter of skipped calls, or None if
+        the file is missing or invalid
+    """
+    try:
+        with np.load(path) as data:
+            pool = _VariantPool(data["position"], data["vtype"],
+                                data["ref"], data["alt"],
+                                data["alleles"].tolist())
+            table = VariantTable(data["variant"], data["hf"],
+                                 data["sample"], pool,
+                                 data["samples"].tolist())
+            skipped = Counter(dict(zip(data["skipped_keys"].tolist(),
+                                       data["skipped_values"].tolist())))
+    except (OSError, KeyError, ValueError):
+        return None
+    return table, skipped
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
-from mitoviz.constants import COLORS, STRANDS
+from mitoviz.annotation import INDEX
 
 
 class _BaseLocus:
@@ -11,9 +11,11 @@ class _BaseLocus:
     be added using a separate layer.
     Polar plots and linear plots use a different flavor of this base
     class.
+    Attributes of the loci are read from the annotation INDEX, where the
+    index of each locus is the same.
     """
-    _colors = COLORS
-    _strands = STRANDS
+    _colors = INDEX.colors
+    _strands = INDEX.strands
 
     def __init__(self, name: str, index: int):
         self.name = name
@@ -22,7 +24,7 @@ class _BaseLocus:
     @property
     def color(self) -> str:
         """ The locus-type-specific color. """
-        return self._colors[self.loc_type]
+        return self._colors[self.index]
 
     @property
     def loc_type(self):
@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import sys
+
+import click
+
+from mitoviz.cache import _ParseCache
+
+
+@click.group("mitoviz-cache")
+@click.version_option()
+def main():
+    """ Manage the cache of parsed VCF files. """
+
+
+@main.command("clear")
+@click.argument("cache_dir", type=click.Path(exists=True, file_okay=False))
+def clear(cache_dir):
+    """ Remove all the entries from the cache in CACHE_DIR. """
+    n_entries = _ParseCache(cache_dir).clear()
+    click.echo(f"Removed {n_entries} cached entries from {cache_dir}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
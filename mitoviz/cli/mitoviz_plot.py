@@ -1,11 +1,11 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
-import os
 import sys
 
 import click
 
+from mitoviz.constants import STREAM_BATCH_SIZE, VCF_ENGINES, VCF_EXTS
 from mitoviz.mitoviz import plot_table, plot_vcf
 
 
@@ -30,26 +30,83 @@ from mitoviz.mitoviz import plot_table, plot_vcf
 @click.option("--interactive", "-i", default=False, is_flag=True,
               show_default=True,
               help="Create an interactive version of the plot.")
-@click.option("--sep", "-S", default=",", show_default=True,
-              help="Column delimiter used (if INPUT_FILE is not a VCF file)")
+@click.option("--sep", "-S", default=None, show_default=True,
+              help="Column delimiter used (if INPUT_FILE is not a VCF file) "
+                   "[default: sniffed from INPUT_FILE]")
+@click.option("--contig", "-c", default=None, show_default=True,
+              help="Name of the mitochondrial contig (if INPUT_FILE is a VCF "
+                   "file; required if its header declares none of chrM, MT, "
+                   "chrMT, M or NC_012920.1) [default: auto-detected]")
+@click.option("--engine", "-e", default=None,
+              type=click.Choice(VCF_ENGINES), show_default=True,
+              help="VCF parsing engine (if INPUT_FILE is a VCF file) "
+                   "[default: pysam, if available]")
+@click.option("--all-calls", default=False, is_flag=True, show_default=True,
+              help="Plot every alternate allele of each record, even for "
+                   "samples not carrying it (if INPUT_FILE is a VCF file).")
+@click.option("--stream", default=False, is_flag=True, show_default=True,
+              help="Parse and plot one sample at a time (if INPUT_FILE is a "
+                   "VCF file).")
+@click.option("--batch-size", default=STREAM_BATCH_SIZE, show_default=True,
+              type=int,
+              help="Number of samples parsed in each pass over INPUT_FILE "
+                   "(with --stream).")
+@click.option("--cache-dir", default=None, show_default=True,
+              type=click.Path(file_okay=False),
+              help="Directory where parsed variants are cached, to speed up "
+                   "later plots of the same file (if INPUT_FILE is a VCF "
+                   "file).")
+@click.option("--jobs", "-j", default=1, show_default=True, type=int,
+              help="Number of processes used to parse INPUT_FILE, if it is a "
+                   "VCF file (0 uses all the available CPUs).")
+@click.option("--state-dir", default=None, show_default=True,
+              type=click.Path(file_okay=False),
+              help="Directory where the state of the last run is stored, to "
+                   "follow a growing VCF file: only new records are parsed, "
+                   "and only the samples they touch are plotted again "
+                   "(compressed VCF and BCF files are parsed as a whole; "
+                   "not supported with --jobs or --cache-dir for "
+                   "uncompressed VCF files).")
+@click.option("--chunksize", default=None, show_default=True, type=int,
+              help="Read INPUT_FILE in chunks of this many rows and plot one "
+                   "sample at a time (if INPUT_FILE is not a VCF file).")
+@click.option("--sorted-samples", default=False, is_flag=True,
+              show_default=True,
+              help="The rows of each sample are contiguous in INPUT_FILE, so "
+                   "no temporary files are needed (with --chunksize).")
+@click.option("--region", default=None, show_default=True, type=int,
+              nargs=2, metavar="START STOP",
+              help="Only plot the variants between these positions, "
+                   "included (if INPUT_FILE is not a VCF file).")
+@click.option("--threads", "-t", default=1, show_default=True, type=int,
+              help="Number of threads used to decompress INPUT_FILE, if it "
+                   "is a BGZF-compressed tabular file (0 uses all the "
+                   "available CPUs).")
 @click.pass_context
 def main(ctx, input_file, linear, sample, output, labels, labels_hf, legend,
-         split, interactive, sep):
+         split, interactive, sep, contig, engine, all_calls, stream,
+         batch_size, cache_dir, jobs, state_dir, chunksize, sorted_samples,
+         region, threads):
     """ Plot human mitochondrial variants available in INPUT_FILE. """
-    ext = os.path.splitext(os.path.basename(input_file))[-1]
-    if ext.casefold() == ".vcf":
+    if input_file.casefold().endswith(VCF_EXTS):
         plot_vcf(in_vcf=input_file, linear=linear, sample=sample, save=True,
                  output=output, labels=labels, labels_hf=labels_hf,
-                 legend=legend, split=split, interactive=interactive)
+                 legend=legend, split=split, interactive=interactive,
+                 stream=stream, batch_size=batch_size, contig=contig,
+                 engine=engine, carriers_only=not all_calls,
+                 cache_dir=cache_dir, jobs=jobs, state_dir=state_dir)
     else:
         pandas_opts = dict()
         if ctx.args:
             pandas_opts.update([el.split("=") for el in ctx.args])
+        if sep == r"\t":  # allow the C engine to parse TSV files
+            sep = "\t"
         plot_table(in_table=input_file, sep=sep, linear=linear, sample=sample,
                    save=True, output=output, labels=labels,
                    labels_hf=labels_hf,  legend=legend, split=split,
-                   interactive=interactive,
-                   **pandas_opts)
+                   interactive=interactive, chunksize=chunksize,
+                   sorted_samples=sorted_samples, threads=threads,
+                   positions=region, **pandas_opts)
 
     return 0
 
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import shutil
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from mitoviz.cache import _ParseCache
+from mitoviz.cli import mitoviz_cache as cli
+from mitoviz.parsers import _VcfParser
+from mitoviz.tests.constants import SAMPLE_HF_VCF
+
+
+class TestMitovizCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir)
+
+    def test_cli_cache_help(self):
+        # Given/When
+        result = self.runner.invoke(cli.main, ["--help"])
+
+        # Then
+        self.assertEqual(0, result.exit_code)
+        self.assertIn("Show this message and exit.", result.output)
+
+    def test_cli_cache_clear(self):
+        # Given
+        _VcfParser(SAMPLE_HF_VCF, cache_dir=self.cache_dir)
+
+        # When
+        result = self.runner.invoke(cli.main, ["clear", self.cache_dir])
+
+        # Then
+        self.assertEqual(0, result.exit_code)
+        self.assertIn("Removed 1 cached entries", result.output)
+        self.assertEqual([], _ParseCache(self.cache_dir).entries)
+
+
+if __name__ == '__main__':
+    unittest.main()
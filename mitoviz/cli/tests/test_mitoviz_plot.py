@@ -3,6 +3,7 @@
 # Created by Roberto Preste
 import os
 import unittest
+from unittest import mock
 
 import cv2
 import numpy as np
@@ -11,7 +12,7 @@ from click.testing import CliRunner
 from mitoviz.cli import mitoviz_plot as cli
 from mitoviz.tests.constants import (
     SAMPLE_VCF, SAMPLE_HF_VCF, SAMPLE_MULTI_VCF, SAMPLE_HF_CSV, SAMPLE_HF_TSV,
-    SAMPLE_HF_TSV_COMM,
+    SAMPLE_HF_TSV_COMM, SAMPLE_WGS_VCF_GZ, SAMPLE_WGS_BCF,
     BASE_IMG, BASE_IMG_LABELS, BASE_IMG_LEGEND, BASE_IMG_SPLIT,
     BASE_IMG_LINEAR, BASE_IMG_LINEAR_LABELS, BASE_IMG_LINEAR_LEGEND,
     BASE_IMG_LINEAR_SPLIT, BASE_IMG_LABELS_HF, BASE_IMG_LINEAR_LABELS_HF,
@@ -408,6 +409,39 @@ class TestCliVcf(unittest.TestCase):
         # Cleanup
         os.remove("HG00420.png")
 
+    def test_cli_plot_hf_polar_vcf_gz(self):
+        # Given
+        base_img = cv2.imread(BASE_HF_IMG)
+
+        # When
+        result = self.runner.invoke(cli.main, [SAMPLE_WGS_VCF_GZ])
+        result_img = cv2.imread("HG00420.png")
+
+        # Then
+        self.assertEqual(0, result.exit_code)
+        self.assertTrue(os.path.isfile("HG00420.png"))
+        diff = cv2.subtract(base_img, result_img)
+        self.assertFalse(np.any(diff))
+        # Cleanup
+        os.remove("HG00420.png")
+
+    def test_cli_plot_hf_polar_bcf(self):
+        # Given
+        base_img = cv2.imread(BASE_HF_IMG)
+
+        # When
+        result = self.runner.invoke(cli.main, [SAMPLE_WGS_BCF,
+                                               "--contig", "chrMT"])
+        result_img = cv2.imread("HG00420.png")
+
+        # Then
+        self.assertEqual(0, result.exit_code)
+        self.assertTrue(os.path.isfile("HG00420.png"))
+        diff = cv2.subtract(base_img, result_img)
+        self.assertFalse(np.any(diff))
+        # Cleanup
+        os.remove("HG00420.png")
+
     def test_cli_plot_hf_linear(self):
         # Given
         base_img = cv2.imread(BASE_HF_IMG_LINEAR)
@@ -1296,3 +1330,17 @@ class TestCliTsv(unittest.TestCase):
         self.assertFalse(np.any(diff))
         # Cleanup
         os.remove("HG00420.png")
+
+    def test_cli_plot_region(self):
+        # Given/When
+        with mock.patch.object(cli, "plot_table") as plot:
+            result = self.runner.invoke(cli.main, [SAMPLE_HF_TSV, "--region",
+                                                   "1", "5000"])
+            result_all = self.runner.invoke(cli.main, [SAMPLE_HF_TSV])
+
+        # Then
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(0, result_all.exit_code)
+        self.assertEqual((1, 5000),
+                         plot.call_args_list[0].kwargs["positions"])
+        self.assertIsNone(plot.call_args_list[1].kwargs["positions"])
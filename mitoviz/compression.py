@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import bz2
+import gzip
+import io
+import lzma
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Optional, Union
+
+from mitoviz.constants import COMPRESSION_MAGIC
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+class _BgzfReader(io.RawIOBase):
+    """ Binary stream of the decompressed content of a BGZF file, whose
+    blocks are decompressed in parallel by a pool of threads.
+
+    BGZF files (such as those created by bgzip) are multi-member gzip files
+    whose members store their own compressed size, so that they can be split
+    without decompressing them first; zlib releases the GIL while
+    decompressing, so that threads run in parallel.
+
+    Attributes:
+        path: path of the input BGZF file
+        threads: number of decompression threads; 0 uses all the available
+            CPUs [default: 0]
+    """
+    _header = struct.Struct("<4sIBBH")  # magic, mtime, xfl, os, xlen
+
+    def __init__(self, path: str, threads: int = 0):
+        super().__init__()
+        self.path = path
+        self.threads = threads or os.cpu_count() or 1
+        self._file = open(path, "rb")
+        self._executor = ThreadPoolExecutor(self.threads)
+        self._pending = deque()
+        self._buffer = b""
+        self._offset = 0
+
+    @staticmethod
+    def _inflate(data: bytes, crc: int, size: int) -> bytes:
+        block = zlib.decompress(data, -zlib.MAX_WBITS)
+        if len(block) != size or zlib.crc32(block) != crc:
+            raise OSError("Corrupted BGZF block")
+        return block
+
+    def _read_block(self) -> Optional[tuple]:
+        """ Read the next compressed block, returning its deflated data,
+        CRC32 and decompressed size, or None at the end of the file. """
+        header = self._file.read(self._header.size)
+        if not header:
+            return None
+        if len(header) < self._header.size:
+            raise OSError("Truncated BGZF block in {}".format(self.path))
+        magic, _, _, _, xlen = self._header.unpack(header)
+        extra = self._file.read(xlen)
+        block_size = None
+        i = 0
+        while i + 4 <= len(extra):  # find the BC subfield with BSIZE
+            length = struct.unpack_from("<H", extra, i + 2)[0]
+            if extra[i:i + 2] == b"BC" and length == 2:
+                block_size = struct.unpack_from("<H", extra, i + 4)[0] + 1
+            i += 4 + length
+        if magic != b"\x1f\x8b\x08\x04" or block_size is None:
+            raise OSError("{} is not a BGZF file".format(self.path))
+        data = self._file.read(block_size - self._header.size - xlen)
+        crc, size = struct.unpack("<II", data[-8:])
+        return data[:-8], crc, size
+
+    def _fill(self):
+        """ Submit the following blocks for decompression, keeping a few of
+        them in flight for each thread. """
+        while len(self._pending) < 4 * self.threads:
+            block = self._read_block()
+            if block is None:
+                break
+            self._pending.append(self._executor.submit(self._inflate, *block))
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while self._offset == len(self._buffer):
+            self._fill()
+            if not self._pending:
+                return 0
+            self._buffer = memoryview(self._pending.popleft().result())
+            self._offset = 0
+        n = min(len(b), len(self._buffer) - self._offset)
+        b[:n] = self._buffer[self._offset:self._offset + n]
+        self._offset += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._file.close()
+        super().close()
+
+    def __repr__(self):
+        return "{}(path={}, threads={})".format(
+            self.__class__.__name__, self.path, self.threads
+        )
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """ Detect the compression of the given file from its magic bytes, so
+    that its extension does not matter.
+
+    Args:
+        path: path of the input file
+
+    Returns:
+        either "bgzf", "gzip", "zstd", "bz2" or "xz", or None if the file
+        is not compressed
+    """
+    with open(path, "rb") as f:
+        header = f.read(18)
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            if (compression == "gzip" and len(header) == 18
+                    and header[3] & 4 and header[12:14] == b"BC"):
+                return "bgzf"
+            return compression
+    return None
+
+
+def open_compressed(path: str,
+                    threads: int = 1,
+                    compression: Union[str, dict, None] = "infer"
+                    ) -> BinaryIO:
+    """ Open the given file as a binary stream of its decompressed content,
+    detecting its compression with detect_compression().
+
+    Args:
+        path: path of the input file
+        threads: number of threads used to decompress BGZF files; 0 uses
+            all the available CPUs [default: 1]
+        compression: compression of the file, as accepted by pandas (either
+            "gzip", "zstd", "bz2" or "xz", a dictionary with one of them as
+            "method", or None for uncompressed files), or "infer" to detect
+            it [default: "infer"]
+
+    Returns:
+        binary file object
+    """
+    if isinstance(compression, dict):
+        compression = compression.get("method")
+    if compression == "infer":
+        compression = detect_compression(path)
+    elif compression not in (None, "gzip", "zstd", "bz2", "xz"):
+        raise ValueError("Unsupported compression {} of {}".format(
+            compression, path
+        ))
+    if compression == "bgzf" and threads != 1:
+        return io.BufferedReader(_BgzfReader(path, threads=threads),
+                                 buffer_size=1 << 16)
+    if compression in ("bgzf", "gzip"):
+        return gzip.open(path, "rb")
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("Zstandard-compressed files require zstandard "
+                              "to be installed")
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(path, "rb"), read_across_frames=True, closefd=True
+        )
+    if compression == "bz2":
+        return bz2.open(path, "rb")
+    if compression == "xz":
+        return lzma.open(path, "rb")
+    return open(path, "rb")
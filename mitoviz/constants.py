@@ -2,6 +2,30 @@
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
 
+MT_CONTIGS = ["chrM", "MT", "chrMT", "M", "NC_012920.1"]
+MT_LENGTH = 16569
+
+VCF_EXTS = (".vcf", ".vcf.gz", ".vcf.bgz", ".bcf")
+
+BGZF_EXTS = (".vcf.gz", ".vcf.bgz", ".bcf")
+
+VCF_ENGINES = ("pysam", "vcfpy")
+CACHE_SIZE = 1 << 30  # 1 GiB
+FOLLOW_TAIL = 4096  # bytes checked to detect rewritten files
+STREAM_BATCH_SIZE = 256  # samples parsed in each pass over a VCF file
+LABEL_CACHE_SIZE = 1 << 16  # distinct variant labels memoised
+TABULAR_ENGINES = ("c", "pyarrow", "python")
+TABULAR_PYTHON_OPTS = ("skipfooter", )
+TABULAR_SEPS = ",\t;| "
+PARQUET_EXTS = (".parquet", ".pq")
+ARROW_EXTS = (".feather", ".arrow", ".ipc")
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"\x28\xb5\x2f\xfd": "zstd",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+}
+
 NAMES = ["DLOOP", "TF", "RNR1", "TV", "RNR2", "TL1", "NC1",
          "ND1", "TI", "TQ", "NC2", "TM", "ND2",
          "TW", "NC3", "TA", "NC4", "TN", "OLR", "TC",
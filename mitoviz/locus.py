@@ -3,10 +3,9 @@
 # Created by Roberto Preste
 from typing import Tuple
 
+from mitoviz.annotation import INDEX
 from mitoviz.classes.base_locus import _BaseLocus
-from mitoviz.constants import (
-    NT_LENGTHS, STARTS, TEXT_HA, TEXT_VA, TEXT_Y, TYPES
-)
+from mitoviz.constants import TEXT_HA, TEXT_VA, TEXT_Y
 from mitoviz.utils import convert_nt, convert_plotly
 
 
@@ -17,11 +16,13 @@ class _PolarLocus(_BaseLocus):
         name: name of the locus
         index: index of the locus in the mt genome (dloop = 0, tf = 1, etc.)
     """
-    _nt_lengths = NT_LENGTHS
+    # the whole D-loop is plotted as a single locus
+    _nt_lengths = ([int(INDEX.lengths[0] + INDEX.lengths[-1])]
+                   + INDEX.lengths[1:-1].tolist())
     _text_ha = TEXT_HA
     _text_va = TEXT_VA
     _text_y = TEXT_Y
-    _types = TYPES
+    _types = INDEX.types
 
     def __init__(self, name: str, index: int):
         super().__init__(name=name, index=index)
@@ -83,11 +84,10 @@ class _PolarSplitLocus(_PolarLocus):
         name: name of the locus
         index: index of the locus in the mt genome (dloop = 0, tf = 1, etc.)
     """
-    _nt_lengths = NT_LENGTHS + [546]
+    _nt_lengths = _PolarLocus._nt_lengths + [int(INDEX.lengths[-1])]
     _text_ha = TEXT_HA + ["center"]
     _text_va = TEXT_VA + ["center"]
     _text_y = TEXT_Y + [19.2]
-    _types = TYPES + ["reg"]
 
     def __init__(self, name: str, index: int):
         super().__init__(name=name, index=index)
@@ -116,9 +116,9 @@ class _LinearLocus(_BaseLocus):
         name: name of the locus
         index: index of the locus in the mt genome (dloop = 0, tf = 1, etc.)
     """
-    _nt_lengths = [576] + NT_LENGTHS[1:] + [546]
-    _starts = STARTS
-    _types = TYPES + ["reg"]
+    _nt_lengths = INDEX.lengths.tolist()
+    _starts = INDEX.starts.tolist()
+    _types = INDEX.types
 
     def __init__(self, name: str, index: int):
         super().__init__(name=name, index=index)
@@ -2,12 +2,16 @@
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
 import os
-from typing import Optional
+from typing import Any, Optional, Tuple
 
 import matplotlib.pyplot as plt
 import pandas as pd
 
-from mitoviz.parsers import _DataFrameParser, _TabularParser, _VcfParser
+from mitoviz.constants import STREAM_BATCH_SIZE
+from mitoviz.parsers import (
+    _ArrowParser, _DataFrameParser, _InterchangeParser, _TabularParser,
+    _VcfParser
+)
 from mitoviz.plot import PlotBase, PlotVariants
 from mitoviz.utils import parse_path
 
@@ -65,14 +69,27 @@ def plot_vcf(in_vcf: str,
              labels_hf: bool = False,
              legend: bool = False,
              split: bool = False,
-             interactive: bool = False) -> None:
+             interactive: bool = False,
+             stream: bool = False,
+             batch_size: int = STREAM_BATCH_SIZE,
+             contig: Optional[str] = None,
+             engine: Optional[str] = None,
+             carriers_only: bool = True,
+             cache_dir: Optional[str] = None,
+             jobs: int = 1,
+             state_dir: Optional[str] = None) -> None:
     """ Plot variants from the given VCF file.
 
+    Bgzipped VCF files (.vcf.gz) and BCF files (.bcf) are supported as well;
+    if a tabix (.tbi) or CSI (.csi) index is available, only the records of
+    the mitochondrial contig are read.
+
     Args:
-        in_vcf: path of the input VCF file
+        in_vcf: path of the input VCF/BCF file
         linear: plot variants on a linear plot rather than a polar one
             [default: False]
-        sample: specific sample to plot (defaults to all available samples)
+        sample: specific sample to plot (defaults to all available samples);
+            the calls of other samples are not parsed
         save: if true, the final plot will be saved to a file [default: False]
         output: path of the output file where the plot will be saved
         labels: if true, add a label for each variant shown [default: False]
@@ -83,9 +100,49 @@ def plot_vcf(in_vcf: str,
         split: if true, plot split H and L strands [default: False]
         interactive: if true, create an interactive version of the plot
             [default: False]
+        stream: if true, parse and plot one batch of samples at a time,
+            releasing their variants once they are plotted, rather than
+            loading all the samples upfront; peak memory usage scales with
+            batch_size, as long as save is true, since figures are only
+            closed once saved [default: False]
+        batch_size: number of samples parsed in each pass over the file
+            when stream is true; larger batches read the file fewer times,
+            but hold the variants of more samples in memory [default: 256]
+        contig: name of the mitochondrial contig (defaults to the first of
+            chrM, MT, chrMT, M or NC_012920.1 available in the file; it is
+            required if the file declares other contigs only)
+        engine: VCF parsing engine, either "pysam" or "vcfpy" (defaults to
+            pysam if available)
+        carriers_only: if true, only plot the variants actually carried by
+            each sample, skipping hom-ref calls and no-calls [default: True]
+        cache_dir: directory where parsed variants are cached, so that
+            later plots of the same unchanged file skip parsing (defaults to
+            no caching)
+        jobs: number of processes used to parse the VCF file; 0 uses all
+            the available CPUs [default: 1]
+        state_dir: directory where the state of the last run is stored, to
+            follow a growing VCF file: only the records appended since the
+            last run are parsed, and only the samples they touch are
+            plotted again; compressed VCF files and BCF files are parsed as
+            a whole, while jobs and cache_dir are not supported for
+            uncompressed VCF files (ignored if stream is true)
     """
-    vcf = _VcfParser(in_vcf)
-    variants_per_sample = vcf.variants
+    vcf = _VcfParser(in_vcf, stream=stream, contig=contig, engine=engine,
+                     parsed_samples=[sample] if sample else None,
+                     carriers_only=carriers_only, cache_dir=cache_dir,
+                     jobs=jobs, state_dir=None if stream else state_dir)
+    touched_samples = None
+    if stream:
+        variants_per_sample = vcf.iter_tables(batch_size=batch_size)
+        n_samples = len(vcf.parsed_samples) or 1
+    else:
+        # samples without variants are plotted as well, as in stream mode
+        variants_per_sample = list(vcf.table.iter_samples())
+        n_samples = len(variants_per_sample)
+        if state_dir is not None:  # only plot samples touched by new records
+            touched_samples = vcf.touched_samples
+            if sample and sample not in touched_samples:
+                return
     variant_plot = PlotVariants()
     if linear:
         if interactive:
@@ -100,9 +157,11 @@ def plot_vcf(in_vcf: str,
 
     if sample:
         variant_plot.sample = sample
-        fig = plot_variants(variants_per_sample[sample],
-                            labels, labels_hf,
-                            legend, split)
+        if stream:
+            _, variants = next(vcf.iter_tables())
+        else:
+            variants = vcf.table.select(sample)
+        fig = plot_variants(variants, labels, labels_hf, legend, split)
 
         if save:
             dirname, name, ext = parse_path(output)
@@ -115,8 +174,10 @@ def plot_vcf(in_vcf: str,
                 plt.savefig(os.path.join(dirname, f"{name}{ext}"))
                 plt.close()
     else:
-        for i, (sample, variants) in enumerate(variants_per_sample.items(),
+        for i, (sample, variants) in enumerate(variants_per_sample,
                                                start=1):
+            if touched_samples is not None and sample not in touched_samples:
+                continue
             variant_plot.sample = sample
             fig = plot_variants(variants, labels, labels_hf,
                                 legend, split)
@@ -131,7 +192,7 @@ def plot_vcf(in_vcf: str,
                     else:
                         plt.savefig(os.path.join(dirname, f"{name}{ext}"))
                         plt.close()
-                elif len(variants_per_sample) == 1:
+                elif n_samples == 1:
                     if interactive:
                         fig.write_html(os.path.join(dirname, f"{name}.html"),
                                        auto_open=False)
@@ -148,7 +209,7 @@ def plot_vcf(in_vcf: str,
                         plt.close()
 
 
-def plot_df(in_df: pd.DataFrame,
+def plot_df(in_df: Any,
             linear: bool = False,
             sample: Optional[str] = None,
             save: bool = False,
@@ -165,8 +226,14 @@ def plot_df(in_df: pd.DataFrame,
             hf_col: str = "HF") -> None:
     """ Plot variant from the given pandas DataFrame.
 
+    Other dataframes, such as pyarrow Tables or polars DataFrames, are
+    supported as well if pyarrow is installed: any object implementing the
+    Arrow PyCapsule interface or the DataFrame interchange protocol is read
+    directly, importing only the needed columns without converting it to a
+    pandas DataFrame.
+
     Args:
-        in_df: input pandas DataFrame
+        in_df: input pandas DataFrame, or other supported dataframe
         linear: plot variants on a linear plot rather than a polar one
             [default: False]
         sample: specific sample to plot (defaults to all available samples)
@@ -186,13 +253,18 @@ def plot_df(in_df: pd.DataFrame,
         sample_col: column name for the variant sample
         hf_col: column name for the variant heteroplasmic fraction
     """
-    df = _DataFrameParser(in_df,
-                          pos_col=pos_col,
-                          ref_col=ref_col,
-                          alt_col=alt_col,
-                          sample_col=sample_col,
-                          hf_col=hf_col)
-    variants_per_sample = df.variants
+    if (not isinstance(in_df, pd.DataFrame)
+            and _InterchangeParser.is_supported(in_df)):
+        parser = _InterchangeParser
+    else:
+        parser = _DataFrameParser
+    df = parser(in_df,
+                pos_col=pos_col,
+                ref_col=ref_col,
+                alt_col=alt_col,
+                sample_col=sample_col,
+                hf_col=hf_col)
+    variants_per_sample = dict(df.table.iter_samples(skip_empty=True))
     variant_plot = PlotVariants()
     if linear:
         if interactive:
@@ -207,7 +279,7 @@ def plot_df(in_df: pd.DataFrame,
 
     if sample:
         variant_plot.sample = sample
-        fig = plot_variants(variants_per_sample[sample],
+        fig = plot_variants(df.table.select(sample),
                             labels, labels_hf,
                             legend, split)
 
@@ -256,7 +328,7 @@ def plot_df(in_df: pd.DataFrame,
 
 
 def plot_table(in_table: str,
-               sep: str = ",",
+               sep: Optional[str] = None,
                linear: bool = False,
                sample: Optional[str] = None,
                save: bool = False,
@@ -271,12 +343,27 @@ def plot_table(in_table: str,
                alt_col: str = "ALT",
                sample_col: str = "SAMPLE",
                hf_col: str = "HF",
+               engine: Optional[str] = None,
+               chunksize: Optional[int] = None,
+               sorted_samples: bool = False,
+               threads: int = 1,
+               positions: Optional[Tuple[int, int]] = None,
                **kwargs) -> None:
     """ Plot variants from the given tabular file.
 
+    Files compressed with gzip (or BGZF), zstd, bzip2 or xz are decompressed
+    while they are read, whatever their extension.
+
+    Parquet (.parquet, .pq), Feather (.feather) and Arrow IPC (.arrow, .ipc)
+    files are supported as well, if pyarrow is installed: only the needed
+    columns and the rows of the requested sample and positions are read
+    from them, and sep, engine, chunksize, sorted_samples, threads and
+    kwargs are ignored.
+
     Args:
         in_table: path of the input tabular file
-        sep: column delimiter used [default: ',']
+        sep: column delimiter used (defaults to the one sniffed from the
+            beginning of the file)
         linear: plot variants on a linear plot rather than a polar one
             [default: False]
         sample: specific sample to plot (defaults to all available samples)
@@ -295,10 +382,60 @@ def plot_table(in_table: str,
         alt_col: column name for the variant alternate allele
         sample_col: column name for the variant sample
         hf_col: column name for the variant heteroplasmic fraction
+        engine: pandas parsing engine, either "c", "pyarrow" or "python"
+            (defaults to "c", or "python" if required by sep or kwargs)
+        chunksize: if given, read the file in chunks of this many rows and
+            plot one sample at a time, so that the whole file is never loaded
+            in memory (figures are only closed once saved, so that save
+            should be true as well); not supported by the pyarrow engine
+            (defaults to reading the whole file)
+        sorted_samples: if true and chunksize is given, expect the rows of
+            each sample to be contiguous, so that each sample is plotted as
+            soon as it is read rather than spilled to a temporary file
+            [default: False]
+        threads: number of threads used to decompress BGZF files; 0 uses
+            all the available CPUs [default: 1]
+        positions: inclusive range of the positions to plot, as a (start,
+            stop) tuple (defaults to all the positions)
         **kwargs: additional arguments passed to pandas.read_table()
     """
-    table = _TabularParser(in_table, sep=sep, **kwargs)
-    plot_df(table.df,
+    columns = _TabularParser.variant_columns(pos_col, ref_col, alt_col,
+                                             sample_col, hf_col)
+    if _ArrowParser.is_arrow(in_table):
+        table = _ArrowParser(in_table, columns=list(columns),
+                             samples=[sample] if sample else None,
+                             positions=positions, pos_col=pos_col,
+                             sample_col=sample_col)
+        chunksize = None
+    else:
+        table = _TabularParser(in_table, sep=sep, engine=engine,
+                               columns=columns, threads=threads, **kwargs)
+    if chunksize is not None:
+        _plot_chunks(table, chunksize,
+                     sorted_samples=sorted_samples,
+                     positions=positions,
+                     linear=linear,
+                     sample=sample,
+                     save=save,
+                     output=output,
+                     labels=labels,
+                     labels_hf=labels_hf,
+                     legend=legend,
+                     split=split,
+                     interactive=interactive,
+                     pos_col=pos_col,
+                     ref_col=ref_col,
+                     alt_col=alt_col,
+                     sample_col=sample_col,
+                     hf_col=hf_col)
+        return
+    if isinstance(table, _ArrowParser):
+        df = table.read()
+    else:
+        df = table.df
+        if positions is not None:
+            df = df[df[pos_col].between(*positions)]
+    plot_df(df,
             linear=linear,
             sample=sample,
             save=save,
@@ -313,3 +450,78 @@ def plot_table(in_table: str,
             alt_col=alt_col,
             sample_col=sample_col,
             hf_col=hf_col)
+
+
+def _plot_chunks(table: _TabularParser,
+                 chunksize: int,
+                 sorted_samples: bool = False,
+                 positions: Optional[Tuple[int, int]] = None,
+                 linear: bool = False,
+                 sample: Optional[str] = None,
+                 save: bool = False,
+                 output: Optional[str] = None,
+                 labels: bool = False,
+                 labels_hf: bool = False,
+                 legend: bool = False,
+                 split: bool = False,
+                 interactive: bool = False,
+                 **columns) -> None:
+    """ Plot variants from the given tabular file, reading it in chunks and
+    plotting one sample at a time.
+
+    Args:
+        table: parser of the input tabular file
+        chunksize: number of rows read at a time
+        sorted_samples: if true, expect the rows of each sample to be
+            contiguous [default: False]
+        positions: inclusive range of the positions to plot (defaults to
+            all the positions)
+        linear: plot variants on a linear plot rather than a polar one
+            [default: False]
+        sample: specific sample to plot (defaults to all available samples)
+        save: if true, the final plot will be saved to a file [default: False]
+        output: path of the output file where the plot will be saved
+        labels: if true, add a label for each variant shown [default: False]
+        labels_hf: if true and `labels=True`, show HF value in each variant's
+            label [default: False]
+        legend: if true, add a legend for loci colors in the plot
+            [default: False]
+        split: if true, plot split H and L strands [default: False]
+        interactive: if true, create an interactive version of the plot
+            [default: False]
+        **columns: column names passed to _DataFrameParser
+    """
+    variants_per_sample = table.iter_tables(
+        chunksize, samples=[sample] if sample else None,
+        positions=positions, sorted_samples=sorted_samples, **columns
+    )
+    variant_plot = PlotVariants()
+    if linear:
+        if interactive:
+            plot_variants = variant_plot.linear_plotly
+        else:
+            plot_variants = variant_plot.linear
+    else:
+        if interactive:
+            plot_variants = variant_plot.polar_plotly
+        else:
+            plot_variants = variant_plot.polar
+
+    for i, (name_sample, variants) in enumerate(variants_per_sample,
+                                                start=1):
+        variant_plot.sample = name_sample
+        fig = plot_variants(variants, labels, labels_hf, legend, split)
+
+        if save:
+            dirname, name, ext = parse_path(output)
+            # a sample is yielded once the next one is found, if any
+            if name == "":
+                name = name_sample
+            elif not sample and len(table.chunk_samples) > 1:
+                name = f"{name}_{i}"
+            if interactive:
+                fig.write_html(os.path.join(dirname, f"{name}.html"),
+                               auto_open=False)
+            else:
+                plt.savefig(os.path.join(dirname, f"{name}{ext}"))
+                plt.close()
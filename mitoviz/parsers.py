@@ -1,34 +1,191 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
-from collections import defaultdict
-from typing import List
+import csv
+import hashlib
+import io
+import os
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+)
 
+import numpy as np
 import pandas as pd
 import vcfpy
+from vcfpy.parser import process_alt
 
+from mitoviz.cache import _FollowState, _ParseCache, dump_table, load_table
+from mitoviz.compression import open_compressed
+from mitoviz.constants import (
+    ARROW_EXTS, BGZF_EXTS, FOLLOW_TAIL, MT_CONTIGS, PARQUET_EXTS,
+    STREAM_BATCH_SIZE, TABULAR_ENGINES, TABULAR_PYTHON_OPTS, TABULAR_SEPS,
+    VCF_ENGINES
+)
+from mitoviz.table import VariantTable, _EncodedColumn, _VariantTableBuilder
 from mitoviz.variant import _Variant
 
+try:
+    import pysam
+except ImportError:  # pragma: no cover
+    pysam = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.feather as feather
+    import pyarrow.interchange  # noqa: F401
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+
 
 class _VcfParser:
     """ Class to read and parse the given VCF file.
 
+    Records can be parsed either with pysam (htslib-based, used by default
+    when available) or with vcfpy (pure Python); both engines produce
+    identical variants. BCF files require pysam. When an index is
+    available, only the records of the mitochondrial contig are read.
+
     Attributes
-        vcf_in: path of the input VCF file
+        vcf_in: path of the input VCF/BCF file
+        stream: if true, variants are not parsed upfront, and should be
+            retrieved one sample at a time using iter_tables() or
+            iter_variants() [default: False]
+        contig: name of the mitochondrial contig (defaults to the first of
+            MT_CONTIGS declared in the file header; when no contig is
+            declared, all records are parsed, while a ValueError is raised if
+            none of the declared contigs is in MT_CONTIGS)
+        engine: parsing engine to use, either "pysam" or "vcfpy" (defaults
+            to pysam if available, falling back to vcfpy for files that
+            htslib is not able to parse)
+        parsed_samples: names of the samples to parse (defaults to all
+            available samples); the calls of other samples are not decoded
+        carriers_only: if true, only create variants for the alternate
+            alleles actually carried by each sample, according to the GT, AD
+            or HF value of its call; the number of skipped calls is stored
+            in skipped_calls [default: True]
+        cache_dir: path of the directory where parsed variants are cached,
+            so that later runs on the same unchanged file load them rather
+            than parsing the file again (defaults to no caching)
+        jobs: number of processes used to parse the file, each parsing the
+            calls of a subset of the samples; 0 uses all the available CPUs
+            [default: 1]
+        state_dir: path of the directory where the state of the last run is
+            stored, to follow a growing VCF file: only the records appended
+            since the last run are parsed, using vcfpy, and the samples they
+            touch are stored in touched_samples; compressed VCF files and
+            BCF files are parsed as a whole, while jobs and cache_dir are not
+            supported for uncompressed VCF files (defaults to parsing the
+            whole file)
     """
 
-    def __init__(self, vcf_in: str):
+    def __init__(self,
+                 vcf_in: str,
+                 stream: bool = False,
+                 contig: Optional[str] = None,
+                 engine: Optional[str] = None,
+                 parsed_samples: Optional[List[str]] = None,
+                 carriers_only: bool = True,
+                 cache_dir: Optional[str] = None,
+                 jobs: int = 1,
+                 state_dir: Optional[str] = None):
         self.vcf_in = vcf_in
-        self._variants = defaultdict(list)
-        self._reader = vcfpy.Reader.from_path(vcf_in)
-        self.parse_variants()
+        self.stream = stream
+        self.carriers_only = carriers_only
+        self.cache_dir = cache_dir
+        self.jobs = jobs if jobs > 0 else os.cpu_count()
+        self.state_dir = state_dir
+        if state_dir is not None and self.is_plain_text and (
+                self.jobs > 1 or cache_dir is not None):
+            raise ValueError("jobs and cache_dir are not supported when "
+                             "following an uncompressed VCF file")
+        self.touched_samples = []
+        self.skipped_calls = Counter()
+        self.engine = self._find_engine(engine)
+        if state_dir is not None and self.is_plain_text:
+            self.engine = "vcfpy"  # pysam can not read from an offset
+        self._fallback = engine is None
+        self._table = None
+        self._variants = None
+        try:
+            self._reader = self._open()
+        except (OSError, ValueError):
+            if not self._can_fallback:
+                raise
+            self.engine = "vcfpy"
+            self._reader = self._open()
+        self.contig = self._find_contig(contig)
+        self.parsed_samples = self._find_samples(parsed_samples)
+        if not stream:
+            self.parse_variants()
+
+    @property
+    def is_bcf(self) -> bool:
+        """ Return whether the input file is in BCF format. """
+        return self.vcf_in.casefold().endswith(".bcf")
+
+    @property
+    def is_indexed(self) -> bool:
+        """ Return whether the input file has a tabix or CSI index. """
+        return (self.vcf_in.casefold().endswith(BGZF_EXTS)
+                and any(os.path.isfile(self.vcf_in + ext)
+                        for ext in (".tbi", ".csi")))
+
+    @property
+    def is_plain_text(self) -> bool:
+        """ Return whether the input file is an uncompressed VCF file. """
+        return not (self.is_bcf
+                    or self.vcf_in.casefold().endswith(BGZF_EXTS))
+
+    @property
+    def _requested_engine(self) -> Optional[str]:
+        """ Return the engine requested by the user, or None if it is picked
+        automatically (possibly falling back to vcfpy). """
+        return None if self._fallback else self.engine
+
+    @property
+    def _can_fallback(self) -> bool:
+        """ Return whether parsing can be retried using vcfpy. """
+        return self._fallback and self.engine == "pysam" and not self.is_bcf
+
+    @property
+    def contigs(self) -> List[str]:
+        """ Names of the contigs declared in the header or index of the
+        input file. """
+        if self.engine == "pysam":
+            contigs = list(self._reader.header.contigs)
+            if not contigs and self.is_indexed:
+                contigs = list(self._reader.index)
+            return contigs
+        return [line.id for line in self._reader.header.get_lines("contig")]
 
     @property
     def samples(self) -> List[str]:
+        if self.engine == "pysam":
+            return list(self._reader.header.samples)
         return self._reader.header.samples.names
 
+    @property
+    def table(self) -> Optional[VariantTable]:
+        """ The VariantTable with the parsed variants (None if variants are
+        not parsed upfront). """
+        return self._table
+
     @property
     def variants(self) -> dict:
+        """ Per-sample lists of the parsed variants, as _Variant instances.
+        """
+        if self._variants is None:
+            if self._table is None:
+                return dict()
+            self._variants = {
+                sample: table.variants()
+                for sample, table in self._table.iter_samples(skip_empty=True)
+            }
         return self._variants
 
     @staticmethod
@@ -48,32 +205,595 @@ class _VcfParser:
             return hf_list[i]
         return 0.5
 
+    @staticmethod
+    def parse_sample(sample: "pysam.VariantRecordSample", i: int) -> float:
+        """ Parse the pysam.VariantRecordSample to get the i-th value for HF;
+        if not present, return 0.5.
+
+        Single precision values are converted to their shortest
+        representation, so that they match the ones parsed by vcfpy.
+
+        Args:
+            sample: input sample call to parse
+            i: i-th element of HF to get
+
+        Returns:
+            either the required i-th element of HF or 0.5
+        """
+        hf_list = _VcfParser._as_tuple(sample.get("HF") or ())
+        if any(hf is not None for hf in hf_list):
+            hf = hf_list[i]
+            return float(str(np.float32(hf))) if isinstance(hf, float) else hf
+        return 0.5
+
+    @staticmethod
+    def carried_alleles(n_alts: int,
+                        gt: Optional[Sequence[Optional[int]]] = None,
+                        ad: Optional[Sequence[Optional[int]]] = None,
+                        hf: Optional[Sequence[Optional[float]]] = None,
+                        skipped: Optional[Counter] = None) -> List[int]:
+        """ Return the indices of the alternate alleles carried by a call.
+
+        The GT value is used if available, otherwise the AD and HF values
+        are checked in turn; if none of them is available, all the alternate
+        alleles are considered carried.
+
+        Args:
+            n_alts: number of alternate alleles of the record
+            gt: allele indices of the GT value (None if the call has no GT)
+            ad: allelic depths of the call (None if the call has no AD)
+            hf: heteroplasmic fractions of the call (None if the call has
+                no HF)
+            skipped: counter updated with the number of skipped calls, as
+                "no_call" (missing genotype), "hom_ref" (no alternate allele
+                carried) and "not_carried" (number of alternate alleles not
+                carried by calls carrying other alternate alleles)
+
+        Returns:
+            list of indices of the carried alternate alleles
+        """
+        if gt is not None:
+            values = [allele for allele in gt if allele is not None]
+            carried = [i for i in range(n_alts) if i + 1 in values]
+        elif ad is not None:
+            values = [depth for depth in ad if depth is not None]
+            carried = [i for i in range(n_alts)
+                       if i + 1 < len(ad) and ad[i + 1]]
+        elif hf is not None:
+            values = [frac for frac in hf if frac is not None]
+            carried = [i for i in range(n_alts) if i < len(hf) and hf[i]]
+        else:
+            return list(range(n_alts))
+        if skipped is not None:
+            if not values:
+                skipped["no_call"] += 1
+            elif not carried:
+                skipped["hom_ref"] += 1
+            elif len(carried) < n_alts:
+                skipped["not_carried"] += n_alts - len(carried)
+        return carried
+
+    def _find_engine(self, engine: Optional[str] = None) -> str:
+        """ Return the name of the parsing engine to use.
+
+        Args:
+            engine: name of the engine requested by the user, if any
+
+        Returns:
+            the requested engine, or pysam if available
+        """
+        if engine is None:
+            engine = "pysam" if pysam is not None or self.is_bcf else "vcfpy"
+        if engine not in VCF_ENGINES:
+            raise ValueError("Engine must be one of {}, not {}".format(
+                ", ".join(VCF_ENGINES), engine
+            ))
+        if engine == "pysam" and pysam is None:
+            raise ImportError("The pysam engine requires pysam to be "
+                              "installed")
+        if engine == "vcfpy" and self.is_bcf:
+            raise ValueError("BCF files can only be parsed using the pysam "
+                             "engine")
+        return engine
+
+    @staticmethod
+    def _as_tuple(value) -> tuple:
+        """ Wrap single values returned by pysam into a tuple. """
+        return value if isinstance(value, tuple) else (value, )
+
+    def _open(self, samples: Optional[List[str]] = None):
+        """ Open the input file with the proper reader, parsing only the
+        calls of the given samples (defaults to all available samples). """
+        if self.engine == "pysam":
+            reader = pysam.VariantFile(self.vcf_in)
+            if samples:
+                reader.subset_samples(samples)
+            return reader
+        return vcfpy.Reader.from_path(self.vcf_in, parsed_samples=samples)
+
+    def _find_contig(self, contig: Optional[str] = None) -> Optional[str]:
+        """ Return the name of the mitochondrial contig of the input file.
+
+        Args:
+            contig: name of the contig requested by the user, if any
+
+        Returns:
+            the requested contig or the first of MT_CONTIGS available in the
+            input file, or None if no contig is declared (so that all the
+            records are parsed); a ValueError is raised if contigs are
+            declared but none of them is a known mitochondrial contig
+        """
+        contigs = self.contigs
+        if contig:
+            if contigs and contig not in contigs:
+                raise ValueError(
+                    "Contig {} not found in {}".format(contig, self.vcf_in)
+                )
+            return contig
+        for name in MT_CONTIGS:
+            if name in contigs:
+                return name
+        if contigs:
+            raise ValueError(
+                "No mitochondrial contig found in {} (declared contigs: "
+                "{}{}); use the contig argument to select it".format(
+                    self.vcf_in, ", ".join(contigs[:20]),
+                    ", ..." if len(contigs) > 20 else ""
+                ))
+        return None
+
+    def _find_samples(self,
+                      parsed_samples: Optional[List[str]] = None
+                      ) -> List[str]:
+        """ Return the names of the samples to parse.
+
+        Args:
+            parsed_samples: names of the samples requested by the user, if any
+
+        Returns:
+            the requested samples, or all the samples available in the input
+            file (an empty list refers to a single sample without name)
+        """
+        samples = self.samples
+        if not parsed_samples:
+            return samples
+        missing = [sample for sample in parsed_samples
+                   if sample not in (samples or ["MITOVIZ001"])]
+        if missing:
+            raise ValueError("Sample(s) {} not found in {}".format(
+                ", ".join(missing), self.vcf_in
+            ))
+        if not samples:
+            return []
+        return list(dict.fromkeys(parsed_samples))
+
+    def _records(self, reader) -> Iterator:
+        """ Iterate over the records of the mitochondrial contig available in
+        the given reader, using the index if available. """
+        if self.contig is None:
+            return iter(reader)
+        if not isinstance(reader, vcfpy.Reader):  # pysam
+            if self.is_indexed:
+                return reader.fetch(self.contig)
+            return (record for record in reader
+                    if record.chrom == self.contig)
+        if self.is_indexed and reader.tabix_path:  # vcfpy only supports .tbi
+            return reader.fetch(self.contig)
+        return (record for record in reader if record.CHROM == self.contig)
+
+    def _parse_records(self,
+                       reader: vcfpy.Reader,
+                       samples: List[str],
+                       table: _VariantTableBuilder,
+                       skipped: Counter):
+        """ Parse the records available in the given reader, adding the
+        variants of the given samples to the table.
+
+        Args:
+            reader: vcfpy.Reader to read records from
+            samples: names of the samples to parse (an empty list refers to a
+                single sample without name)
+            table: builder of the table where variants will be stored
+            skipped: counter of the calls skipped as not carried
+        """
+        for record in self._records(reader):
+            if samples:  # sample name is specified
+                n_alts = len(record.ALT)
+                for j, sample in enumerate(samples):
+                    call = record.call_for_sample[sample]
+                    if self.carriers_only:
+                        data = call.data
+                        indices = self.carried_alleles(
+                            n_alts,
+                            (call.gt_alleles or ()) if "GT" in data else None,
+                            data.get("AD"), data.get("HF"), skipped
+                        )
+                    else:
+                        indices = range(n_alts)
+                    for i in indices:
+                        table.append(j, record.REF, record.POS, record.ALT[i],
+                                     self.parse_call(call, i))
+            else:  # single sample without name
+                for alt in record.ALT:
+                    table.append(0, record.REF, record.POS, alt, 0.5)
+
+    def _parse_pysam_records(self,
+                             reader: "pysam.VariantFile",
+                             samples: List[str],
+                             table: _VariantTableBuilder,
+                             skipped: Counter):
+        """ Parse the records available in the given pysam reader, adding
+        the variants of the given samples to the table.
+
+        Alternate alleles are typed using vcfpy, so that variants are
+        identical to the ones parsed from plain VCF files.
+
+        Args:
+            reader: pysam.VariantFile to read records from
+            samples: names of the samples to parse (an empty list refers to a
+                single sample without name)
+            table: builder of the table where variants will be stored
+            skipped: counter of the calls skipped as not carried
+        """
+        for record in self._records(reader):
+            alts = [process_alt(None, record.ref, alt)
+                    for alt in record.alts or ()]
+            if samples:  # sample name is specified
+                fields = record.format
+                has_gt = "GT" in fields
+                has_ad = "AD" in fields
+                has_hf = "HF" in fields
+                for j, sample in enumerate(samples):
+                    call = record.samples[sample]
+                    if self.carriers_only:
+                        indices = self.carried_alleles(
+                            len(alts),
+                            call["GT"] if has_gt else None,
+                            self._as_tuple(call["AD"]) if has_ad else None,
+                            self._as_tuple(call["HF"]) if has_hf else None,
+                            skipped
+                        )
+                    else:
+                        indices = range(len(alts))
+                    for i in indices:
+                        table.append(j, record.ref, record.pos, alts[i],
+                                     self.parse_sample(call, i))
+            else:  # single sample without name
+                for alt in alts:
+                    table.append(0, record.ref, record.pos, alt, 0.5)
+
+    def _read(self, samples: List[str]) -> VariantTable:
+        """ Return the variants of the given samples, loading them from the
+        cache if available, or parsing the input file otherwise.
+
+        Args:
+            samples: names of the samples to parse (an empty list refers to a
+                single sample without name)
+
+        Returns:
+            VariantTable with the variants of the given samples
+        """
+        if self.cache_dir is None:
+            return self._parse(samples)
+        cache = _ParseCache(self.cache_dir)
+        options = dict(contig=self.contig, samples=samples,
+                       carriers_only=self.carriers_only,
+                       engine=self._requested_engine)
+        cached = cache.load(self.vcf_in, **options)
+        if cached is not None:
+            table, skipped = cached
+            self.skipped_calls.update(skipped)
+            return table
+        skipped_before = self.skipped_calls.copy()
+        table = self._parse(samples)
+        cache.store(self.vcf_in, table, self.skipped_calls - skipped_before,
+                    **options)
+        return table
+
+    def _parse(self, samples: List[str]) -> VariantTable:
+        """ Open the input file and parse the variants of the given samples.
+
+        If htslib fails to parse a record and no engine was explicitly
+        requested, the file is parsed again using vcfpy.
+
+        Args:
+            samples: names of the samples to parse (an empty list refers to a
+                single sample without name)
+
+        Returns:
+            VariantTable with the variants of the given samples
+        """
+        if self.jobs > 1 and len(samples) > 1:
+            return self._parse_parallel(samples)
+        table = _VariantTableBuilder(samples or ["MITOVIZ001"])
+        skipped = Counter()
+        reader = self._open(samples)
+        try:
+            if self.engine == "pysam":
+                self._parse_pysam_records(reader, samples, table, skipped)
+            else:
+                self._parse_records(reader, samples, table, skipped)
+        except OSError:
+            if not self._can_fallback:
+                raise
+            self.engine = "vcfpy"
+            self._reader = self._open()
+            return self._parse(samples)
+        finally:
+            reader.close()
+        self.skipped_calls.update(skipped)
+        return table.build()
+
+    def _parse_parallel(self, samples: List[str]) -> VariantTable:
+        """ Parse the variants of the given samples using a pool of
+        processes, each parsing a contiguous subset of the samples.
+
+        Args:
+            samples: names of the samples to parse
+
+        Returns:
+            VariantTable with the variants of the given samples, identical
+            to the one created by a single process
+        """
+        n_jobs = min(self.jobs, len(samples))
+        size = -(-len(samples) // n_jobs)
+        partitions = [samples[start:start + size]
+                      for start in range(0, len(samples), size)]
+        engine = self._requested_engine
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(
+                _parse_samples,
+                [self.vcf_in] * len(partitions), partitions,
+                [self.contig] * len(partitions),
+                [engine] * len(partitions),
+                [self.carriers_only] * len(partitions)
+            ))
+        for _, skipped, engine in results:
+            self.skipped_calls.update(skipped)
+            if engine == "vcfpy":
+                self.engine = engine
+        return VariantTable.concat(table for table, _, _ in results)
+
     def parse_variants(self):
         """ Read the variants from the input VCF file and parse them in the
         required format.
 
-        Variants are stored in a per-sample fashion, in the self.variants
-        dictionary.
+        Variants are stored in the self.table VariantTable, and are
+        available in a per-sample fashion in the self.variants dictionary.
         """
-        for record in self._reader:
-            if self.samples:  # sample name is specified
-                for sample, call in record.call_for_sample.items():
-                    variants = [_Variant(record.REF, record.POS, alt,
-                                         self.parse_call(call, i))
-                                for i, alt in enumerate(record.ALT)]
-                    self._variants[sample].extend(variants)
-            else:  # single sample without name
-                sample = "MITOVIZ001"
-                variants = [_Variant(record.REF, record.POS, alt, 0.5)
-                            for alt in record.ALT]
-                self._variants[sample].extend(variants)
+        if self.state_dir is not None:
+            self._table = self._follow(self.parsed_samples)
+        else:
+            self._table = self._read(self.parsed_samples)
+            self.touched_samples = list(self._table.samples)
+        self._variants = None
+
+    def _parse_stream(self,
+                      stream: "_TextSlice",
+                      samples: List[str]) -> VariantTable:
+        """ Parse the variants of the given samples from the given stream of
+        VCF text, made of the header followed by a subset of the records,
+        using vcfpy. """
+        table = _VariantTableBuilder(samples or ["MITOVIZ001"])
+        skipped = Counter()
+        reader = vcfpy.Reader.from_stream(stream, parsed_samples=samples)
+        self._parse_records(reader, samples, table, skipped)
+        self.skipped_calls.update(skipped)
+        return table.build()
+
+    def _follow(self, samples: List[str]) -> VariantTable:
+        """ Parse the variants of the given samples from a growing VCF file.
+
+        If the state of the last run is available, and the file looks
+        unchanged up to the end of the records parsed so far (see
+        _FollowState), only the records appended since then are parsed, and
+        the touched samples are the ones carrying variants in such records.
+        Otherwise, the whole file is parsed, and the touched samples are the
+        ones whose variants changed since the last run. Records are read
+        from the file as they are parsed, using vcfpy, since pysam can not
+        start reading from an arbitrary offset.
+
+        Compressed VCF files and BCF files can not be read from an offset
+        without decompressing them from the start, so that they are always
+        parsed as a whole, using the selected engine, jobs and cache.
+
+        Args:
+            samples: names of the samples to parse
+
+        Returns:
+            VariantTable with all the variants of the given samples
+        """
+        state = _FollowState(self.state_dir, self.vcf_in,
+                             contig=self.contig, samples=samples,
+                             carriers_only=self.carriers_only,
+                             engine=self._requested_engine)
+        last_run = state.load()
+        if not self.is_plain_text:
+            table = self._read(samples)
+            self.touched_samples = self._changed_samples(last_run, table)
+            state.save(table, self.skipped_calls)
+            return table
+
+        with open(self.vcf_in, "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            header = b""
+            for line in iter(f.readline, b""):
+                header += line
+                if line.startswith(b"#CHROM"):  # last line of the header
+                    break
+            start = tail_start = len(header)
+            if last_run is not None:
+                position = last_run[2]
+                if (position.get("inode") == inode
+                        and position["header_hash"] == self._digest(header)
+                        and position["offset"] >= start):
+                    f.seek(position["tail_start"])
+                    tail = f.read(position["offset"]
+                                  - position["tail_start"])
+                    if self._digest(tail) == position["tail_hash"]:
+                        start = position["offset"]
+                        tail_start = position["tail_start"]
+            end = self._last_line_end(f, start)  # skip incomplete records
+            f.seek(start)
+            new_table = self._parse_stream(_TextSlice(header, f, end),
+                                           samples)
+            tail_start = max(tail_start, end - FOLLOW_TAIL)
+            f.seek(tail_start)
+            tail = f.read(end - tail_start)
+
+        if start > len(header):  # only new records were parsed
+            table, skipped, _ = last_run
+            self.skipped_calls.update(skipped)
+            table = VariantTable.concat([table, new_table])
+            self.touched_samples = [sample for sample, _ in
+                                    new_table.iter_samples(skip_empty=True)]
+        else:
+            table = new_table
+            self.touched_samples = self._changed_samples(last_run, table)
+        state.save(table, self.skipped_calls, offset=end, inode=inode,
+                   header_hash=self._digest(header),
+                   tail_start=tail_start, tail_hash=self._digest(tail))
+        return table
+
+    @staticmethod
+    def _last_line_end(f: BinaryIO, start: int) -> int:
+        """ Return the offset following the last newline of the given binary
+        file, searched backwards from its end down to the start offset (the
+        start offset itself if no newline is found). """
+        end = f.seek(0, os.SEEK_END)
+        while end > start:
+            block_start = max(start, end - FOLLOW_TAIL)
+            f.seek(block_start)
+            newline = f.read(end - block_start).rfind(b"\n")
+            if newline >= 0:
+                return block_start + newline + 1
+            end = block_start
+        return start
+
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+    @staticmethod
+    def _changed_samples(last_run: Optional[tuple],
+                         table: VariantTable) -> List[str]:
+        """ Return the samples of the table whose variants differ from the
+        ones parsed in the last run (all samples if no run is available).
+        """
+        if last_run is None:
+            return list(table.samples)
+        last_table = last_run[0]
+        return [sample for sample, sample_table in table.iter_samples()
+                if sample not in last_table.samples
+                or sample_table.variants() != last_table.variants(sample)]
+
+    def iter_tables(self,
+                    samples: Optional[List[str]] = None,
+                    batch_size: int = STREAM_BATCH_SIZE
+                    ) -> Iterator[Tuple[str, VariantTable]]:
+        """ Lazily read the variants from the input VCF file, yielding them
+        one sample at a time.
+
+        The input file is read once for each batch of samples, and only the
+        calls of the samples in the current batch are parsed; the table of
+        a batch is kept until all of its samples have been yielded, so that
+        peak memory usage scales with batch_size rather than with the total
+        number of samples.
+
+        Args:
+            samples: names of the samples to parse (defaults to
+                self.parsed_samples)
+            batch_size: number of samples parsed in each pass over the file
+                [default: 256]
+
+        Yields:
+            tuples with sample name and VariantTable with its variants
+        """
+        samples = samples or self.parsed_samples
+        if not samples:  # single sample without name
+            yield from self._read([]).iter_samples()
+            return
+        for start in range(0, len(samples), batch_size):
+            table = self._read(samples[start:start + batch_size])
+            yield from table.iter_samples()
+
+    def iter_variants(self,
+                      samples: Optional[List[str]] = None,
+                      batch_size: int = STREAM_BATCH_SIZE
+                      ) -> Iterator[Tuple[str, List[_Variant]]]:
+        """ Lazily read the variants from the input VCF file, yielding them
+        one sample at a time as lists of _Variant instances.
+
+        Args:
+            samples: names of the samples to parse (defaults to
+                self.parsed_samples)
+            batch_size: number of samples parsed in each pass over the file
+                [default: 256]
+
+        Yields:
+            tuples with sample name and list of its variants
+        """
+        for sample, table in self.iter_tables(samples, batch_size):
+            yield sample, table.variants()
 
     def __repr__(self):
-        return "{}(vcf_in={})".format(
-            self.__class__.__name__, self.vcf_in
+        return "{}(vcf_in={}, engine={})".format(
+            self.__class__.__name__, self.vcf_in, self.engine
         )
 
 
+def _parse_samples(vcf_in: str,
+                   samples: List[str],
+                   contig: Optional[str],
+                   engine: Optional[str],
+                   carriers_only: bool
+                   ) -> Tuple[VariantTable, Counter, str]:
+    """ Parse the variants of the given samples from the input VCF file, in
+    a worker process of _VcfParser.
+
+    Args:
+        vcf_in: path of the input VCF/BCF file
+        samples: names of the samples to parse
+        contig: name of the mitochondrial contig
+        engine: parsing engine to use (None to pick it automatically)
+        carriers_only: only create variants for carried alternate alleles
+
+    Returns:
+        tuple with the VariantTable of the samples, counter of skipped calls
+        and engine actually used
+    """
+    vcf = _VcfParser(vcf_in, stream=True, contig=contig, engine=engine,
+                     parsed_samples=samples, carriers_only=carriers_only)
+    table = vcf._parse(samples)
+    return table, vcf.skipped_calls, vcf.engine
+
+
+class _TextSlice:
+    """ Minimal text stream used by _VcfParser to follow a growing VCF
+    file, reading the given header followed by the lines of a binary file
+    from its current offset up to the given end offset, so that vcfpy parses
+    the appended records as they are read.
+
+    Attributes:
+        header: header of the VCF file
+        file: binary file positioned at the first record to read
+        end: offset where reading stops, at the end of a line
+    """
+
+    def __init__(self, header: bytes, file: BinaryIO, end: int):
+        self._header = io.BytesIO(header)
+        self._file = file
+        self._end = end
+
+    def readline(self) -> str:
+        line = self._header.readline()
+        if not line:
+            remaining = self._end - self._file.tell()
+            if remaining > 0:
+                line = self._file.readline(remaining)
+        return line.decode()
+
+
 class _DataFrameParser:
     """ Class to read and parse a given pandas DataFrame.
 
@@ -99,7 +819,8 @@ class _DataFrameParser:
         self.alt_col = alt_col
         self.sample_col = sample_col
         self.hf_col = hf_col
-        self._variants = defaultdict(list)
+        self._table = None
+        self._variants = None
         self.parse_variants()
 
     @property
@@ -112,26 +833,170 @@ class _DataFrameParser:
         """ Return whether the SAMPLE column is available in the DataFrame. """
         return self.sample_col in self.df_in.columns
 
+    @property
+    def table(self) -> VariantTable:
+        """ The VariantTable with the parsed variants. """
+        return self._table
+
     @property
     def variants(self) -> dict:
+        """ Per-sample lists of the parsed variants, as _Variant instances.
+        """
+        if self._variants is None:
+            self._variants = {
+                sample: table.variants()
+                for sample, table in self._table.iter_samples(skip_empty=True)
+            }
         return self._variants
 
     def parse_variants(self):
         """ Read the variants from the input DataFrame and parse them in the
         required format.
 
-        Variants are stored in a per-sample fashion, in the self.variants
-        dictionary.
+        Columns are converted as a whole, and rows are grouped by sample
+        once; the input DataFrame is never modified, and its columns are
+        only copied when a dtype conversion is needed. Variants are stored
+        in the self.table VariantTable, and are available in a per-sample
+        fashion in the self.variants dictionary.
         """
-        if self.has_hf:
-            self.df_in[self.hf_col] = self.df_in[self.hf_col].astype(float)
-        for record in self.df_in.itertuples():
-            rec = record._asdict()
-            sample = rec[self.sample_col] if self.has_sample else "MITOVIZ001"
-            hf = rec[self.hf_col] if self.has_hf else 0.5
-            variant = _Variant(rec[self.ref_col], rec[self.pos_col],
-                               rec[self.alt_col], hf)
-            self._variants[sample].append(variant)
+        self._table = VariantTable.from_columns(
+            self.df_in[self.pos_col], self.df_in[self.ref_col],
+            self.df_in[self.alt_col],
+            hf=self.df_in[self.hf_col] if self.has_hf else None,
+            sample=self.df_in[self.sample_col] if self.has_sample else None,
+            names=(self.pos_col, self.ref_col, self.alt_col)
+        )
+        self._variants = None
+
+    def __repr__(self):
+        return ("{}(pos_col={}, ref_col={}, alt_col={}, "
+                "sample_col={}, hf_col={})").format(
+            self.__class__.__name__, self.pos_col, self.ref_col,
+            self.alt_col, self.sample_col, self.hf_col
+        )
+
+
+class _InterchangeParser:
+    """ Class to read and parse a dataframe other than a pandas DataFrame,
+    such as a pyarrow Table or a polars DataFrame.
+
+    Any object implementing the Arrow PyCapsule interface
+    (__arrow_c_stream__ or __arrow_c_array__) or the DataFrame interchange
+    protocol (__dataframe__) is supported. Only the needed columns are
+    imported, without copying their buffers whenever possible, and are
+    converted to a VariantTable directly: numeric columns are used as
+    numpy views, and string columns are dictionary-encoded by pyarrow.
+
+    Attributes:
+        df_in: input dataframe
+        pos_col: column name for the variant position
+        ref_col: column name for the variant reference allele
+        alt_col: column name for the variant alternate allele
+        sample_col: column name for the variant sample
+        hf_col: column name for the variant heteroplasmic fraction
+    """
+
+    def __init__(self,
+                 df_in: Any,
+                 pos_col: str = "POS",
+                 ref_col: str = "REF",
+                 alt_col: str = "ALT",
+                 sample_col: str = "SAMPLE",
+                 hf_col: str = "HF"):
+        if pa is None:
+            raise ImportError("Dataframes other than pandas DataFrames "
+                              "require pyarrow to be installed")
+        self.df_in = df_in
+        self.pos_col = pos_col
+        self.ref_col = ref_col
+        self.alt_col = alt_col
+        self.sample_col = sample_col
+        self.hf_col = hf_col
+        self._table = None
+        self.parse_variants()
+
+    @staticmethod
+    def is_supported(df_in: Any) -> bool:
+        """ Check whether the given object implements one of the supported
+        dataframe interfaces. """
+        return any(hasattr(df_in, attr) for attr in ("__arrow_c_stream__",
+                                                     "__arrow_c_array__",
+                                                     "__dataframe__"))
+
+    @property
+    def table(self) -> VariantTable:
+        """ The VariantTable with the parsed variants. """
+        return self._table
+
+    def read(self) -> "pa.Table":
+        """ Import the needed columns of the input dataframe as a pyarrow
+        Table, without copying them whenever possible.
+
+        Returns:
+            pyarrow Table with the needed columns
+        """
+        columns = [self.pos_col, self.ref_col, self.alt_col,
+                   self.sample_col, self.hf_col]
+        if isinstance(self.df_in, pa.Table):
+            table = self.df_in
+        elif hasattr(self.df_in, "__arrow_c_stream__"):
+            table = pa.table(self.df_in)
+        elif hasattr(self.df_in, "__arrow_c_array__"):
+            table = pa.Table.from_batches([pa.record_batch(self.df_in)])
+        elif hasattr(self.df_in, "__dataframe__"):
+            df_in = self.df_in.__dataframe__()
+            names = list(df_in.column_names())
+            df_in = df_in.select_columns_by_name(
+                [col for col in columns if col in names]
+            )
+            return pa.interchange.from_dataframe(df_in)
+        else:
+            raise TypeError("Unsupported dataframe type: {}".format(
+                type(self.df_in).__name__
+            ))
+        return table.select([col for col in columns
+                             if col in table.column_names])
+
+    @staticmethod
+    def _values(column: "pa.ChunkedArray"
+                ) -> Union[np.ndarray, _EncodedColumn]:
+        """ Return the values of the given column as a numpy array, or as
+        an _EncodedColumn for string columns. """
+        numeric = (pa.types.is_integer(column.type)
+                   or pa.types.is_floating(column.type))
+        if numeric or column.null_count:
+            if column.num_chunks == 1:
+                return column.chunk(0).to_numpy(zero_copy_only=False)
+            return column.to_numpy()
+        if not pa.types.is_dictionary(column.type):
+            column = pc.dictionary_encode(column)
+        column = column.unify_dictionaries()
+        if not column.num_chunks:
+            return _EncodedColumn(np.empty(0, dtype=np.int32), [])
+        codes = [chunk.indices.to_numpy(zero_copy_only=False)
+                 for chunk in column.chunks]
+        return _EncodedColumn(codes[0] if len(codes) == 1
+                              else np.concatenate(codes),
+                              column.chunk(0).dictionary.to_pylist())
+
+    def parse_variants(self):
+        """ Read the variants from the input dataframe and parse them in the
+        required format.
+
+        Variants are stored in the self.table VariantTable.
+        """
+        table = self.read()
+        names = table.column_names
+        self._table = VariantTable.from_columns(
+            self._values(table.column(self.pos_col)),
+            self._values(table.column(self.ref_col)),
+            self._values(table.column(self.alt_col)),
+            hf=(self._values(table.column(self.hf_col))
+                if self.hf_col in names else None),
+            sample=(self._values(table.column(self.sample_col))
+                    if self.sample_col in names else None),
+            names=(self.pos_col, self.ref_col, self.alt_col)
+        )
 
     def __repr__(self):
         return ("{}(pos_col={}, ref_col={}, alt_col={}, "
@@ -144,29 +1009,359 @@ class _DataFrameParser:
 class _TabularParser:
     """ Class to read and parse a given tabular generic file.
 
+    The fast C engine of pandas is used by default, falling back to the
+    Python engine only for options that require it (e.g. regex
+    separators); the pyarrow engine can be requested explicitly. The
+    DataFrame is read on first access to df, and kept until the input
+    file changes or release() is called. Files compressed with gzip (or
+    BGZF), zstd, bzip2 or xz are detected from their magic bytes and
+    decompressed while they are read.
+
     Attributes:
         table_in: path of the input tabular file
-        sep: column delimiter used
+        sep: column delimiter used (defaults to the one sniffed from the
+            beginning of the file)
+        engine: pandas parsing engine, either "c", "pyarrow" or "python"
+            (defaults to "c", or "python" if required by sep or kwargs)
+        columns: names of the only columns to read, with their dtypes
+            (defaults to reading all the columns with inferred dtypes);
+            columns missing from the file are ignored
+        threads: number of threads used to decompress BGZF files; 0 uses
+            all the available CPUs [default: 1]
         **kwargs: additional arguments passed to pandas.read_table()
     """
+    _sniff_size = 1 << 16
 
     def __init__(self,
                  table_in: str,
-                 sep: str = ",",
+                 sep: Optional[str] = None,
+                 engine: Optional[str] = None,
+                 columns: Optional[Dict[str, str]] = None,
+                 threads: int = 1,
                  **kwargs):
         self.table_in = table_in
-        self.sep = sep
+        self.columns = columns
+        self.threads = threads
         self.kwargs = kwargs
+        self.chunk_samples = []
+        self._df = None
+        self._df_key = None
+        self.sep = sep if sep is not None else self.sniff_sep()
+        self.engine = self._find_engine(engine)
+
+    def sniff_sep(self) -> str:
+        """ Guess the column delimiter from the beginning of the input file
+        (decompressed as pandas would), skipping commented lines; defaults to
+        a comma. """
+        stream = open_compressed(
+            self.table_in, threads=self.threads,
+            compression=self.kwargs.get("compression", "infer")
+        )
+        with io.TextIOWrapper(stream, newline="",
+                              encoding=self.kwargs.get("encoding")) as f:
+            sample = f.read(self._sniff_size)
+        if len(sample) == self._sniff_size:  # drop the truncated last line
+            sample = sample[:sample.rfind("\n") + 1] or sample
+        comment = self.kwargs.get("comment")
+        if comment:
+            sample = "".join(line for line in sample.splitlines(True)
+                             if not line.startswith(comment))
+        try:
+            return csv.Sniffer().sniff(sample, TABULAR_SEPS).delimiter
+        except csv.Error:
+            return ","
+
+    def _find_engine(self, engine: Optional[str] = None) -> str:
+        """ Return the pandas engine used to read the input file.
+
+        Args:
+            engine: engine requested by the user, if any
+
+        Returns:
+            name of the engine
+        """
+        if engine is not None:
+            if engine not in TABULAR_ENGINES:
+                raise ValueError("Engine must be one of {}".format(
+                    ", ".join(TABULAR_ENGINES)
+                ))
+            return engine
+        regex_sep = len(self.sep) > 1 and self.sep != r"\s+"
+        if regex_sep or any(opt in self.kwargs for opt in TABULAR_PYTHON_OPTS):
+            return "python"
+        return "c"
+
+    @staticmethod
+    def variant_columns(pos_col: str = "POS",
+                        ref_col: str = "REF",
+                        alt_col: str = "ALT",
+                        sample_col: str = "SAMPLE",
+                        hf_col: str = "HF") -> Dict[str, str]:
+        """ Return the names of the columns used to create variants, with
+        compact dtypes.
+
+        HFs are kept as float64, since float32 values would not round-trip
+        to the decimal values shown in labels.
+        """
+        return {pos_col: "int32", ref_col: "category", alt_col: "category",
+                sample_col: "category", hf_col: "float64"}
+
+    def open(self) -> BinaryIO:
+        """ Open the input file as a binary stream of its decompressed
+        content, unless a compression is explicitly set in kwargs (in which
+        case pandas decompresses the file). """
+        if "compression" in self.kwargs:
+            return open(self.table_in, "rb")
+        return open_compressed(self.table_in, threads=self.threads)
+
+    @property
+    def read_opts(self) -> dict:
+        """ Options passed to pandas.read_table(), including the projection
+        and dtypes of the requested columns (unless set in kwargs). """
+        opts = dict(sep=self.sep, engine=self.engine, compression=None)
+        opts.update(self.kwargs)
+        if self.columns is None or "usecols" in self.kwargs:
+            return opts
+        # the pyarrow engine can not read the header only
+        probe_opts = dict(opts, engine="python" if self.engine == "python"
+                          else "c")
+        with self.open() as f:
+            header = pd.read_table(f, nrows=0, **probe_opts).columns
+        usecols = [col for col in header if col in self.columns]
+        opts["usecols"] = usecols
+        opts["dtype"] = {**{col: self.columns[col] for col in usecols},
+                         **self.kwargs.get("dtype", dict())}
+        return opts
+
+    def _file_key(self) -> tuple:
+        stat = os.stat(self.table_in)
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns, self.sep,
+                self.engine)
 
     @property
     def df(self) -> pd.DataFrame:
-        try:
-            df_in = pd.read_table(self.table_in, sep=self.sep, engine="python",
-                                  **self.kwargs)
-        except TypeError as e:
-            raise TypeError(e)
-        return df_in
+        """ DataFrame read from the input file, read again only if the file
+        (or sep and engine) changed since the last access. """
+        key = self._file_key()
+        if self._df is None or key != self._df_key:
+            self.release()
+            opts = self.read_opts
+            try:
+                with self.open() as f:
+                    self._df = pd.read_table(f, **opts)
+            except TypeError as e:
+                raise TypeError(e)
+            self._df_key = key
+        return self._df
+
+    def release(self):
+        """ Drop the DataFrame read from the input file, if any, so that its
+        memory can be reclaimed. """
+        self._df = None
+        self._df_key = None
+
+    def iter_tables(self,
+                    chunksize: int,
+                    samples: Optional[Sequence[str]] = None,
+                    sorted_samples: bool = False,
+                    tmp_dir: Optional[str] = None,
+                    positions: Optional[Tuple[int, int]] = None,
+                    **columns) -> Iterator[Tuple[str, VariantTable]]:
+        """ Read the input file in chunks of rows and iterate over the
+        variants of each sample, so that only one chunk and one sample are
+        held in memory at a time.
+
+        If the rows of each sample are contiguous, each sample is yielded as
+        soon as the rows of the next one start; otherwise the rows of each
+        sample are spilled to temporary files, and samples are yielded once
+        the whole file has been read. Samples keep the order in which they
+        first appear in the file, and are added to chunk_samples as soon as
+        they are found. The pyarrow engine can not read files in chunks, so
+        that a ValueError is raised as soon as it is called with it.
+
+        Args:
+            chunksize: number of rows read at a time
+            samples: names of the samples to yield (defaults to all)
+            sorted_samples: if true, expect the rows of each sample to be
+                contiguous, and raise a ValueError otherwise [default: False]
+            tmp_dir: directory where temporary files are created (defaults
+                to the system temporary directory)
+            positions: inclusive range of the positions to yield (defaults
+                to all)
+            **columns: column names passed to _DataFrameParser
+
+        Returns:
+            iterator of tuples with sample name and table with its variants
+        """
+        if self.engine == "pyarrow":
+            raise ValueError("The pyarrow engine does not support reading "
+                             "{} in chunks".format(self.table_in))
+        self.chunk_samples = []
+        tables = self._iter_chunks(chunksize, samples, positions, **columns)
+        if sorted_samples:
+            return self._group_sorted(tables)
+        return self._group_spilled(tables, tmp_dir)
+
+    def _iter_chunks(self,
+                     chunksize: int,
+                     samples: Optional[Sequence[str]] = None,
+                     positions: Optional[Tuple[int, int]] = None,
+                     **columns) -> Iterator[VariantTable]:
+        sample_col = columns.get("sample_col", "SAMPLE")
+        pos_col = columns.get("pos_col", "POS")
+        opts = self.read_opts
+        with self.open() as f, pd.read_table(f, chunksize=chunksize,
+                                             **opts) as reader:
+            for chunk in reader:
+                if samples is not None and sample_col in chunk.columns:
+                    chunk = chunk[chunk[sample_col].isin(samples)]
+                if positions is not None:
+                    chunk = chunk[chunk[pos_col].between(*positions)]
+                yield _DataFrameParser(chunk, **columns).table
+
+    def _group_sorted(self, tables: Iterator[VariantTable]
+                      ) -> Iterator[Tuple[str, VariantTable]]:
+        current, parts = None, []
+        for table in tables:
+            for sample, part in table.iter_samples(skip_empty=True):
+                if sample == current:
+                    parts.append(part)
+                    continue
+                if sample in self.chunk_samples:
+                    raise ValueError(
+                        "Rows of sample {} are not contiguous in {}".format(
+                            sample, self.table_in
+                        ))
+                self.chunk_samples.append(sample)
+                if current is not None:
+                    yield current, VariantTable.concat(parts)
+                current, parts = sample, [part]
+        if current is not None:
+            yield current, VariantTable.concat(parts)
+
+    def _group_spilled(self,
+                       tables: Iterator[VariantTable],
+                       tmp_dir: Optional[str] = None
+                       ) -> Iterator[Tuple[str, VariantTable]]:
+        with tempfile.TemporaryDirectory(prefix="mitoviz_",
+                                         dir=tmp_dir) as spill_dir:
+            partitions = dict()  # paths of the spilled parts of each sample
+            n_parts = 0
+            for table in tables:
+                for sample, part in table.iter_samples(skip_empty=True):
+                    if sample not in partitions:
+                        self.chunk_samples.append(sample)
+                        partitions[sample] = []
+                    n_parts += 1
+                    path = os.path.join(spill_dir, "{}.npz".format(n_parts))
+                    dump_table(path, part)
+                    partitions[sample].append(path)
+            for sample, paths in partitions.items():
+                parts = [load_table(path)[0] for path in paths]
+                for path in paths:
+                    os.remove(path)
+                yield sample, VariantTable.concat(parts)
+
+    def __repr__(self):
+        return "{}(table_in={}, sep={!r}, engine={})".format(
+            self.__class__.__name__, self.table_in, self.sep, self.engine
+        )
+
+
+class _ArrowParser:
+    """ Class to read and parse a given Parquet, Feather or Arrow IPC file.
+
+    Only the requested columns are read, and rows are filtered by sample
+    and position while reading: Parquet row groups whose statistics do not
+    match the filters are skipped altogether. Feather and Arrow IPC files
+    are memory-mapped, so that only the selected columns are loaded.
+
+    Attributes:
+        table_in: path of the input file
+        columns: names of the only columns to read (defaults to all the
+            columns); columns missing from the file are ignored
+        samples: names of the samples whose rows are read (defaults to all)
+        positions: inclusive range of the positions read (defaults to all)
+        pos_col: column name for the variant position
+        sample_col: column name for the variant sample
+    """
+
+    def __init__(self,
+                 table_in: str,
+                 columns: Optional[Sequence[str]] = None,
+                 samples: Optional[Sequence[str]] = None,
+                 positions: Optional[Tuple[int, int]] = None,
+                 pos_col: str = "POS",
+                 sample_col: str = "SAMPLE"):
+        if pa is None:
+            raise ImportError("Parquet, Feather and Arrow IPC files require "
+                              "pyarrow to be installed")
+        self.table_in = table_in
+        self.columns = columns
+        self.samples = samples
+        self.positions = positions
+        self.pos_col = pos_col
+        self.sample_col = sample_col
+
+    @staticmethod
+    def is_arrow(path: str) -> bool:
+        """ Check whether the given path is a Parquet, Feather or Arrow IPC
+        file, from its extension. """
+        return path.casefold().endswith(PARQUET_EXTS + ARROW_EXTS)
+
+    @property
+    def is_parquet(self) -> bool:
+        return self.table_in.casefold().endswith(PARQUET_EXTS)
+
+    @property
+    def schema(self) -> "pa.Schema":
+        """ Schema of the input file, read without loading any row. """
+        if self.is_parquet:
+            return pq.read_schema(self.table_in, memory_map=True)
+        with pa.memory_map(self.table_in) as source:
+            return pa.ipc.open_file(source).schema
+
+    @property
+    def filter(self) -> Optional["pc.Expression"]:
+        """ Expression selecting the requested samples and positions. """
+        names = self.schema.names
+        expression = None
+        if self.samples is not None and self.sample_col in names:
+            expression = pc.field(self.sample_col).isin(list(self.samples))
+        if self.positions is not None and self.pos_col in names:
+            start, stop = self.positions
+            in_range = ((pc.field(self.pos_col) >= start)
+                        & (pc.field(self.pos_col) <= stop))
+            expression = (in_range if expression is None
+                          else expression & in_range)
+        return expression
+
+    def read(self) -> "pa.Table":
+        """ Read the requested columns and rows of the input file.
+
+        Returns:
+            pyarrow Table with the selected data
+        """
+        columns = self.columns
+        if columns is not None:
+            names = self.schema.names
+            columns = [col for col in columns if col in names]
+        if self.is_parquet:
+            return pq.read_table(self.table_in, columns=columns,
+                                 filters=self.filter, memory_map=True)
+        table = feather.read_table(self.table_in, columns=columns,
+                                   memory_map=True)
+        expression = self.filter
+        return table if expression is None else table.filter(expression)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """ DataFrame with the selected data, where string columns are
+        categorical. """
+        return self.read().to_pandas(strings_to_categorical=True)
 
     def __repr__(self):
-        return "{}(table_in={}, sep={!r})".format(self.__class__.__name__,
-                                                  self.table_in, self.sep)
+        return "{}(table_in={}, columns={}, samples={}, positions={})".format(
+            self.__class__.__name__, self.table_in, self.columns,
+            self.samples, self.positions
+        )
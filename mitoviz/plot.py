@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
-from typing import List, Optional
+from typing import List, Optional, Union
 
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
@@ -10,6 +10,7 @@ import plotly.graph_objects as go
 
 from mitoviz.constants import COLORS, LABELS, NAMES
 from mitoviz.locus import _LinearLocus, _PolarLocus, _PolarSplitLocus
+from mitoviz.table import VariantTable
 from mitoviz.variant import _Variant
 
 
@@ -319,8 +320,23 @@ class PlotVariants:
         self.base_plot = PlotBase()
         self.sample = sample
 
+    @staticmethod
+    def as_table(variants: Union[List[_Variant], VariantTable]
+                 ) -> VariantTable:
+        """ Return the given variants as a VariantTable.
+
+        Args:
+            variants: VariantTable or list of _Variant instances
+
+        Returns:
+            VariantTable with the given variants
+        """
+        if isinstance(variants, VariantTable):
+            return variants
+        return VariantTable.from_variants(variants)
+
     def polar(self,
-              variants: List[_Variant],
+              variants: Union[List[_Variant], VariantTable],
               labels: bool = False,
               labels_hf: bool = False,
               legend: bool = False,
@@ -328,27 +344,29 @@ class PlotVariants:
         """ Plot variants available in the given list onto a polar plot.
 
         Args:
-            variants: list of _PolarVariant instances to plot
+            variants: VariantTable or list of _Variant instances to plot
             labels: add a label for each variant shown [default: False]
             labels_hf: show HF value in each variant's label [default: False]
             legend: add a legend for loci colors in the plot [default: False]
             split: plot split H and L strands [default: False]
         """
         fig, ax = self.base_plot.polar(legend, split)
+        table = self.as_table(variants)
 
-        for variant in variants:
-            ax.scatter(variant.polar_x, variant.polar_y,
+        if len(table):
+            ax.scatter(table.polar_x, table.polar_y,
                        c="black", s=20, zorder=20)
-            if labels:
-                self.label_variant(ax, variant,
-                                   linear=False, show_hf=labels_hf)
+        if labels:
+            texts = table.labels_hf if labels_hf else table.labels
+            for variant, text in zip(table, texts):
+                self.label_variant(ax, variant, linear=False, label=text)
 
         ax.set_title(self.sample)
 
         return fig, ax
 
     def polar_plotly(self,
-                     variants: List[_Variant],
+                     variants: Union[List[_Variant], VariantTable],
                      labels: bool = False,
                      labels_hf: bool = False,
                      legend: bool = False,
@@ -356,7 +374,7 @@ class PlotVariants:
         """ Plot variants available in the given list onto a plotly polar plot.
 
         Args:
-            variants: list of _PolarVariant instances to plot
+            variants: VariantTable or list of _Variant instances to plot
             labels: add a label for each variant shown [default: False]
             labels_hf: show HF value in each variant's label [default: False]
             legend: add a legend for loci colors in the plot [default: False]
@@ -364,12 +382,13 @@ class PlotVariants:
         """
         fig = self.base_plot.polar_plotly(legend, split)
 
-        radii = [el.polar_y for el in variants]
-        theta = [el.polar_x_p for el in variants]
+        table = self.as_table(variants)
+        radii = table.polar_y.tolist()
+        theta = table.polar_x_p.tolist()
         if labels_hf:
-            meta = [el.label_hf_plotly for el in variants]
+            meta = table.labels_hf_plotly
         else:
-            meta = [el.label for el in variants]
+            meta = table.labels
 
         var_trace = go.Scatterpolar(r=radii, theta=theta, mode="markers",
                                     marker=dict(color="black"), meta=meta,
@@ -383,7 +402,7 @@ class PlotVariants:
         return fig
 
     def linear(self,
-               variants: List[_Variant],
+               variants: Union[List[_Variant], VariantTable],
                labels: bool = False,
                labels_hf: bool = False,
                legend: bool = False,
@@ -391,37 +410,40 @@ class PlotVariants:
         """ Plot variant available in a given list onto a linear plot.
 
         Args:
-            variants: list of _LinearVariant instances to plot
+            variants: VariantTable or list of _Variant instances to plot
             labels: add a label for each variant shown [default: False]
             labels_hf: show HF value in each variant's label [default: False]
             legend: add a legend for loci colors in the plot [default: False]
             split: plot split H and L strands [default: False]
         """
         fig, ax = self.base_plot.linear(legend, split)
+        table = self.as_table(variants)
 
-        for variant in variants:
+        for x, y, color, strand in zip(table.linear_x.tolist(),
+                                       table.linear_y.tolist(),
+                                       table.colors, table.strands):
             if split:
-                bottom = -0.05 if variant.strand == "L" else 0.0
+                bottom = -0.05 if strand == "L" else 0.0
             else:
                 bottom = 0.0
-            marker, stem, base = plt.stem([variant.linear_x],
-                                          [variant.linear_y],
+            marker, stem, base = plt.stem([x], [y],
                                           "-.", bottom=bottom,
                                           use_line_collection=True)
-            plt.setp(marker, "color", variant.color)
-            plt.setp(stem, "color", variant.color)
+            plt.setp(marker, "color", color)
+            plt.setp(stem, "color", color)
             plt.setp(base, "linestyle", "None")
 
-            if labels:
-                self.label_variant(ax, variant,
-                                   linear=True, show_hf=labels_hf)
+        if labels:
+            texts = table.labels_hf if labels_hf else table.labels
+            for variant, text in zip(table, texts):
+                self.label_variant(ax, variant, linear=True, label=text)
 
         ax.set_title(self.sample)
 
         return fig, ax
 
     def linear_plotly(self,
-                      variants: List[_Variant],
+                      variants: Union[List[_Variant], VariantTable],
                       labels: bool = False,
                       labels_hf: bool = False,
                       legend: bool = False,
@@ -429,7 +451,7 @@ class PlotVariants:
         """ Plot variant available in a given list onto a plotly linear plot.
 
         Args:
-            variants: list of _LinearVariant instances to plot
+            variants: VariantTable or list of _Variant instances to plot
             labels: add a label for each variant shown [default: False]
             labels_hf: show HF value in each variant's label [default: False]
             legend: add a legend for loci colors in the plot [default: False]
@@ -437,12 +459,13 @@ class PlotVariants:
         """
         fig = self.base_plot.linear_plotly(legend, split)
 
-        xs = [variant.linear_x for variant in variants]
-        ys = [variant.linear_y for variant in variants]
+        table = self.as_table(variants)
+        xs = table.linear_x.tolist()
+        ys = table.linear_y.tolist()
         if labels_hf:
-            meta = [el.label_hf_plotly for el in variants]
+            meta = table.labels_hf_plotly
         else:
-            meta = [el.label for el in variants]
+            meta = table.labels
 
         var_trace = go.Scatter(x=xs, y=ys, mode="markers",
                                marker=dict(color="black"), meta=meta,
@@ -451,13 +474,13 @@ class PlotVariants:
         lines = [dict(type="line",
                       xref="x",
                       yref="y",
-                      x0=variant.linear_x,
+                      x0=x,
                       y0=-0.1,
-                      x1=variant.linear_x,
-                      y1=(variant.linear_y - 0.006),
+                      x1=x,
+                      y1=(y - 0.006),
                       layer="below",
                       line=dict(color="grey", width=1))
-                 for variant in variants]
+                 for x, y in zip(xs, ys)]
 
         fig.add_trace(var_trace)
         base_shapes = list(fig.layout.shapes)
@@ -470,7 +493,8 @@ class PlotVariants:
     def label_variant(ax: plt.axes,
                       variant: _Variant,
                       linear: bool = False,
-                      show_hf: bool = False):
+                      show_hf: bool = False,
+                      label: Optional[str] = None):
         """ Annotate each variant with a label in the polar or linear plot.
 
         Args:
@@ -479,11 +503,11 @@ class PlotVariants:
             linear: whether the resulting is a linear or polar plot
                 [default: False]
             show_hf: show HF value in each variant's label [default: False]
+            label: label to use, e.g. created in batch by VariantTable
+                (defaults to the label of the variant)
         """
-        if show_hf:
-            label = variant.label_hf
-        else:
-            label = variant.label
+        if label is None:
+            label = variant.label_hf if show_hf else variant.label
         if linear:
             ax.annotate(label,
                         xy=(variant.linear_x, variant.linear_y + 0.02),
@@ -0,0 +1,710 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import sys
+from array import array
+from typing import (
+    Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+)
+
+import numpy as np
+import pandas as pd
+
+from mitoviz.annotation import INDEX
+from mitoviz.utils import convert_hf, convert_nt, convert_plotly
+from mitoviz.variant import (
+    VariantType, _Variant, normalize_allele, variant_label
+)
+
+
+class VariantTable:
+    """ Columnar storage of the variants of one or more samples.
+
+    Variants are interned: each distinct (position, reference, alternate)
+    triple is stored only once in a _VariantPool, shared by all the samples
+    carrying it, so that each row of the table only holds the code of its
+    variant in the pool, its heteroplasmic fraction and its sample. Rows
+    are sorted by sample, so that the variants of each sample are a
+    contiguous slice of the table. Positions are read from the pool, unless
+    the table was created from a column of positions that could be used as
+    a view, which is kept instead.
+
+    Attributes:
+        variant: codes of the variants in the pool (int32)
+        hf: heteroplasmic fractions of the variants (float64)
+        sample: indices of the samples of the variants in samples (int32)
+        pool: pool of the distinct variants of the table
+        samples: names of the samples
+        position: positions of the variants, if available as a view on
+            the input column (int32)
+    """
+
+    def __init__(self,
+                 variant: np.ndarray,
+                 hf: np.ndarray,
+                 sample: np.ndarray,
+                 pool: "_VariantPool",
+                 samples: List[str],
+                 position: Optional[np.ndarray] = None):
+        self.variant = variant
+        self.hf = hf
+        self.sample = sample
+        self.pool = pool
+        self.samples = samples
+        self._position = position
+        self._bounds = None
+
+    @classmethod
+    def empty(cls, samples: Optional[List[str]] = None) -> "VariantTable":
+        """ Create a table without variants. """
+        return _VariantTableBuilder(samples).build()
+
+    @classmethod
+    def from_variants(cls,
+                      variants: Iterable[_Variant],
+                      sample: str = "MITOVIZ001") -> "VariantTable":
+        """ Create a table from a list of _Variant instances of a single
+        sample. """
+        builder = _VariantTableBuilder([sample])
+        for variant in variants:
+            builder.append(0, variant.reference, variant.position,
+                           variant.alternate, variant.hf, variant.vtype)
+        return builder.build()
+
+    @classmethod
+    def from_columns(cls,
+                     position: Sequence[int],
+                     reference: Sequence[str],
+                     alternate: Sequence[str],
+                     hf: Optional[Sequence[float]] = None,
+                     sample: Optional[Sequence[str]] = None,
+                     names: Sequence[str] = ("position", "reference",
+                                             "alternate")
+                     ) -> "VariantTable":
+        """ Create a table from whole columns of variant values, using
+        vectorized operations only.
+
+        Samples and alleles are encoded in a single pass each (unless they
+        are given as _EncodedColumn instances), variants are interned with
+        _intern(), and variant types are inferred from the length of the
+        alleles of the distinct variants (as for plain string alleles in
+        normalize_allele()); samples keep the order in which they first
+        appear. The given columns are never modified: positions and HFs are
+        used as read-only views if they already have the required dtype and
+        are grouped by sample; otherwise HFs are copied, and positions are
+        read from the pool. Missing positions and alleles raise a ValueError
+        naming their column and the first row affected.
+
+        Args:
+            position: positions of the variants
+            reference: reference alleles of the variants
+            alternate: alternate alleles of the variants
+            hf: heteroplasmic fractions of the variants (defaults to 0.5)
+            sample: samples of the variants (defaults to MITOVIZ001)
+            names: names of the position, reference and alternate columns,
+                used in error messages
+
+        Returns:
+            table with the given variants
+        """
+        position = np.asarray(position)
+        if position.dtype.kind not in "iu":
+            _check_missing(pd.isna(position), names[0])
+        view = (_read_only(position, np.int32)
+                if position.dtype == np.int32 else None)
+        n_rows = len(position)
+        if hf is None:
+            hf = np.full(n_rows, 0.5)
+        hf = _read_only(hf, np.float64)
+        if sample is None:
+            sample_codes = np.zeros(n_rows, dtype=np.int32)
+            samples = ["MITOVIZ001"]
+        else:
+            sample_codes, samples = _factorize(sample)
+        ref, ref_alleles = _factorize(reference, names[1])
+        alt, alt_alleles = _factorize(alternate, names[2])
+        # reference alleles come first, so that their codes are unchanged
+        builder = _VariantTableBuilder(samples)
+        for allele in ref_alleles:
+            builder.add_allele(sys.intern(str(allele)))
+        alt_pool = np.array([builder.add_allele(sys.intern(str(allele)))
+                             for allele in alt_alleles], dtype=np.int32)
+        alt = alt_pool[alt]
+        variant, pool_position, ref, alt = _intern(position, ref, alt,
+                                                   len(builder.alleles))
+        pool = _VariantPool(
+            pool_position,
+            _length_types(builder.alleles, ref, alt, len(ref_alleles)),
+            ref, alt, builder.alleles
+        )
+        if n_rows and np.any(sample_codes[1:] < sample_codes[:-1]):
+            # stable radix sort on 16-bit codes is much faster than timsort
+            keys = (sample_codes.astype(np.int16)
+                    if len(samples) <= np.iinfo(np.int16).max
+                    else sample_codes)
+            order = np.argsort(keys, kind="stable")
+            variant, hf = variant[order], hf[order]
+            # sorted codes are runs of each sample, cheaper than a gather
+            sample_codes = np.repeat(
+                np.arange(len(samples), dtype=np.int32),
+                np.bincount(sample_codes, minlength=len(samples))
+            )
+            view = None
+        return cls(variant, hf, sample_codes, pool, builder.samples, view)
+
+    @classmethod
+    def concat(cls, tables: Iterable["VariantTable"]) -> "VariantTable":
+        """ Concatenate tables into a single table.
+
+        Samples keep the order in which they first appear in the given
+        tables; the variants of samples shared by more than one table keep
+        the order of the tables. The variant pools of the tables (and their
+        allele pools) are merged into a single pool, where variants shared
+        by more than one table are stored only once; tables whose pool is
+        larger than their rows are compacted first.
+
+        Args:
+            tables: tables to concatenate
+
+        Returns:
+            table with the variants of all the given tables
+        """
+        builder = _VariantTableBuilder()
+        offsets = dict()  # tables often share the same pool, e.g. selections
+        pools, columns = [], []
+        n_pooled = 0
+        for table in tables:
+            if len(table.pool) > len(table):  # e.g. a selection
+                table = table.compact()
+            indices = np.array([builder.add_sample(name)
+                                for name in table.samples], dtype=np.int32)
+            pool = table.pool
+            if id(pool) not in offsets:
+                offsets[id(pool)] = n_pooled
+                codes = np.array([builder.add_allele(allele)
+                                  for allele in pool.alleles],
+                                 dtype=np.int32)
+                pools.append((pool.position, pool.vtype, codes[pool.ref],
+                              codes[pool.alt]))
+                n_pooled += len(pool)
+            columns.append((table.variant + offsets[id(pool)], table.hf,
+                            indices[table.sample]))
+        if not columns:
+            return builder.build()
+        position, vtype, ref, alt = (np.concatenate(column)
+                                     for column in zip(*pools))
+        codes, position, ref, alt = _intern(position, ref, alt,
+                                            len(builder.alleles))
+        vtypes = np.empty(len(position), dtype=np.int8)
+        vtypes[codes] = vtype  # the type of any occurrence will do
+        pool = _VariantPool(position, vtypes, ref, alt, builder.alleles)
+        variant, hf, sample = (np.concatenate(column)
+                               for column in zip(*columns))
+        order = np.argsort(sample, kind="stable")
+        return cls(codes[variant[order]], hf[order], sample[order], pool,
+                   builder.samples)
+
+    @property
+    def position(self) -> np.ndarray:
+        """ Positions of the variants (int32). """
+        if self._position is not None:
+            return self._position
+        return self.pool.position[self.variant]
+
+    @property
+    def vtype(self) -> np.ndarray:
+        """ Codes of the variant types, as VariantType values (int8). """
+        return self.pool.vtype[self.variant]
+
+    @property
+    def ref(self) -> np.ndarray:
+        """ Codes of the reference alleles in alleles (int32). """
+        return self.pool.ref[self.variant]
+
+    @property
+    def alt(self) -> np.ndarray:
+        """ Codes of the alternate alleles in alleles (int32). """
+        return self.pool.alt[self.variant]
+
+    @property
+    def alleles(self) -> List[str]:
+        """ Pool of distinct allele strings. """
+        return self.pool.alleles
+
+    @property
+    def bounds(self) -> Dict[str, Tuple[int, int]]:
+        """ Start and stop row of the slice of each sample. """
+        if self._bounds is None:
+            starts = np.searchsorted(self.sample,
+                                     np.arange(len(self.samples) + 1))
+            self._bounds = {name: (int(starts[i]), int(starts[i + 1]))
+                            for i, name in enumerate(self.samples)}
+        return self._bounds
+
+    def select(self, sample: str) -> "VariantTable":
+        """ Return a table with the variants of the given sample only.
+
+        Columns of the returned table are views on the ones of this table,
+        and the variant pool is shared, so that no data is copied.
+
+        Args:
+            sample: name of the sample
+
+        Returns:
+            table with the variants of the sample (empty if the sample is not
+            available)
+        """
+        if sample not in self.bounds:
+            return VariantTable.empty([sample])
+        start, stop = self.bounds[sample]
+        position = (self._position[start:stop]
+                    if self._position is not None else None)
+        return VariantTable(self.variant[start:stop], self.hf[start:stop],
+                            np.zeros(stop - start, dtype=np.int32),
+                            self.pool, [sample], position)
+
+    def compact(self) -> "VariantTable":
+        """ Return a table with the same rows, whose pool only holds the
+        variants (and alleles) used by them.
+
+        Tables returned by select() share the pool of the whole table, so
+        that they should be compacted before being stored or merged, which
+        only costs time proportional to their own rows.
+
+        Returns:
+            table with a compacted pool
+        """
+        keep, variant = np.unique(self.variant, return_inverse=True)
+        pool = self.pool
+        ref, alt = pool.ref[keep], pool.alt[keep]
+        used, alleles = np.unique(np.concatenate([ref, alt]),
+                                  return_inverse=True)
+        alleles = alleles.astype(np.int32).ravel()
+        pool = _VariantPool(pool.position[keep], pool.vtype[keep],
+                            alleles[:len(keep)], alleles[len(keep):],
+                            [pool.alleles[i] for i in used.tolist()])
+        return VariantTable(variant.astype(np.int32).ravel(), self.hf,
+                            self.sample, pool, self.samples, self._position)
+
+    def iter_samples(self,
+                     skip_empty: bool = False
+                     ) -> Iterator[Tuple[str, "VariantTable"]]:
+        """ Iterate over the samples of the table.
+
+        Args:
+            skip_empty: skip samples without variants [default: False]
+
+        Yields:
+            tuples with sample name and table with its variants
+        """
+        for sample in self.samples:
+            table = self.select(sample)
+            if skip_empty and not len(table):
+                continue
+            yield sample, table
+
+    def variants(self, sample: Optional[str] = None) -> List[_Variant]:
+        """ Return the variants of the table as _Variant instances.
+
+        Args:
+            sample: name of the sample whose variants are returned (defaults
+                to all the variants of the table)
+
+        Returns:
+            list of _Variant instances
+        """
+        table = self.select(sample) if sample is not None else self
+        return list(table)
+
+    @property
+    def linear_x(self) -> np.ndarray:
+        """ The x positions of the variants on the linear mt genome plot. """
+        return self.position
+
+    @property
+    def linear_y(self) -> np.ndarray:
+        """ The y positions of the variants on the linear mt genome plot. """
+        return self.hf
+
+    @property
+    def polar_x(self) -> np.ndarray:
+        """ The x positions of the variants on the polar mt genome plot. """
+        return convert_nt(self.position)
+
+    @property
+    def polar_x_p(self) -> np.ndarray:
+        """ The x positions of the variants on the polar plotly mt genome
+        plot. """
+        return convert_plotly(self.polar_x)
+
+    @property
+    def polar_y(self) -> np.ndarray:
+        """ The y positions of the variants on the polar mt genome plot. """
+        return 20 + convert_hf(self.hf)
+
+    @property
+    def colors(self) -> List[str]:
+        """ The colors of the loci on which the variants are located. """
+        return INDEX.color(self.position)
+
+    @property
+    def strands(self) -> List[str]:
+        """ The strands of the loci on which the variants are located. """
+        return INDEX.strand(self.position)
+
+    def _labels(self, hf_sep: Optional[str] = None) -> List[str]:
+        """ Create the labels of the variants from the labels of the pool,
+        so that each distinct variant is only formatted once; HF values are
+        added after hf_sep, if given. """
+        labels = self.pool.labels
+        labels = [labels[code] for code in self.variant.tolist()]
+        if hf_sep is None:
+            return labels
+        return ["{}{}HF: {}".format(label, hf_sep, value)
+                for label, value in zip(labels, self.hf.tolist())]
+
+    @property
+    def labels(self) -> List[str]:
+        """ The labels of the variants. """
+        return self._labels()
+
+    @property
+    def labels_hf(self) -> List[str]:
+        """ The labels of the variants with additional HF value. """
+        return self._labels("\n")
+
+    @property
+    def labels_hf_plotly(self) -> List[str]:
+        """ The labels of the variants with additional HF value (used in
+        interactive plots). """
+        return self._labels("<br>")
+
+    def __getitem__(self, i: int) -> _Variant:
+        reference, position, alternate, vtype = \
+            self.pool.records[self.variant[i]]
+        return _Variant(reference, position, alternate, float(self.hf[i]),
+                        vtype)
+
+    def __iter__(self) -> Iterator[_Variant]:
+        records = self.pool.records
+        for code, hf in zip(self.variant.tolist(), self.hf.tolist()):
+            reference, position, alternate, vtype = records[code]
+            yield _Variant(reference, position, alternate, hf, vtype)
+
+    def __len__(self) -> int:
+        return len(self.variant)
+
+    def __repr__(self):
+        return "{}(variants={}, samples={})".format(
+            self.__class__.__name__, len(self), len(self.samples)
+        )
+
+
+class _VariantPool:
+    """ Pool of the distinct variants of one or more tables.
+
+    Each distinct (position, reference, alternate) triple is stored only
+    once, as a row of read-only arrays, and its Python record (a tuple of
+    alleles, position and type) and label are created only once as well,
+    and shared by all the _Variant instances of the variant.
+
+    Attributes:
+        position: positions of the variants (int32)
+        vtype: codes of the variant types, as VariantType values (int8)
+        ref: codes of the reference alleles in alleles (int32)
+        alt: codes of the alternate alleles in alleles (int32)
+        alleles: pool of distinct allele strings
+    """
+    __slots__ = ("position", "vtype", "ref", "alt", "alleles", "_records",
+                 "_labels")
+
+    def __init__(self,
+                 position: np.ndarray,
+                 vtype: np.ndarray,
+                 ref: np.ndarray,
+                 alt: np.ndarray,
+                 alleles: List[str]):
+        self.position = _read_only(position, np.int32)
+        self.vtype = _read_only(vtype, np.int8)
+        self.ref = _read_only(ref, np.int32)
+        self.alt = _read_only(alt, np.int32)
+        self.alleles = alleles
+        self._records = None
+        self._labels = None
+
+    @property
+    def records(self) -> List[Tuple[str, int, str, VariantType]]:
+        """ Records of the variants, as tuples of reference allele,
+        position, alternate allele and variant type. """
+        if self._records is None:
+            alleles, vtypes = self.alleles, list(VariantType)
+            self._records = [
+                (alleles[ref], position, alleles[alt], vtypes[vtype])
+                for position, vtype, ref, alt in zip(
+                    self.position.tolist(), self.vtype.tolist(),
+                    self.ref.tolist(), self.alt.tolist()
+                )
+            ]
+        return self._records
+
+    @property
+    def labels(self) -> List[str]:
+        """ Labels of the variants. """
+        if self._labels is None:
+            self._labels = [
+                variant_label(position, reference, alternate, vtype)
+                for reference, position, alternate, vtype in self.records
+            ]
+        return self._labels
+
+    def __len__(self) -> int:
+        return len(self.position)
+
+    def __repr__(self):
+        return "{}(variants={}, alleles={})".format(
+            self.__class__.__name__, len(self), len(self.alleles)
+        )
+
+
+def _read_only(values: Sequence, dtype: np.dtype) -> np.ndarray:
+    """ Return the given values as a read-only array of the given dtype,
+    which is a view on the values if they already have such dtype. """
+    array = np.asarray(values)
+    array = array.astype(dtype) if array.dtype != dtype else array.view()
+    array.flags.writeable = False
+    return array
+
+
+class _EncodedColumn(NamedTuple):
+    """ Column of values already encoded as integer codes pointing to the
+    list of distinct values, e.g. an Arrow dictionary array. """
+    codes: np.ndarray
+    values: list
+
+
+def _check_missing(missing: np.ndarray, name: str):
+    """ Raise a ValueError if any value of the given column is missing,
+    naming the column and the first row affected. """
+    rows = np.flatnonzero(missing)
+    if len(rows):
+        raise ValueError("Missing value in column {} at row {}".format(
+            name, rows[0]
+        ))
+
+
+def _factorize(values: Sequence,
+               name: Optional[str] = None) -> Tuple[np.ndarray, list]:
+    """ Encode the given values as integer codes pointing to the list of
+    their distinct values, in order of first appearance.
+
+    Missing values are kept as distinct values, unless the name of the
+    column is given, in which case they raise a ValueError.
+    """
+    if isinstance(values, _EncodedColumn):
+        # only keep the values used, in order of first appearance
+        codes, uniques = pd.factorize(values.codes)
+        return (codes.astype(np.int32, copy=False),
+                [values.values[i] for i in uniques])
+    if (isinstance(getattr(values, "dtype", None), pd.CategoricalDtype)
+            and not values.isna().any()):
+        # categories are already encoded, only keep the ones used
+        codes, uniques = pd.factorize(values.cat.codes.to_numpy())
+        categories = values.cat.categories.take(uniques)
+        return codes.astype(np.int32, copy=False), categories.tolist()
+    if isinstance(getattr(values, "dtype", None),
+                  pd.api.extensions.ExtensionDtype):
+        # e.g. pyarrow strings are factorized natively, without converting
+        # them to an array of objects first
+        values = getattr(values, "array", values)
+    else:
+        values = np.asarray(values)
+    codes, uniques = pd.factorize(values)
+    if len(codes) and codes.min() < 0:
+        if name is not None:
+            _check_missing(codes < 0, name)
+        # missing values are kept as well
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return codes.astype(np.int32, copy=False), uniques.tolist()
+
+
+def _intern(position: np.ndarray,
+            ref: np.ndarray,
+            alt: np.ndarray,
+            n_alleles: int) -> Tuple[np.ndarray, ...]:
+    """ Encode each (position, reference, alternate) triple as the code of
+    its distinct triple.
+
+    Triples are marked in a dense table of all the possible triples when it
+    is small enough, as for mt positions and the few alleles of most
+    inputs, so that codes follow the order of the triples and the distinct
+    triples are decoded from their place in the table; otherwise they are
+    hashed, and codes follow the order of first appearance.
+
+    Args:
+        position: positions of the variants
+        ref: codes of the reference alleles
+        alt: codes of the alternate alleles
+        n_alleles: number of alleles in the pool of the allele codes
+
+    Returns:
+        tuple with the codes of the triples (int32), and the positions,
+        reference allele codes and alternate allele codes of the distinct
+        triples
+    """
+    position = np.asarray(position)
+    n_rows = len(position)
+    if not n_rows:
+        empty = np.zeros(0, dtype=np.int32)
+        return empty, empty, empty, empty
+    lowest = int(position.min())
+    n_keys = (int(position.max()) - lowest + 1) * n_alleles ** 2
+    if n_keys <= max(4 * n_rows, 1 << 22):
+        dtype = np.int32 if n_keys <= np.iinfo(np.int32).max else np.intp
+        keys = (position - np.array(lowest, dtype=position.dtype)).astype(
+            dtype, copy=False
+        )
+        keys = (keys * n_alleles + ref) * n_alleles + alt
+        seen = np.zeros(n_keys, dtype=bool)
+        seen[keys] = True
+        distinct = np.flatnonzero(seen)
+        lookup = np.empty(n_keys, dtype=np.int32)
+        lookup[distinct] = np.arange(len(distinct), dtype=np.int32)
+        distinct, alt = np.divmod(distinct, n_alleles)
+        distinct, ref = np.divmod(distinct, n_alleles)
+        return lookup[keys], distinct + lowest, ref, alt
+    # pairs of alleles are encoded first, so that keys cannot overflow
+    pairs, _ = pd.factorize(ref.astype(np.int64) * n_alleles + alt)
+    keys = position.astype(np.int64) * (pairs.max() + 1) + pairs
+    codes, _ = pd.factorize(keys)
+    # codes are in order of first appearance, so that a new triple is found
+    # whenever their running maximum increases
+    first = np.flatnonzero(np.diff(np.maximum.accumulate(codes), prepend=-1))
+    return (codes.astype(np.int32, copy=False), position[first], ref[first],
+            alt[first])
+
+
+def _length_types(alleles: List[str],
+                  ref: np.ndarray,
+                  alt: np.ndarray,
+                  n_refs: int) -> np.ndarray:
+    """ Infer the VariantType codes of the given pairs of allele codes from
+    the length of the alleles, looking them up in a table of the types of
+    all the pairs of distinct alleles when it is small enough. """
+    lengths = np.fromiter(map(len, alleles), dtype=np.int32,
+                          count=len(alleles))
+    if n_refs * len(alleles) <= 1 << 22:
+        ref_len, alt_len = lengths[:n_refs, None], lengths[None, :]
+        lookup = True
+    else:
+        ref_len, alt_len = lengths[ref], lengths[alt]
+        lookup = False
+    vtype = np.full(np.broadcast(ref_len, alt_len).shape, VariantType.MNV,
+                    dtype=np.int8)
+    vtype[np.broadcast_to(ref_len == 1, vtype.shape)] = VariantType.SNV
+    vtype[ref_len < alt_len] = VariantType.INS
+    vtype[ref_len > alt_len] = VariantType.DEL
+    return vtype[ref, alt] if lookup else vtype
+
+
+class _VariantTableBuilder:
+    """ Class used to build a VariantTable one row at a time.
+
+    Rows are accumulated in compact typed arrays, alleles are normalised to
+    strings interned in a shared pool, and variants are interned in a pool
+    of distinct (position, reference, alternate) triples, so that no
+    per-variant Python object is kept.
+
+    Attributes:
+        samples: names of the samples known in advance (more samples can be
+            added with add_sample())
+    """
+
+    def __init__(self, samples: Optional[List[str]] = None):
+        self.samples = list(samples or [])
+        self._sample_index = {name: i for i, name in enumerate(self.samples)}
+        self.alleles = []
+        self._allele_index = dict()
+        self._variant_index = dict()
+        self._position = array("i")
+        self._vtype = array("b")
+        self._ref = array("i")
+        self._alt = array("i")
+        self._variant = array("i")
+        self._hf = array("d")
+        self._sample = array("i")
+
+    def add_sample(self, name: str) -> int:
+        """ Return the index of the given sample, adding it if needed. """
+        index = self._sample_index.get(name)
+        if index is None:
+            index = self._sample_index[name] = len(self.samples)
+            self.samples.append(name)
+        return index
+
+    def add_allele(self, allele: str) -> int:
+        """ Return the code of the given allele, adding it to the pool if
+        needed. """
+        code = self._allele_index.get(allele)
+        if code is None:
+            code = self._allele_index[allele] = len(self.alleles)
+            self.alleles.append(allele)
+        return code
+
+    def add_variant(self,
+                    reference: str,
+                    position: int,
+                    alternate: str,
+                    vtype: VariantType) -> int:
+        """ Return the code of the given variant, adding it to the pool if
+        needed. """
+        key = (position, reference, alternate)
+        code = self._variant_index.get(key)
+        if code is None:
+            code = self._variant_index[key] = len(self._position)
+            self._position.append(position)
+            self._vtype.append(vtype)
+            self._ref.append(self.add_allele(reference))
+            self._alt.append(self.add_allele(alternate))
+        return code
+
+    def append(self,
+               sample: int,
+               reference: str,
+               position: int,
+               alternate: Any,
+               hf: Optional[float],
+               vtype: Optional[VariantType] = None):
+        """ Add a variant to the table.
+
+        Args:
+            sample: index of the sample of the variant
+            reference: reference allele of the variant
+            position: position of the variant
+            alternate: alternate allele of the variant (either a string or a
+                vcfpy allele)
+            hf: heteroplasmic fraction of the variant
+            vtype: type of the variant (defaults to the type of the alternate
+                allele)
+        """
+        if vtype is None:
+            alternate, vtype = normalize_allele(reference, alternate)
+        self._variant.append(self.add_variant(reference, position, alternate,
+                                              vtype))
+        self._hf.append(np.nan if hf is None else hf)
+        self._sample.append(sample)
+
+    def build(self) -> VariantTable:
+        """ Return the VariantTable with the rows added so far, sorted by
+        sample. """
+        sample = np.frombuffer(self._sample, dtype=np.int32)
+        order = np.argsort(sample, kind="stable")
+        pool = _VariantPool(np.frombuffer(self._position, dtype=np.int32),
+                            np.frombuffer(self._vtype, dtype=np.int8),
+                            np.frombuffer(self._ref, dtype=np.int32),
+                            np.frombuffer(self._alt, dtype=np.int32),
+                            self.alleles)
+        return VariantTable(
+            np.frombuffer(self._variant, dtype=np.int32)[order],
+            np.frombuffer(self._hf, dtype=np.float64)[order],
+            sample[order], pool, self.samples
+        )
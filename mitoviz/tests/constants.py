@@ -12,6 +12,8 @@ IMGDIR = os.path.join(TESTDIR, "imgs", "images")
 SAMPLE_VCF = os.path.join(DATADIR, "sample.vcf")
 SAMPLE_HF_VCF = os.path.join(DATADIR, "sample_hf.vcf")
 SAMPLE_MULTI_VCF = os.path.join(DATADIR, "multisample.vcf")
+SAMPLE_WGS_VCF_GZ = os.path.join(DATADIR, "sample_wgs.vcf.gz")
+SAMPLE_WGS_BCF = os.path.join(DATADIR, "sample_wgs.bcf")
 
 SAMPLE_HF_CSV = os.path.join(DATADIR, "sample_hf.csv")
 SAMPLE_HF_TSV = os.path.join(DATADIR, "sample_hf.tsv")
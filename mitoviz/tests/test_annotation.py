@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import unittest
+
+import numpy as np
+
+from mitoviz import annotation
+from mitoviz.constants import (
+    COLOR_MAPS, COLORS, MT_LENGTH, NAMES, STARTS, STRANDS
+)
+
+
+class TestAnnotation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.positions = np.arange(-2, MT_LENGTH + 3)
+
+    def test_color(self):
+        # Given/When
+        result = annotation.color(73)
+
+        # Then
+        self.assertEqual("#ffa500", result)
+
+    def test_color_float(self):
+        # Given/When/Then
+        self.assertEqual("#ffa500", annotation.color(73.0))
+        self.assertEqual("#ffa500", annotation.color(np.float64(73)))
+
+    def test_color_overlap(self):
+        # Given/When/Then
+        self.assertEqual(COLOR_MAPS[(5729, 5761)], annotation.color(5760))
+        self.assertEqual(COLOR_MAPS[(5826, 5892)], annotation.color(5891))
+        self.assertEqual(COLOR_MAPS[(7445, 7517)], annotation.color(7515))
+
+    def test_color_outside(self):
+        # Given/When/Then
+        self.assertIsNone(annotation.color(-1))
+        self.assertIsNone(annotation.color(MT_LENGTH + 1))
+
+    def test_colors(self):
+        # Given
+        expected = []
+        for position in self.positions:
+            for (start, stop), color in COLOR_MAPS.items():
+                if start <= position <= stop:
+                    expected.append(color)
+                    break
+            else:
+                expected.append(None)
+
+        # When
+        result = annotation.colors(self.positions)
+
+        # Then
+        self.assertEqual(expected, result)
+        self.assertEqual(expected,
+                         [annotation.color(el) for el in self.positions])
+
+    def test_strand(self):
+        # Given/When/Then
+        self.assertEqual("L", annotation.strand(73))
+        self.assertEqual("H", annotation.strand(3308))
+        self.assertEqual("", annotation.strand(3305))
+        self.assertEqual("L", annotation.strand(5891))
+        self.assertEqual("H", annotation.strand(MT_LENGTH))
+
+    def test_strand_float(self):
+        # Given/When/Then
+        self.assertEqual("L", annotation.strand(14700.0))
+        self.assertEqual("L", annotation.strand(np.float64(14700)))
+
+    def test_strand_outside(self):
+        # Given/When/Then
+        self.assertEqual("H", annotation.strand(-1))
+        self.assertEqual("H", annotation.strand(MT_LENGTH + 1))
+
+    def test_strands(self):
+        # Given
+        expected = [annotation.strand(el) for el in self.positions]
+
+        # When
+        result = annotation.strands(self.positions)
+
+        # Then
+        self.assertEqual(expected, result)
+
+
+class TestAnnotationIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.index = annotation.INDEX
+
+    def test_index_loci(self):
+        # Given/When
+        intervals = {(int(start), int(start + length)): color
+                     for start, length, color in zip(self.index.starts,
+                                                     self.index.lengths,
+                                                     self.index.colors)}
+
+        # Then
+        self.assertEqual(NAMES + ["DLOOP"], self.index.names)
+        self.assertEqual(STARTS, self.index.starts.tolist())
+        self.assertEqual(STRANDS, self.index.strands)
+        self.assertEqual(COLOR_MAPS, intervals)
+
+    def test_index_scalar(self):
+        # Given/When/Then
+        self.assertEqual(7, self.index.locus(3308))
+        self.assertEqual("ND1", self.index.name(3308))
+        self.assertEqual("cds", self.index.type(np.int32(3308)))
+        self.assertEqual(COLORS["cds"], self.index.color(3308))
+        self.assertEqual("H", self.index.strand(3308))
+        self.assertEqual("DLOOP", self.index.name(MT_LENGTH))
+
+    def test_index_outside(self):
+        # Given/When/Then
+        self.assertEqual(-1, self.index.locus(-1))
+        self.assertIsNone(self.index.name(MT_LENGTH + 1))
+        self.assertIsNone(self.index.type(-1))
+
+    def test_index_array(self):
+        # Given
+        positions = np.arange(-2, MT_LENGTH + 3)
+
+        # When
+        result = {attribute: getattr(self.index, attribute)(positions)
+                  for attribute in ("name", "type", "color", "strand")}
+
+        # Then
+        for attribute, values in result.items():
+            self.assertEqual(
+                [getattr(self.index, attribute)(int(el)) for el in positions],
+                values
+            )
+        np.testing.assert_array_equal(
+            [self.index.locus(int(el)) for el in positions],
+            self.index.locus(positions)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+
+from mitoviz.cache import _ParseCache
+from mitoviz.parsers import _VcfParser
+from mitoviz.tests.constants import SAMPLE_HF_VCF, SAMPLE_MULTI_VCF
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = _ParseCache(self.cache_dir)
+        self.vcf = _VcfParser(SAMPLE_MULTI_VCF)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir)
+
+    def test_load_missing(self):
+        # Given/When
+        result = self.cache.load(SAMPLE_MULTI_VCF, samples=[])
+
+        # Then
+        self.assertIsNone(result)
+
+    def test_store_load(self):
+        # Given
+        self.cache.store(SAMPLE_MULTI_VCF, self.vcf.table,
+                         Counter(no_call=2), samples=[])
+
+        # When
+        table, skipped = self.cache.load(SAMPLE_MULTI_VCF, samples=[])
+
+        # Then
+        self.assertEqual(self.vcf.table.samples, table.samples)
+        self.assertEqual(self.vcf.table.variants(), table.variants())
+        self.assertEqual(Counter(no_call=2), skipped)
+
+    def test_options(self):
+        # Given
+        self.cache.store(SAMPLE_MULTI_VCF, self.vcf.table, samples=[])
+
+        # When
+        result = self.cache.load(SAMPLE_MULTI_VCF, samples=["SRR1777290"])
+
+        # Then
+        self.assertIsNone(result)
+
+    def test_content_hash(self):
+        # Given
+        copy_path = os.path.join(self.cache_dir, "copy.vcf")
+        shutil.copy(SAMPLE_MULTI_VCF, copy_path)
+
+        # When/Then
+        self.assertEqual(self.cache.content_hash(SAMPLE_MULTI_VCF),
+                         self.cache.content_hash(copy_path))
+        self.assertNotEqual(self.cache.content_hash(SAMPLE_MULTI_VCF),
+                            self.cache.content_hash(SAMPLE_HF_VCF))
+
+    def test_evict(self):
+        # Given
+        self.cache.store(SAMPLE_MULTI_VCF, self.vcf.table, samples=[])
+        self.cache.store(SAMPLE_MULTI_VCF, self.vcf.table, samples=["A"])
+        first, second = sorted(self.cache.entries, key=os.path.getmtime)
+        os.utime(second, (0, 0))  # make the second entry the oldest one
+        self.cache.max_size = os.path.getsize(first)
+
+        # When
+        self.cache.evict()
+
+        # Then
+        self.assertEqual([first], self.cache.entries)
+
+    def test_evict_index(self):
+        # Given
+        copy_path = os.path.join(self.cache_dir, "copy.vcf")
+        shutil.copy(SAMPLE_HF_VCF, copy_path)
+        self.cache.store(SAMPLE_MULTI_VCF, self.vcf.table, samples=[])
+        self.cache.store(copy_path, self.vcf.table, samples=[])
+        os.utime(self.cache.entry_path(SAMPLE_MULTI_VCF, samples=[]),
+                 (0, 0))
+        self.cache.max_size = os.path.getsize(
+            self.cache.entry_path(copy_path, samples=[])
+        )
+
+        # When
+        self.cache.evict()
+
+        # Then
+        index = self.cache._load_index()
+        self.assertEqual(1, len(index))
+        self.assertTrue(next(iter(index)).startswith(
+            os.path.realpath(copy_path)
+        ))
+
+    def test_clear(self):
+        # Given
+        self.cache.store(SAMPLE_MULTI_VCF, self.vcf.table, samples=[])
+
+        # When
+        result = self.cache.clear()
+
+        # Then
+        self.assertEqual(1, result)
+        self.assertEqual([], self.cache.entries)
+
+
+class TestVcfParserCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir)
+
+    def test_cache_dir(self):
+        # Given
+        expected = _VcfParser(SAMPLE_MULTI_VCF)
+        _VcfParser(SAMPLE_MULTI_VCF, cache_dir=self.cache_dir)
+
+        # When
+        result = _VcfParser(SAMPLE_MULTI_VCF, cache_dir=self.cache_dir)
+
+        # Then
+        self.assertEqual(1, len(_ParseCache(self.cache_dir).entries))
+        self.assertEqual(expected.variants, result.variants)
+        self.assertEqual(expected.skipped_calls, result.skipped_calls)
+
+    def test_cache_dir_stream(self):
+        # Given
+        expected = list(_VcfParser(SAMPLE_MULTI_VCF,
+                                   stream=True).iter_variants())
+        vcf = _VcfParser(SAMPLE_MULTI_VCF, stream=True,
+                         cache_dir=self.cache_dir)
+        list(vcf.iter_variants(batch_size=1))
+
+        # When
+        result = list(vcf.iter_variants(batch_size=1))
+
+        # Then
+        self.assertEqual(len(vcf.parsed_samples),
+                         len(_ParseCache(self.cache_dir).entries))
+        self.assertEqual(expected, result)
+
+    def test_cache_dir_engine(self):
+        # Given
+        _VcfParser(SAMPLE_HF_VCF, engine="pysam", cache_dir=self.cache_dir)
+
+        # When
+        result = _VcfParser(SAMPLE_HF_VCF, engine="vcfpy",
+                            cache_dir=self.cache_dir)
+
+        # Then
+        self.assertEqual("vcfpy", result.engine)
+        self.assertEqual(2, len(_ParseCache(self.cache_dir).entries))
+        self.assertEqual(_VcfParser(SAMPLE_HF_VCF).variants,
+                         result.variants)
+
+
+if __name__ == '__main__':
+    unittest.main()
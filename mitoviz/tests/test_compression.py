@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas.testing as pt
+import pysam
+
+from mitoviz.compression import (
+    _BgzfReader, detect_compression, open_compressed, zstandard
+)
+from mitoviz.parsers import _TabularParser
+from mitoviz.tests.constants import SAMPLE_HF_DF, SAMPLE_HF_TSV
+
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        with open(SAMPLE_HF_TSV, "rb") as f:
+            self.content = f.read()
+
+    def _write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def _write_bgzf(self, name: str, content: bytes) -> str:
+        path = self._write(name + ".tmp", content)
+        pysam.tabix_compress(path, os.path.join(self.tmp_dir, name))
+        return os.path.join(self.tmp_dir, name)
+
+    def test_detect_compression(self):
+        # Given
+        paths = {
+            None: SAMPLE_HF_TSV,
+            "gzip": self._write("sample.tsv.gz", gzip.compress(self.content)),
+            "bgzf": self._write_bgzf("sample.tsv.bgz", self.content),
+            "bz2": self._write("sample.tsv.bz2", bz2.compress(self.content)),
+            "xz": self._write("sample.tsv.xz", lzma.compress(self.content)),
+        }
+
+        for expected, path in paths.items():
+            # When
+            result = detect_compression(path)
+
+            # Then
+            self.assertEqual(expected, result)
+
+    def test_detect_compression_magic(self):
+        # Given
+        path = self._write("sample.tsv", gzip.compress(self.content))
+
+        # When
+        result = detect_compression(path)
+
+        # Then
+        self.assertEqual("gzip", result)
+
+    def test_open_compressed(self):
+        # Given
+        path = self._write("sample.tsv.xz", lzma.compress(self.content))
+
+        # When
+        with open_compressed(path) as f:
+            result = f.read()
+
+        # Then
+        self.assertEqual(self.content, result)
+
+    def test_open_compressed_bgzf_threads(self):
+        # Given
+        content = self.content * 20000  # several BGZF blocks
+        path = self._write_bgzf("sample.tsv.gz", content)
+
+        # When
+        with open_compressed(path, threads=3) as f:
+            result = f.read()
+
+        # Then
+        self.assertEqual(content, result)
+
+    def test_bgzf_reader_invalid(self):
+        # Given
+        path = self._write("sample.tsv.gz", gzip.compress(self.content))
+
+        # When/Then
+        with self.assertRaises(OSError):
+            with _BgzfReader(path, threads=2) as f:
+                f.read()
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_open_compressed_zstd(self):
+        # Given
+        compressed = zstandard.ZstdCompressor().compress(self.content)
+        path = self._write("sample.tsv.zst", compressed)
+
+        # When
+        with open_compressed(path) as f:
+            result = f.read()
+
+        # Then
+        self.assertEqual(self.content, result)
+
+    def test_tabular_parser(self):
+        # Given
+        path = self._write_bgzf("sample.tsv.gz", self.content)
+
+        # When
+        result = _TabularParser(path, threads=2)
+
+        # Then
+        self.assertEqual("\t", result.sep)
+        pt.assert_frame_equal(SAMPLE_HF_DF, result.df)
+
+    def test_open_compressed_explicit(self):
+        # Given
+        path = self._write("sample.dat", bz2.compress(self.content))
+
+        # When
+        with open_compressed(path, compression={"method": "bz2"}) as f:
+            result = f.read()
+
+        # Then
+        self.assertEqual(self.content, result)
+        with self.assertRaises(ValueError):
+            open_compressed(path, compression="zip")
+
+    def test_tabular_parser_compression(self):
+        # Given
+        path = self._write("sample.tsv.gz", gzip.compress(self.content))
+
+        # When
+        result = _TabularParser(path, compression="gzip")
+
+        # Then
+        self.assertEqual("\t", result.sep)
+        pt.assert_frame_equal(SAMPLE_HF_DF, result.df)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,12 +2,16 @@
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
 import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
 import cv2
 import numpy as np
 
 from mitoviz.mitoviz import plot_base, plot_df, plot_table, plot_vcf
+from mitoviz.parsers import pa
 from mitoviz.tests.constants import (
     SAMPLE_VCF, SAMPLE_HF_VCF, SAMPLE_MULTI_VCF, SAMPLE_CUSTOM_DF,
     SAMPLE_DF, SAMPLE_HF_DF, SAMPLE_MULTI_DF,
@@ -731,3 +735,80 @@ class TestModuleTabular(unittest.TestCase):
         self.assertFalse(np.any(diff))
         # Cleanup
         os.remove("HG00420.png")
+
+
+class TestModuleSamples(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.vcf = os.path.join(self.tmp_dir, "carriers.vcf")
+        with open(self.vcf, "w") as f:
+            f.write("##fileformat=VCFv4.2\n"
+                    "##contig=<ID=chrM,length=16569>\n"
+                    '##FORMAT=<ID=GT,Number=1,Type=String,'
+                    'Description="Genotype">\n'
+                    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\t"
+                    "FORMAT\tS1\tS2\tS3\n"
+                    "chrM\t73\t.\tA\tG\t.\tPASS\t.\tGT\t1\t0\t1\n")
+
+    def _plot(self, stream: bool, **kwargs) -> list:
+        out_dir = tempfile.mkdtemp(dir=self.tmp_dir)
+        plot_vcf(self.vcf, save=True, output=os.path.join(out_dir, "mt.png"),
+                 stream=stream, **kwargs)
+        return sorted(os.listdir(out_dir))
+
+    def test_module_plot_samples_stream(self):
+        # Given
+        expected = ["mt_1.png", "mt_2.png", "mt_3.png"]
+
+        # When
+        result = self._plot(stream=False)
+        result_stream = self._plot(stream=True)
+        result_batch = self._plot(stream=True, batch_size=2)
+
+        # Then
+        self.assertEqual(expected, result)
+        self.assertEqual(expected, result_stream)
+        self.assertEqual(expected, result_batch)
+
+
+class TestModulePositions(unittest.TestCase):
+
+    def setUp(self) -> None:
+        in_range = SAMPLE_HF_DF["POS"].between(1, 5000)
+        self.expected = SAMPLE_HF_DF.loc[in_range, "POS"].tolist()
+
+    def test_module_plot_table_positions(self):
+        # Given/When
+        with mock.patch("mitoviz.mitoviz.plot_df") as plot:
+            plot_table(SAMPLE_HF_CSV, positions=(1, 5000))
+
+        # Then
+        self.assertEqual(self.expected,
+                         plot.call_args.args[0]["POS"].tolist())
+
+    def test_module_plot_table_positions_chunks(self):
+        # Given/When
+        with mock.patch("mitoviz.mitoviz.PlotVariants.polar") as plot:
+            plot_table(SAMPLE_HF_CSV, positions=(1, 5000), chunksize=3)
+
+        # Then
+        self.assertEqual(self.expected,
+                         plot.call_args.args[0].position.tolist())
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_module_plot_table_positions_parquet(self):
+        # Given
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, "sample_hf.parquet")
+        SAMPLE_HF_DF.to_parquet(path)
+
+        # When
+        with mock.patch("mitoviz.mitoviz.plot_df") as plot:
+            plot_table(path, positions=(1, 5000))
+
+        # Then
+        self.assertEqual(self.expected,
+                         plot.call_args.args[0].column("POS").to_pylist())
@@ -1,15 +1,28 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
+import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
+from collections import Counter
 
+import numpy as np
+import pandas as pd
 import pandas.testing as pt
 from vcfpy import Call, Substitution
 
 from mitoviz.tests.constants import (
-    SAMPLE_DF, SAMPLE_HF_CSV, SAMPLE_HF_DF, SAMPLE_HF_TSV, SAMPLE_HF_VCF,
+    SAMPLE_DF, SAMPLE_HF_CSV, SAMPLE_HF_DF, SAMPLE_HF_TSV, SAMPLE_HF_TSV_COMM,
+    SAMPLE_HF_VCF, SAMPLE_MULTI_VCF, SAMPLE_VCF, SAMPLE_WGS_BCF,
+    SAMPLE_WGS_VCF_GZ
 )
-from mitoviz.parsers import _DataFrameParser, _TabularParser, _VcfParser
+from mitoviz.parsers import (
+    _ArrowParser, _DataFrameParser, _InterchangeParser, _TabularParser,
+    _VcfParser, pa
+)
+from mitoviz.table import VariantTable
 from mitoviz.variant import _Variant
 
 
@@ -34,6 +47,15 @@ class TestVcfParser(unittest.TestCase):
         self.assertIsInstance(self.vcf.variants, dict)
         self.assertIn(variant, list(self.vcf.variants.values())[0])
 
+    def test_table(self):
+        # Given/When
+        table = self.vcf.table
+
+        # Then
+        self.assertIsInstance(table, VariantTable)
+        self.assertEqual(["HG00420"], table.samples)
+        self.assertEqual(table.variants(), self.vcf.variants["HG00420"])
+
     def test_parse_call(self):
         # Given
         call = Call('HG00420', {'GT': '0/1',
@@ -60,6 +82,437 @@ class TestVcfParser(unittest.TestCase):
         # Then
         self.assertEqual(expected, result)
 
+    def test_carried_alleles_gt(self):
+        # Given
+        skipped = Counter()
+
+        # When/Then
+        self.assertEqual([1], self.vcf.carried_alleles(2, gt=[0, 2],
+                                                       skipped=skipped))
+        self.assertEqual([], self.vcf.carried_alleles(1, gt=[0, 0],
+                                                      skipped=skipped))
+        self.assertEqual([], self.vcf.carried_alleles(1, gt=[None],
+                                                      skipped=skipped))
+        self.assertEqual(Counter(no_call=1, hom_ref=1, not_carried=1),
+                         skipped)
+
+    def test_carried_alleles_ad(self):
+        self.assertEqual([0], self.vcf.carried_alleles(2, ad=[10, 5, 0]))
+
+    def test_carried_alleles_hf(self):
+        self.assertEqual([1], self.vcf.carried_alleles(2, hf=[0.0, 0.6]))
+
+    def test_carried_alleles_missing(self):
+        self.assertEqual([0, 1], self.vcf.carried_alleles(2))
+
+    def test_carriers_only(self):
+        # Given
+        vcf = _VcfParser(SAMPLE_MULTI_VCF, carriers_only=False)
+        no_call = _Variant(reference="T", position=310,
+                           alternate=Substitution("INS", "TC"), hf=0.5)
+
+        # When
+        result = _VcfParser(SAMPLE_MULTI_VCF)
+
+        # Then
+        self.assertIn(no_call, vcf.variants["SRR1777295"])
+        self.assertNotIn(no_call, result.variants["SRR1777295"])
+        self.assertEqual(Counter(no_call=13), result.skipped_calls)
+        self.assertEqual(Counter(), vcf.skipped_calls)
+
+    def test_stream(self):
+        # Given/When
+        vcf = _VcfParser(SAMPLE_HF_VCF, stream=True)
+
+        # Then
+        self.assertEqual({}, vcf.variants)
+        self.assertEqual(["HG00420"], vcf.samples)
+
+    def test_iter_variants(self):
+        # Given
+        vcf = _VcfParser(SAMPLE_MULTI_VCF)
+        expected = list(vcf.variants.items())
+
+        # When
+        result = list(_VcfParser(SAMPLE_MULTI_VCF,
+                                 stream=True).iter_variants())
+
+        # Then
+        self.assertEqual(expected, result)
+
+    def test_iter_tables(self):
+        # Given
+        vcf = _VcfParser(SAMPLE_MULTI_VCF)
+
+        # When
+        result = list(_VcfParser(SAMPLE_MULTI_VCF,
+                                 stream=True).iter_tables())
+
+        # Then
+        self.assertEqual(vcf.table.samples, [el[0] for el in result])
+        for sample, table in result:
+            self.assertEqual(vcf.table.variants(sample), table.variants())
+
+    def test_jobs(self):
+        # Given
+        expected = _VcfParser(SAMPLE_MULTI_VCF)
+
+        # When
+        result = _VcfParser(SAMPLE_MULTI_VCF, jobs=2)
+
+        # Then
+        self.assertEqual(expected.table.samples, result.table.samples)
+        self.assertEqual(expected.variants, result.variants)
+        self.assertEqual(expected.skipped_calls, result.skipped_calls)
+
+    def test_iter_variants_batch(self):
+        # Given
+        vcf = _VcfParser(SAMPLE_MULTI_VCF, stream=True)
+        expected = list(vcf.iter_variants())
+
+        # When
+        result = list(vcf.iter_variants(batch_size=2))
+
+        # Then
+        self.assertEqual(expected, result)
+
+    def test_iter_tables_passes(self):
+        # Given
+        vcf = _VcfParser(SAMPLE_MULTI_VCF, stream=True)
+
+        for batch_size, expected in ((None, 1), (2, 3)):
+            opts = dict(batch_size=batch_size) if batch_size else dict()
+            with mock.patch.object(vcf, "_read", wraps=vcf._read) as read:
+                # When
+                result = list(vcf.iter_tables(**opts))
+
+                # Then
+                self.assertEqual(5, len(result))
+                self.assertEqual(expected, read.call_count)
+
+    def test_iter_variants_sample(self):
+        # Given
+        vcf = _VcfParser(SAMPLE_MULTI_VCF)
+        expected = [("SRR1777290", vcf.variants["SRR1777290"])]
+
+        # When
+        result = list(vcf.iter_variants(samples=["SRR1777290"]))
+
+        # Then
+        self.assertEqual(expected, result)
+
+    def test_parsed_samples(self):
+        # Given
+        vcf = _VcfParser(SAMPLE_MULTI_VCF)
+        expected = {"SRR1777290": vcf.variants["SRR1777290"],
+                    "SRR1777294": vcf.variants["SRR1777294"]}
+
+        # When
+        result = _VcfParser(SAMPLE_MULTI_VCF,
+                            parsed_samples=["SRR1777290", "SRR1777294"])
+
+        # Then
+        self.assertEqual(["SRR1777290", "SRR1777294"], result.parsed_samples)
+        self.assertEqual(expected, result.variants)
+
+    def test_parsed_samples_pysam(self):
+        # Given
+        expected = {"HG00420": self.vcf.variants["HG00420"]}
+
+        # When
+        result = _VcfParser(SAMPLE_WGS_BCF, parsed_samples=["HG00420"])
+
+        # Then
+        self.assertEqual(expected, result.variants)
+
+    def test_parsed_samples_missing(self):
+        with self.assertRaises(ValueError):
+            _VcfParser(SAMPLE_MULTI_VCF, parsed_samples=["HG00420"])
+
+    def test_parsed_samples_stream(self):
+        # Given
+        vcf = _VcfParser(SAMPLE_MULTI_VCF)
+        expected = [("SRR1777291", vcf.variants["SRR1777291"])]
+
+        # When
+        result = list(_VcfParser(SAMPLE_MULTI_VCF, stream=True,
+                                 parsed_samples=["SRR1777291"]
+                                 ).iter_variants())
+
+        # Then
+        self.assertEqual(expected, result)
+
+    def test_iter_variants_no_sample(self):
+        # Given
+        vcf = _VcfParser(SAMPLE_VCF)
+        expected = list(vcf.variants.items())
+
+        # When
+        result = list(vcf.iter_variants())
+
+        # Then
+        self.assertEqual(expected, result)
+
+
+class TestVcfParserEngine(unittest.TestCase):
+
+    def test_engine_default(self):
+        self.assertEqual("pysam", _VcfParser(SAMPLE_HF_VCF).engine)
+
+    def test_engine_fallback(self):
+        # htslib is not able to parse the INFO fields of this file
+        self.assertEqual("vcfpy", _VcfParser(SAMPLE_MULTI_VCF).engine)
+
+    def test_engine_invalid(self):
+        with self.assertRaises(ValueError):
+            _VcfParser(SAMPLE_HF_VCF, engine="cyvcf2")
+
+    def test_engine_bcf(self):
+        with self.assertRaises(ValueError):
+            _VcfParser(SAMPLE_WGS_BCF, engine="vcfpy")
+
+    def test_variants(self):
+        for vcf_in in (SAMPLE_VCF, SAMPLE_HF_VCF, SAMPLE_WGS_VCF_GZ):
+            # Given
+            expected = _VcfParser(vcf_in, engine="vcfpy").variants
+
+            # When
+            result = _VcfParser(vcf_in, engine="pysam").variants
+
+            # Then
+            self.assertEqual(expected, result)
+
+    def test_parse_sample(self):
+        # Given
+        vcf = _VcfParser(SAMPLE_HF_VCF, engine="pysam")
+        reader = vcf._open()
+        sample = next(iter(reader)).samples["HG00420"]
+        expected = 0.642
+
+        # When
+        result = vcf.parse_sample(sample, 1)
+
+        # Then
+        self.assertEqual(expected, result)
+
+
+class TestVcfParserIndexed(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.vcf = _VcfParser(SAMPLE_HF_VCF)
+        self.vcf_gz = _VcfParser(SAMPLE_WGS_VCF_GZ)
+        self.bcf = _VcfParser(SAMPLE_WGS_BCF)
+
+    def test_is_indexed(self):
+        self.assertFalse(self.vcf.is_indexed)
+        self.assertTrue(self.vcf_gz.is_indexed)
+        self.assertTrue(self.bcf.is_indexed)
+
+    def test_is_bcf(self):
+        self.assertFalse(self.vcf_gz.is_bcf)
+        self.assertTrue(self.bcf.is_bcf)
+
+    def test_contig(self):
+        self.assertEqual("chrMT", self.vcf.contig)
+        self.assertEqual("chrMT", self.vcf_gz.contig)
+        self.assertEqual("chrMT", self.bcf.contig)
+
+    def test_contig_custom(self):
+        # Given/When
+        vcf = _VcfParser(SAMPLE_WGS_VCF_GZ, contig="chr1")
+
+        # Then
+        self.assertEqual("chr1", vcf.contig)
+        self.assertTrue(all(variant.position < 16569
+                            for variant in self.vcf_gz.variants["HG00420"]))
+        self.assertTrue(all(variant.position >= 10000
+                            for variant in vcf.variants["HG00420"]))
+
+    def test_contig_missing(self):
+        with self.assertRaises(ValueError):
+            _VcfParser(SAMPLE_WGS_BCF, contig="chrM")
+
+    def test_contig_not_mt(self):
+        # Given
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        vcf_in = os.path.join(tmp_dir, "nuclear.vcf")
+        with open(SAMPLE_HF_VCF) as f:
+            content = f.read().replace("chrMT", "chrMT_custom")
+        with open(vcf_in, "w") as f:
+            f.write(content)
+
+        # When/Then
+        with self.assertRaisesRegex(ValueError, "chrMT_custom"):
+            _VcfParser(vcf_in)
+        self.assertEqual(
+            self.vcf.variants,
+            _VcfParser(vcf_in, contig="chrMT_custom").variants
+        )
+
+    def test_samples(self):
+        self.assertEqual(["HG00420"], self.vcf_gz.samples)
+        self.assertEqual(["HG00420"], self.bcf.samples)
+
+    def test_variants(self):
+        self.assertEqual(self.vcf.variants, self.vcf_gz.variants)
+        self.assertEqual(self.vcf.variants, self.bcf.variants)
+
+    def test_iter_variants(self):
+        # Given
+        expected = list(self.vcf.variants.items())
+
+        # When
+        result = list(self.bcf.iter_variants())
+
+        # Then
+        self.assertEqual(expected, result)
+
+
+class TestVcfParserFollow(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        self.state_dir = os.path.join(self.tmp_dir, "state")
+        self.vcf_in = os.path.join(self.tmp_dir, "growing.vcf")
+        with open(SAMPLE_MULTI_VCF) as f:
+            lines = f.readlines()
+        self.header = [line for line in lines if line.startswith("#")]
+        self.records = [line for line in lines if not line.startswith("#")]
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, records: list):
+        with open(self.vcf_in, "w") as f:
+            f.writelines(self.header + records)
+
+    def test_follow_first_run(self):
+        # Given
+        self.write(self.records)
+
+        # When
+        result = _VcfParser(self.vcf_in, state_dir=self.state_dir)
+
+        # Then
+        self.assertEqual(_VcfParser(SAMPLE_MULTI_VCF).variants,
+                         result.variants)
+        self.assertEqual(result.samples, result.touched_samples)
+
+    def test_follow_unchanged(self):
+        # Given
+        self.write(self.records)
+        _VcfParser(self.vcf_in, state_dir=self.state_dir)
+
+        # When
+        result = _VcfParser(self.vcf_in, state_dir=self.state_dir)
+
+        # Then
+        self.assertEqual(_VcfParser(SAMPLE_MULTI_VCF).variants,
+                         result.variants)
+        self.assertEqual([], result.touched_samples)
+
+    def test_follow_appended(self):
+        # Given
+        self.write(self.records[:5] + [self.records[5][:10]])
+        _VcfParser(self.vcf_in, state_dir=self.state_dir)
+        self.write(self.records)
+        expected = _VcfParser(SAMPLE_MULTI_VCF)
+
+        # When
+        result = _VcfParser(self.vcf_in, state_dir=self.state_dir)
+
+        # Then
+        self.assertEqual(expected.variants, result.variants)
+        self.assertEqual(expected.skipped_calls, result.skipped_calls)
+        self.assertEqual(len(expected.table), len(result.table))
+        self.assertTrue(result.touched_samples)
+
+    def test_follow_rewritten(self):
+        # Given
+        self.write(self.records)
+        _VcfParser(self.vcf_in, state_dir=self.state_dir)
+        self.write(self.records[:-1])
+        expected = _VcfParser(self.vcf_in)
+
+        # When
+        result = _VcfParser(self.vcf_in, state_dir=self.state_dir)
+
+        # Then
+        self.assertEqual(expected.variants, result.variants)
+        self.assertEqual(["SRR1777294", "SRR1777295", "SRR1777296"],
+                         result.touched_samples)
+
+    def test_follow_replaced(self):
+        # Given
+        records = self.records * 20  # rewritten record is before the tail
+        self.write(records)
+        _VcfParser(self.vcf_in, state_dir=self.state_dir)
+        records[0] = records[0].replace("0.042", "0.142")
+        tmp_path = self.vcf_in + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.writelines(self.header + records)
+        os.replace(tmp_path, self.vcf_in)
+        expected = _VcfParser(self.vcf_in)
+
+        # When
+        result = _VcfParser(self.vcf_in, state_dir=self.state_dir)
+
+        # Then
+        self.assertEqual(expected.variants, result.variants)
+        self.assertEqual(1, len(result.touched_samples))
+
+    def test_follow_engine(self):
+        # Given
+        self.write(self.records)
+
+        # When
+        result = _VcfParser(self.vcf_in, engine="pysam",
+                            state_dir=self.state_dir)
+
+        # Then
+        self.assertEqual("vcfpy", result.engine)
+
+    def test_follow_long_incomplete_record(self):
+        # Given
+        self.write(self.records[:5] + [self.records[5][:10] + "A" * 10000])
+        _VcfParser(self.vcf_in, state_dir=self.state_dir)
+        self.write(self.records)
+        expected = _VcfParser(SAMPLE_MULTI_VCF)
+
+        # When
+        result = _VcfParser(self.vcf_in, state_dir=self.state_dir)
+
+        # Then
+        self.assertEqual(expected.variants, result.variants)
+        self.assertEqual(len(expected.table), len(result.table))
+
+    def test_follow_compressed(self):
+        # Given
+        _VcfParser(SAMPLE_WGS_VCF_GZ, engine="pysam",
+                   state_dir=self.state_dir)
+
+        # When
+        result = _VcfParser(SAMPLE_WGS_VCF_GZ, engine="pysam",
+                            state_dir=self.state_dir)
+
+        # Then
+        self.assertEqual("pysam", result.engine)
+        self.assertEqual(_VcfParser(SAMPLE_WGS_VCF_GZ).variants,
+                         result.variants)
+        self.assertEqual([], result.touched_samples)
+
+    def test_follow_jobs_cache_dir(self):
+        # Given
+        self.write(self.records)
+
+        # When/Then
+        with self.assertRaises(ValueError):
+            _VcfParser(self.vcf_in, jobs=2, state_dir=self.state_dir)
+        with self.assertRaises(ValueError):
+            _VcfParser(self.vcf_in, cache_dir=self.tmp_dir,
+                       state_dir=self.state_dir)
+
 
 class TestDataFrameParser(unittest.TestCase):
 
@@ -87,6 +540,44 @@ class TestDataFrameParser(unittest.TestCase):
         self.assertIn(variant, list(self.df.variants.values())[0])
         self.assertIn(variant_hf, list(self.df_hf.variants.values())[0])
 
+    def test_table(self):
+        # Given/When
+        table = self.df_hf.table
+
+        # Then
+        self.assertIsInstance(table, VariantTable)
+        self.assertEqual(len(SAMPLE_HF_DF), len(table))
+        self.assertEqual(SAMPLE_HF_DF["POS"].tolist(),
+                         table.position.tolist())
+
+    def test_df_not_modified(self):
+        # Given
+        df = SAMPLE_HF_DF.copy()
+        df["HF"] = (df["HF"] * 1000).astype(int)
+        expected = df.copy()
+
+        # When
+        parser = _DataFrameParser(df)
+
+        # Then
+        pt.assert_frame_equal(expected, df)
+        self.assertEqual((expected["HF"] * 1.0).tolist(),
+                         parser.table.hf.tolist())
+
+    def test_df_views(self):
+        # Given
+        df = SAMPLE_HF_DF.copy()
+        df["POS"] = df["POS"].astype("int32")
+
+        # When
+        table = _DataFrameParser(df).table
+
+        # Then
+        self.assertTrue(np.shares_memory(table.hf, df["HF"].to_numpy()))
+        self.assertTrue(np.shares_memory(table.position,
+                                         df["POS"].to_numpy()))
+        self.assertFalse(table.hf.flags.writeable)
+
     def test_has_sample_true(self):
         self.assertTrue(self.df_hf.has_sample)
 
@@ -113,3 +604,283 @@ class TestTabularParser(unittest.TestCase):
         # Then
         pt.assert_frame_equal(df, self.csv.df)
         pt.assert_frame_equal(df, self.tsv.df)
+
+    def test_df_cached(self):
+        # Given/When
+        first, second = self.csv.df, self.csv.df
+
+        # Then
+        self.assertIs(first, second)
+
+    def test_df_file_changed(self):
+        # Given
+        _, path = self._write_samples(["S1"] * 10)
+        parser = _TabularParser(path)
+        first = parser.df
+        SAMPLE_HF_DF.head(3).to_csv(path, index=False)
+
+        # When
+        result = parser.df
+
+        # Then
+        self.assertIsNot(first, result)
+        self.assertEqual(3, len(result))
+
+    def test_df_release(self):
+        # Given
+        first = self.csv.df
+
+        # When
+        self.csv.release()
+
+        # Then
+        self.assertIsNot(first, self.csv.df)
+        pt.assert_frame_equal(first, self.csv.df)
+
+    def test_sniff_sep(self):
+        # Given/When
+        result = _TabularParser(SAMPLE_HF_TSV)
+
+        # Then
+        self.assertEqual("\t", result.sep)
+        self.assertEqual(",", self.csv.sep)
+        pt.assert_frame_equal(SAMPLE_HF_DF, result.df)
+
+    def test_sniff_sep_comment(self):
+        # Given/When
+        result = _TabularParser(SAMPLE_HF_TSV_COMM, comment="#")
+
+        # Then
+        self.assertEqual("\t", result.sep)
+
+    def test_engine(self):
+        # Given/When
+        regex = _TabularParser(SAMPLE_HF_TSV, sep=r"\t+")
+        footer = _TabularParser(SAMPLE_HF_CSV, skipfooter=1)
+
+        # Then
+        self.assertEqual("c", self.csv.engine)
+        self.assertEqual("python", regex.engine)
+        self.assertEqual("python", footer.engine)
+        pt.assert_frame_equal(SAMPLE_HF_DF, regex.df)
+
+    def test_engine_invalid(self):
+        with self.assertRaises(ValueError):
+            _TabularParser(SAMPLE_HF_CSV, engine="invalid")
+
+    def test_columns(self):
+        # Given
+        columns = _TabularParser.variant_columns(hf_col="MISSING")
+
+        # When
+        result = _TabularParser(SAMPLE_HF_CSV, columns=columns).df
+
+        # Then
+        self.assertEqual(["POS", "REF", "ALT", "SAMPLE"],
+                         result.columns.tolist())
+        self.assertEqual(np.int32, result["POS"].dtype)
+        self.assertIsInstance(result["SAMPLE"].dtype, pd.CategoricalDtype)
+        self.assertEqual(SAMPLE_HF_DF["POS"].tolist(),
+                         result["POS"].tolist())
+
+    def _write_samples(self, samples):
+        df = SAMPLE_HF_DF.assign(SAMPLE=samples)
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, "samples.csv")
+        df.to_csv(path, index=False)
+        return df, path
+
+    def test_iter_tables(self):
+        # Given
+        df, path = self._write_samples(["S2", "S1"] * 5)
+        expected = _DataFrameParser(df).table
+
+        # When
+        parser = _TabularParser(path)
+        result = dict(parser.iter_tables(chunksize=3))
+
+        # Then
+        self.assertEqual(["S2", "S1"], parser.chunk_samples)
+        for sample in ("S1", "S2"):
+            self.assertEqual(expected.variants(sample),
+                             result[sample].variants())
+
+    def test_iter_tables_sorted(self):
+        # Given
+        df, path = self._write_samples(["S2"] * 4 + ["S1"] * 6)
+        expected = _DataFrameParser(df).table
+        parser = _TabularParser(path)
+
+        # When
+        result = parser.iter_tables(chunksize=3, sorted_samples=True)
+        sample, table = next(result)
+
+        # Then
+        self.assertEqual("S2", sample)
+        self.assertEqual(["S2", "S1"], parser.chunk_samples)
+        self.assertEqual(expected.variants("S2"), table.variants())
+        self.assertEqual(expected.variants("S1"), next(result)[1].variants())
+
+    def test_iter_tables_sorted_invalid(self):
+        # Given
+        _, path = self._write_samples(["S2", "S1"] * 5)
+
+        # When/Then
+        with self.assertRaises(ValueError):
+            list(_TabularParser(path).iter_tables(chunksize=3,
+                                                  sorted_samples=True))
+
+    def test_iter_tables_samples(self):
+        # Given
+        _, path = self._write_samples(["S2", "S1"] * 5)
+
+        # When
+        result = list(_TabularParser(path).iter_tables(chunksize=3,
+                                                       samples=["S1"]))
+
+        # Then
+        self.assertEqual(["S1"], [sample for sample, _ in result])
+        self.assertEqual(5, len(result[0][1]))
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_engine_pyarrow(self):
+        # Given
+        columns = _TabularParser.variant_columns()
+        expected = _TabularParser(SAMPLE_HF_TSV, columns=columns).df
+
+        # When
+        result = _TabularParser(SAMPLE_HF_TSV, engine="pyarrow",
+                                columns=columns).df
+
+        # Then
+        pt.assert_frame_equal(expected, result)
+
+    def test_iter_tables_pyarrow(self):
+        # Given
+        parser = _TabularParser(SAMPLE_HF_CSV, engine="pyarrow")
+
+        # When/Then
+        with self.assertRaises(ValueError):
+            parser.iter_tables(chunksize=3)
+
+    def test_columns_table(self):
+        # Given
+        columns = _TabularParser.variant_columns()
+        expected = _DataFrameParser(SAMPLE_HF_DF).table
+
+        # When
+        df = _TabularParser(SAMPLE_HF_CSV, columns=columns).df
+        result = _DataFrameParser(df).table
+
+        # Then
+        self.assertEqual(expected.samples, result.samples)
+        self.assertEqual(expected.variants(), result.variants())
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestInterchangeParser(unittest.TestCase):
+
+    def setUp(self) -> None:
+        df = SAMPLE_HF_DF.assign(SAMPLE=["S2", "S1"] * 5)
+        self.expected = _DataFrameParser(df).table
+        self.arrow = pa.Table.from_pandas(df, preserve_index=False)
+
+    def test_table(self):
+        # Given
+        chunked = pa.concat_tables([self.arrow.slice(0, 4),
+                                    self.arrow.slice(4)])
+
+        for df_in in (self.arrow, chunked, self.arrow.to_batches()[0],
+                      self.arrow.__dataframe__()):
+            # When
+            result = _InterchangeParser(df_in).table
+
+            # Then
+            self.assertEqual(self.expected.samples, result.samples)
+            self.assertEqual(self.expected.variants(), result.variants())
+
+    def test_table_zero_copy(self):
+        # Given
+        arrow = pa.Table.from_pandas(SAMPLE_HF_DF, preserve_index=False)
+        position = arrow.column("POS").cast(pa.int32())
+        df_in = arrow.set_column(0, "POS", position)
+
+        # When
+        result = _InterchangeParser(df_in).table
+
+        # Then
+        self.assertTrue(np.shares_memory(result.position,
+                                         position.chunk(0).to_numpy()))
+
+    def test_table_dictionary(self):
+        # Given
+        sample = self.arrow.column("SAMPLE").dictionary_encode()
+        df_in = self.arrow.set_column(4, "SAMPLE", sample)
+
+        # When
+        result = _InterchangeParser(df_in).table
+
+        # Then
+        self.assertEqual(self.expected.samples, result.samples)
+        self.assertEqual(self.expected.variants(), result.variants())
+
+    def test_table_unsupported(self):
+        with self.assertRaises(TypeError):
+            _InterchangeParser([1, 2, 3])
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestArrowParser(unittest.TestCase):
+
+    def setUp(self) -> None:
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.df = SAMPLE_HF_DF.assign(SAMPLE=["S2", "S1"] * 5)
+        self.parquet = os.path.join(tmp_dir, "sample.parquet")
+        self.feather = os.path.join(tmp_dir, "sample.feather")
+        self.df.to_parquet(self.parquet, index=False, row_group_size=4)
+        self.df.to_feather(self.feather)
+
+    def test_is_arrow(self):
+        # Given/When/Then
+        self.assertTrue(_ArrowParser.is_arrow(self.parquet))
+        self.assertTrue(_ArrowParser.is_arrow("sample.ARROW"))
+        self.assertFalse(_ArrowParser.is_arrow(SAMPLE_HF_CSV))
+
+    def test_df(self):
+        # Given
+        expected = _DataFrameParser(self.df).table
+
+        for path in (self.parquet, self.feather):
+            # When
+            df = _ArrowParser(path).df
+            result = _DataFrameParser(df).table
+
+            # Then
+            self.assertIsInstance(df["SAMPLE"].dtype, pd.CategoricalDtype)
+            self.assertEqual(expected.samples, result.samples)
+            self.assertEqual(expected.variants(), result.variants())
+
+    def test_columns(self):
+        for path in (self.parquet, self.feather):
+            # Given/When
+            result = _ArrowParser(path, columns=["POS", "ALT", "MISSING"]).df
+
+            # Then
+            self.assertEqual(["POS", "ALT"], result.columns.tolist())
+
+    def test_filter(self):
+        # Given
+        expected = self.df[(self.df["SAMPLE"] == "S1")
+                           & (self.df["POS"] <= 10000)]
+
+        for path in (self.parquet, self.feather):
+            # When
+            result = _ArrowParser(path, samples=["S1"],
+                                  positions=(1, 10000)).df
+
+            # Then
+            self.assertEqual(expected["POS"].tolist(),
+                             result["POS"].tolist())
+            self.assertEqual(["S1"], result["SAMPLE"].unique().tolist())
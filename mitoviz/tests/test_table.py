@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import unittest
+
+import numpy as np
+import pandas as pd
+from vcfpy import Substitution
+
+from mitoviz.table import VariantTable, _VariantTableBuilder
+from mitoviz.variant import VariantType, _Variant
+
+
+class TestVariantTable(unittest.TestCase):
+
+    def setUp(self) -> None:
+        builder = _VariantTableBuilder()
+        builder.append(builder.add_sample("S2"), "C", 3308,
+                       Substitution("SNV", "A"), 0.3)
+        builder.append(builder.add_sample("S1"), "A", 73, "G", 0.9)
+        builder.append(builder.add_sample("S2"), "A", 73, "G", 1.0)
+        self.table = builder.build()
+
+    def test_table_sorted_by_sample(self):
+        # Given/When
+        samples = [self.table.samples[i] for i in self.table.sample]
+
+        # Then
+        self.assertEqual(samples, ["S2", "S2", "S1"])
+        self.assertEqual(self.table.position.tolist(), [3308, 73, 73])
+
+    def test_table_alleles_pooled(self):
+        # Given/When
+        alleles = self.table.alleles
+
+        # Then
+        self.assertEqual(["C", "A", "G"], alleles)
+        self.assertEqual(self.table.alt[1], self.table.alt[2])
+        self.assertEqual(self.table.ref[1], self.table.alt[0])
+
+    def test_table_select(self):
+        # Given/When
+        result = self.table.select("S2")
+
+        # Then
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result.samples, ["S2"])
+        self.assertTrue(np.shares_memory(result.variant, self.table.variant))
+        self.assertIs(result.pool, self.table.pool)
+
+    def test_table_variants_interned(self):
+        # Given/When
+        pool = self.table.pool
+
+        # Then
+        self.assertEqual(2, len(pool))
+        self.assertEqual([0, 1, 1], self.table.variant.tolist())
+        self.assertEqual([3308, 73], pool.position.tolist())
+        self.assertFalse(pool.position.flags.writeable)
+        self.assertIs(self.table[1].reference, self.table[2].reference)
+        self.assertIs(self.table[1].position, self.table[2].position)
+
+    def test_table_compact(self):
+        # Given
+        table = self.table.select("S1")
+
+        # When
+        result = table.compact()
+
+        # Then
+        self.assertEqual(1, len(result.pool))
+        self.assertEqual(["A", "G"], result.alleles)
+        self.assertEqual(table.variants(), result.variants())
+
+    def test_table_concat_compacted(self):
+        # Given
+        parts = [self.table.select("S1"), self.table.select("S1")]
+
+        # When
+        result = VariantTable.concat(parts)
+
+        # Then
+        self.assertEqual(1, len(result.pool))
+        self.assertEqual(self.table.variants("S1") * 2, result.variants())
+
+    def test_table_select_missing(self):
+        # Given/When
+        result = self.table.select("S3")
+
+        # Then
+        self.assertEqual(len(result), 0)
+
+    def test_table_iter_samples(self):
+        # Given/When
+        result = {sample: len(table)
+                  for sample, table in self.table.iter_samples()}
+
+        # Then
+        self.assertEqual(result, {"S2": 2, "S1": 1})
+
+    def test_table_variants(self):
+        # Given
+        expected = [_Variant("C", 3308, Substitution("SNV", "A"), 0.3),
+                    _Variant("A", 73, "G", 1.0)]
+
+        # When
+        result = self.table.variants("S2")
+
+        # Then
+        self.assertEqual(result, expected)
+        self.assertIsInstance(result[0].position, int)
+
+    def test_table_properties(self):
+        # Given
+        variants = self.table.variants()
+
+        # When/Then
+        np.testing.assert_allclose(self.table.polar_x,
+                                   [el.polar_x for el in variants])
+        np.testing.assert_allclose(self.table.polar_y,
+                                   [el.polar_y for el in variants])
+        self.assertEqual(self.table.colors, [el.color for el in variants])
+        self.assertEqual(self.table.labels, [el.label for el in variants])
+        self.assertEqual(self.table.labels_hf,
+                         [el.label_hf for el in variants])
+        self.assertEqual(self.table.labels_hf_plotly,
+                         [el.label_hf_plotly for el in variants])
+
+    def test_table_labels_types(self):
+        # Given
+        variants = [_Variant("A", 73, "G", 1.0), _Variant("CT", 10, "C", 1.0),
+                    _Variant("C", 20, "CA", 0.5), _Variant("A", 73, "G", 0.2)]
+
+        # When
+        result = VariantTable.from_variants(variants).labels
+
+        # Then
+        self.assertEqual(["73A>G", "11d", "20.A", "73A>G"], result)
+
+    def test_table_vtype(self):
+        # Given/When
+        vtypes = [VariantType(el) for el in self.table.vtype]
+
+        # Then
+        self.assertEqual([VariantType.SNV] * 3, vtypes)
+
+    def test_table_from_variants(self):
+        # Given
+        variants = [_Variant("A", 73, "G", 1.0),
+                    _Variant("C", 3308, "A", 0.3)]
+
+        # When
+        result = VariantTable.from_variants(variants)
+
+        # Then
+        self.assertEqual(result.variants(), variants)
+        self.assertEqual(result.samples, ["MITOVIZ001"])
+
+    def test_table_from_columns(self):
+        # Given
+        expected = self.table
+
+        # When
+        result = VariantTable.from_columns(
+            [3308, 73, 73], ["C", "A", "A"], ["A", "G", "G"],
+            hf=[0.3, 0.9, 1.0], sample=["S2", "S1", "S2"]
+        )
+
+        # Then
+        self.assertEqual(expected.samples, result.samples)
+        self.assertEqual(expected.variants(), result.variants())
+
+    def test_table_from_columns_types(self):
+        # Given
+        refs, alts = ["C", "CT", "C", "CT"], ["A", "AG", "CA", "C"]
+
+        # When
+        result = VariantTable.from_columns([10, 20, 30, 40], refs, alts)
+
+        # Then
+        self.assertEqual([VariantType.SNV, VariantType.MNV, VariantType.INS,
+                          VariantType.DEL],
+                         [VariantType(el) for el in result.vtype])
+        self.assertEqual(["MITOVIZ001"], result.samples)
+        self.assertEqual([0.5] * 4, result.hf.tolist())
+
+    def test_table_from_columns_missing(self):
+        # Given
+        alts = pd.Series(["G", None], dtype="category")
+
+        # When/Then
+        with self.assertRaisesRegex(ValueError, "ALT at row 1"):
+            VariantTable.from_columns([73, 100], ["A", "CT"], alts,
+                                      names=("POS", "REF", "ALT"))
+        with self.assertRaisesRegex(ValueError, "position at row 0"):
+            VariantTable.from_columns([np.nan, 100], ["A", "CT"],
+                                      ["G", "C"])
+
+    def test_table_from_columns_strings(self):
+        # Given
+        samples = pd.Series(["S2", "S1", "S2"], dtype="string")
+        refs = pd.Series(["C", "A", "A"], dtype="string")
+        alts = pd.Series(["A", "G", None], dtype="string")
+
+        # When
+        result = VariantTable.from_columns(
+            [3308, 73, 73], refs, alts.fillna("G"), hf=[0.3, 0.9, 1.0],
+            sample=samples
+        )
+
+        # Then
+        self.assertEqual(self.table.samples, result.samples)
+        self.assertEqual(self.table.variants(), result.variants())
+        with self.assertRaisesRegex(ValueError, "ALT at row 2"):
+            VariantTable.from_columns([3308, 73, 73], refs, alts,
+                                      names=("POS", "REF", "ALT"))
+
+    def test_table_from_columns_categorical(self):
+        # Given
+        samples = pd.Series(["S2", "S1", "S2"], dtype="category")
+        alts = pd.Series(["A", "G", "G"], dtype="category")
+
+        # When
+        result = VariantTable.from_columns(
+            [3308, 73, 73], ["C", "A", "A"], alts, hf=[0.3, 0.9, 1.0],
+            sample=samples
+        )
+
+        # Then
+        self.assertEqual(self.table.samples, result.samples)
+        self.assertEqual(self.table.variants(), result.variants())
+
+    def test_table_concat(self):
+        # Given
+        other = VariantTable.from_variants([_Variant("A", 73, "G", 0.5)],
+                                           sample="S3")
+
+        # When
+        result = VariantTable.concat([self.table, other])
+
+        # Then
+        self.assertEqual(["S2", "S1", "S3"], result.samples)
+        self.assertEqual(self.table.variants(), result.variants()[:3])
+        self.assertEqual(other.variants(), result.variants("S3"))
+        self.assertEqual(3, len(result.alleles))
+        self.assertEqual(2, len(result.pool))
+
+    def test_table_from_columns_interned(self):
+        # Given
+        position = [73, 73, 73, 263, 73]
+        refs, alts = ["A", "A", "A", "A", "AC"], ["G", "G", "C", "G", "A"]
+
+        # When
+        result = VariantTable.from_columns(
+            position, refs, alts, sample=["S1", "S2", "S2", "S1", "S2"]
+        )
+
+        # Then
+        self.assertEqual(4, len(result.pool))
+        self.assertEqual([73, 263, 73, 73, 73], result.position.tolist())
+        variant = result.variant.tolist()
+        self.assertEqual(variant[0], variant[2])
+        self.assertEqual(4, len(set(variant)))
+        self.assertEqual(
+            [VariantType.SNV, VariantType.SNV, VariantType.DEL],
+            [VariantType(el) for el in result.vtype[2:]]
+        )
+
+    def test_table_empty(self):
+        # Given/When
+        result = VariantTable.empty()
+
+        # Then
+        self.assertEqual(len(result), 0)
+        self.assertEqual(result.polar_x.tolist(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,12 @@
 # Created by Roberto Preste
 import unittest
 
+import numpy as np
 from vcfpy import Substitution
 
-from mitoviz.variant import _Variant
+from mitoviz.variant import (
+    VariantType, _Variant, normalize_allele, variant_labels
+)
 
 
 class TestVariant(unittest.TestCase):
@@ -48,6 +51,39 @@ class TestVariant(unittest.TestCase):
             hf=0.3
         )
 
+    def test_normalize_allele(self):
+        # Given/When
+        result = normalize_allele("CT", Substitution("INDEL", "CAG"))
+
+        # Then
+        self.assertEqual(("CAG", VariantType.INDEL), result)
+
+    def test_normalize_allele_raw(self):
+        # Given/When
+        results = [normalize_allele(ref, alt)
+                   for ref, alt in [("C", "A"), ("CT", "AG"),
+                                    ("C", "CA"), ("CT", "C")]]
+
+        # Then
+        self.assertEqual([("A", VariantType.SNV), ("AG", VariantType.MNV),
+                          ("CA", VariantType.INS), ("C", VariantType.DEL)],
+                         results)
+
+    def test_numpy_alleles(self):
+        # Given/When
+        result = _Variant(np.str_("A"), 73, np.str_("G"), 0.5)
+
+        # Then
+        self.assertIs(type(result.reference), str)
+        self.assertIs(type(result.alternate), str)
+        self.assertEqual(_Variant("A", 73, "G", 0.5), result)
+        self.assertEqual("73A>G", result.label)
+
+    def test_alternate(self):
+        self.assertEqual("A", self.variant.alternate)
+        self.assertEqual(VariantType.SNV, self.variant.vtype)
+        self.assertEqual(self.variant_raw, self.variant)
+
     def test__is_deletion_false(self):
         self.assertFalse(self.variant._is_deletion)
         self.assertFalse(self.variant_raw._is_deletion)
@@ -123,3 +159,44 @@ class TestVariant(unittest.TestCase):
         self.assertEqual("H", variant_h.strand)
         self.assertEqual("L", variant_l.strand)
         self.assertEqual("", variant_nc.strand)
+
+    def test_slots(self):
+        # Given/When/Then
+        self.assertFalse(hasattr(self.variant, "__dict__"))
+
+    def test_hash(self):
+        # Given
+        other = _Variant("C", 3308, "A", 0.3)
+
+        # When/Then
+        self.assertEqual(hash(self.variant_raw), hash(other))
+        self.assertEqual(hash(other), hash(other))
+        self.assertEqual({self.variant_raw, other}, {other})
+
+    def test_variant_labels(self):
+        # Given
+        variants = [self.variant_raw, self.variant_del_raw,
+                    self.variant_ins_raw]
+
+        # When
+        result = variant_labels([el.position for el in variants],
+                                [el.reference for el in variants],
+                                [el.alternate for el in variants])
+
+        # Then
+        self.assertEqual([el.label for el in variants], result)
+
+    def test_variant_labels_hf(self):
+        # Given
+        variants = [self.variant_raw, self.variant_del_raw]
+
+        # When
+        result = variant_labels([el.position for el in variants],
+                                [el.reference for el in variants],
+                                [el.alternate for el in variants],
+                                hf=[el.hf for el in variants],
+                                vtype=[el.vtype for el in variants],
+                                hf_sep="<br>")
+
+        # Then
+        self.assertEqual([el.label_hf_plotly for el in variants], result)
@@ -1,73 +1,178 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
-from typing import Union
+import sys
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple
 
-import vcfpy
-
-from mitoviz.constants import COLOR_MAPS
+from mitoviz.annotation import INDEX
+from mitoviz.constants import LABEL_CACHE_SIZE
 from mitoviz.utils import convert_hf, convert_nt, convert_plotly
 
 
+class VariantType(IntEnum):
+    """ Type of a variant, as defined by vcfpy. """
+    SNV = 0
+    MNV = 1
+    INS = 2
+    DEL = 3
+    INDEL = 4
+    OTHER = 5
+
+
+_DEL, _INS = VariantType.DEL, VariantType.INS
+
+
+def normalize_allele(reference: str,
+                     alternate: Any) -> Tuple[str, VariantType]:
+    """ Normalise the given alternate allele to an interned string and its
+    variant type.
+
+    The type of vcfpy alternate alleles is used as is (symbolic alleles and
+    breakends are OTHER), while the type of plain string alleles is inferred
+    from the length of the alleles.
+
+    Args:
+        reference: reference allele
+        alternate: alternate allele (either a string or a vcfpy allele)
+
+    Returns:
+        tuple with the alternate allele as string and its variant type
+    """
+    if isinstance(alternate, str):
+        if len(reference) > len(alternate):
+            vtype = VariantType.DEL
+        elif len(reference) < len(alternate):
+            vtype = VariantType.INS
+        elif len(reference) == 1:
+            vtype = VariantType.SNV
+        else:
+            vtype = VariantType.MNV
+        return sys.intern(str(alternate)), vtype
+    vtype = VariantType.__members__.get(alternate.type, VariantType.OTHER)
+    return sys.intern(alternate.serialize()), vtype
+
+
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def variant_label(position: int,
+                  reference: str,
+                  alternate: str,
+                  vtype: VariantType) -> str:
+    """ Create the label of a variant for deletions, insertions and SNPs.
+
+    Labels are memoised, so that variants shared by many samples are only
+    formatted once.
+
+    Args:
+        position: position of the variant
+        reference: reference allele of the variant
+        alternate: alternate allele of the variant, as a string
+        vtype: type of the variant
+
+    Returns:
+        label of the variant
+    """
+    if vtype == _DEL:
+        return "{}d".format(int(position) + 1)
+    elif vtype == _INS:
+        return "{}.{}".format(position, alternate[len(reference):])
+    return "{}{}>{}".format(position, reference, alternate)
+
+
+def variant_labels(position: Sequence[int],
+                   reference: Sequence[str],
+                   alternate: Sequence[str],
+                   hf: Optional[Sequence[float]] = None,
+                   vtype: Optional[Sequence[VariantType]] = None,
+                   hf_sep: str = "\n") -> List[str]:
+    """ Create the labels of a batch of variants in a single pass, each
+    distinct (position, reference, alternate) being formatted only once.
+
+    Args:
+        position: positions of the variants
+        reference: reference alleles of the variants
+        alternate: alternate alleles of the variants, as strings
+        hf: heteroplasmic fractions of the variants, added to the labels if
+            given
+        vtype: types of the variants (defaults to the types inferred from
+            the length of the alleles)
+        hf_sep: separator between labels and HF values [default: "\n"]
+
+    Returns:
+        list of labels
+    """
+    position, reference, alternate = (
+        values.tolist() if hasattr(values, "tolist") else values
+        for values in (position, reference, alternate)
+    )
+    if vtype is None:
+        vtype = [normalize_allele(ref, alt)[1]
+                 for ref, alt in zip(reference, alternate)]
+    labels = list(map(variant_label, position, reference, alternate, vtype))
+    if hf is None:
+        return labels
+    if hasattr(hf, "tolist"):
+        hf = hf.tolist()
+    return ["{}{}HF: {}".format(label, hf_sep, value)
+            for label, value in zip(labels, hf)]
+
+
 class _Variant:
     """ Class storing a given variant, used for both linear and polar plots.
 
+    Alternate alleles parsed by vcfpy are normalised to plain strings, and
+    their type is stored in vtype. Instances use __slots__ rather than a
+    __dict__ to keep large numbers of variants compact, and are meant to be
+    immutable once created, since their hash is computed only once.
+
     Attributes:
         reference: reference allele of the variant
         position: position of the variant
-        alternate: alternate allele of the variant
+        alternate: alternate allele of the variant, as a string
         hf: heteroplasmic fraction of the variant
+        vtype: type of the variant (defaults to the type of the alternate
+            allele)
     """
+    __slots__ = ("reference", "position", "alternate", "hf", "vtype",
+                 "_hash")
 
     def __init__(self,
                  reference: str,
                  position: int,
-                 alternate: Union[str, vcfpy.Substitution],
-                 hf: float):
-        self.reference = reference
+                 alternate: str,
+                 hf: float,
+                 vtype: Optional[VariantType] = None):
+        self.reference = sys.intern(str(reference))
         self.position = position
+        if vtype is None:
+            alternate, vtype = normalize_allele(reference, alternate)
         self.alternate = alternate
         self.hf = hf
+        self.vtype = vtype
 
     @property
     def _is_deletion(self) -> bool:
         """ Check whether the current variant refers to a deletion. """
         # e.g. ref CTG | alt C
-        if isinstance(self.alternate, vcfpy.Substitution):
-            return self.alternate.type == "DEL"
-        return len(self.reference) > len(self.alternate)
+        return self.vtype == _DEL
 
     @property
     def _is_insertion(self) -> bool:
         """ Check whether the current variant refers to an insertion. """
         # e.g. ref C | alt CTG
-        if isinstance(self.alternate, vcfpy.Substitution):
-            return self.alternate.type == "INS"
-        return len(self.reference) < len(self.alternate)
+        return self.vtype == _INS
 
     @property
     def color(self) -> str:
         """ The color of the locus on which the variant is located. """
-        for (start, stop), color in COLOR_MAPS.items():
-            if self.position in range(start, stop + 1):
-                return color
+        return INDEX.color(self.position)
 
     @property
     def label(self) -> str:
         """ Create the variant label for deletions, insertions and SNPs. """
-        alternate = (self.alternate.value
-                     if isinstance(self.alternate, vcfpy.Substitution)
-                     else self.alternate)
-        if self._is_deletion:
-            label = "{}d".format(int(self.position) + 1)
-        elif self._is_insertion:
-            label = "{}.{}".format(
-                self.position, alternate[len(self.reference):]
-            )
-        else:
-            label = "{}{}>{}".format(self.position, self.reference, alternate)
-
-        return label
+        return variant_label(self.position, self.reference, self.alternate,
+                             self.vtype)
 
     @property
     def label_hf(self) -> str:
@@ -112,27 +217,18 @@ class _Variant:
     def strand(self) -> str:
         """ The mitochondrial strand on which the variant's locus is located.
         """
-        if self.position in [*range(0, 576), *range(4331, 4400),
-                             *range(5586, 5655), *range(5656, 5729),
-                             *range(5729, 5761), *range(5760, 5826),
-                             *range(5826, 5892), *range(7445, 7517),
-                             *range(14148, 14673), *range(14673, 14742),
-                             *range(15955, 16024), *range(16023, 16569)]:
-            return "L"
-        elif self.position in [*range(3304, 3306), *range(4400, 4401),
-                               *range(5579, 5586), *range(5655, 5656),
-                               *range(5891, 5903), *range(7514, 7517),
-                               *range(8269, 8294), *range(8364, 8365),
-                               *range(14742, 14746), *range(15953, 15955)]:
-            return ""
-        else:
-            return "H"
+        return INDEX.strand(self.position)
 
     def __key(self):
-        return self.reference, self.position, self.alternate, self.hf
+        return (self.reference, self.position, self.alternate, self.hf,
+                self.vtype)
 
     def __hash__(self):
-        return hash(self.__key())
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(self.__key())
+            return self._hash
 
     def __eq__(self, other):
         if isinstance(other, _Variant):
@@ -16,6 +16,8 @@ setup_requirements = ["pytest-runner", ]
 
 test_requirements = ["pytest", "opencv-python"]
 
+extras_requirements = {"arrow": ["pyarrow"], "zstd": ["zstandard"]}
+
 setup(  # pragma: no cover
     author="Roberto Preste",
     author_email="robertopreste@gmail.com",
@@ -32,9 +34,11 @@ setup(  # pragma: no cover
     entry_points={
         "console_scripts": [
             "mitoviz=mitoviz.cli.mitoviz_plot:main",
-            "mitoviz-base=mitoviz.cli.mitoviz_base:main"
+            "mitoviz-base=mitoviz.cli.mitoviz_base:main",
+            "mitoviz-cache=mitoviz.cli.mitoviz_cache:main"
         ],
     },
+    extras_require=extras_requirements,
     install_requires=requirements,
     license="MIT license",
     long_description=readme + "\n\n" + history,